@@ -1 +1,5 @@
 from src.effects.base import BaseEffect, PluginEffectWrapper, EffectRegistry
+from src.effects.simulation import SimulatedEffect
+from src.effects.particles import ParticlePool, Emitter, Curve, Gravity, Drag, Attractor, Noise, draw_particles, rgba
+from src.effects.trails import TrailBuffer
+from src.effects.fields import FieldGrid, AnimatedField
@@ -1,4 +1,8 @@
+import multiprocessing
+
 from src.core.app import run
 
 if __name__ == "__main__":
-    run()
\ No newline at end of file
+    # Воркери пісочниці ефектів стартують через spawn (і у frozen-збірці)
+    multiprocessing.freeze_support()
+    run()
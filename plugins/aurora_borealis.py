@@ -32,17 +32,17 @@ class AuroraBorealisEffect(BaseEffect):
                 "label": "Speed"
             },
             "hue_min": {
-                "type": "float",
-                "min": 0.0,
-                "max": 1.0,
-                "default": 0.3,
+                "type": "int",
+                "min": 0,
+                "max": 359,
+                "default": 120,
                 "label": "Hue Min"
             },
             "hue_max": {
-                "type": "float",
-                "min": 0.0,
-                "max": 1.0,
-                "default": 0.5,
+                "type": "int",
+                "min": 0,
+                "max": 359,
+                "default": 180,
                 "label": "Hue Max"
             }
         }
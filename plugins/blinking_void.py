@@ -1,7 +1,7 @@
 import random
 import math
 from PySide6.QtCore import Qt, QPointF
-from PySide6.QtGui import QColor, QPainter, QBrush, QPen, QCursor
+from PySide6.QtGui import QColor, QPainter, QBrush, QPen
 
 from effects import BaseEffect
 
@@ -60,7 +60,7 @@ class BlinkingVoidEffect(BaseEffect):
     def draw(self, p: QPainter, w: int, h: int, phase: float):
         p.fillRect(0, 0, w, h, QColor(0, 0, 0))
         
-        mouse_pos = QCursor.pos()
+        mouse_pos = self.input.pos()
         mx, my = mouse_pos.x(), mouse_pos.y()
         
         # Draw eyes
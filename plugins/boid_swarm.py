@@ -2,11 +2,11 @@ import random
 import math
 import numpy as np
 from PySide6.QtCore import Qt, QPointF
-from PySide6.QtGui import QColor, QPainter, QCursor, QPolygonF
+from PySide6.QtGui import QColor, QPainter, QPolygonF
 
-from effects import BaseEffect
+from effects import SimulatedEffect
 
-class BoidSwarmEffect(BaseEffect):
+class BoidSwarmEffect(SimulatedEffect):
     EFFECT_NAME = "boid_swarm"
 
     def __init__(self):
@@ -14,13 +14,10 @@ class BoidSwarmEffect(BaseEffect):
         self.num_boids = 100
         self.color_hue_min = 150
         self.color_hue_max = 250
-        
-        # Arrays
-        self.pos = None # (N, 2)
-        self.vel = None # (N, 2)
-        self.colors = None # (N,) hue values
-        
-        self._init_boids()
+        # Ціль зграї; курсор читається в GUI-потоці, симуляція бере останнє значення
+        self.target = (960.0, 540.0)
+        # Cache polygon shape
+        self.base_poly = QPolygonF([QPointF(10, 0), QPointF(-5, 5), QPointF(-5, -5)])
         
     @classmethod
     def get_schema(cls):
@@ -53,81 +50,67 @@ class BoidSwarmEffect(BaseEffect):
         if 'hue_min' in config: self.color_hue_min = int(config['hue_min'])
         if 'hue_max' in config: self.color_hue_max = int(config['hue_max'])
         
-        if 'count' in config:
-            self._init_boids()
+        if 'count' in config or 'hue_min' in config or 'hue_max' in config:
+            self.reset_state()
 
-    def _init_boids(self):
-        # Initialize arrays
-        self.pos = np.random.rand(self.num_boids, 2).astype(np.float32)
-        self.pos[:, 0] *= 1920
-        self.pos[:, 1] *= 1080
-        
-        self.vel = np.random.uniform(-2, 2, (self.num_boids, 2)).astype(np.float32)
-        self.colors = np.random.randint(self.color_hue_min, self.color_hue_max + 1, self.num_boids)
+    def create_state(self, w, h):
+        pos = self.np_rng.random((self.num_boids, 2)).astype(np.float32)
+        pos[:, 0] *= w
+        pos[:, 1] *= h
+        
+        vel = self.np_rng.uniform(-2, 2, (self.num_boids, 2)).astype(np.float32)
+        colors = self.np_rng.integers(self.color_hue_min, self.color_hue_max + 1, self.num_boids)
+        return {"pos": pos, "vel": vel, "colors": colors}
 
-    def draw(self, p: QPainter, w: int, h: int, phase: float):
-        if self.show_background:
-            p.fillRect(0, 0, w, h, QColor(10, 20, 30))
-        
-        if self.pos is None or len(self.pos) != self.num_boids:
-            self._init_boids()
-            
-        mouse_pos = QCursor.pos()
-        mx, my = mouse_pos.x(), mouse_pos.y()
-        mouse_target = np.array([mx, my], dtype=np.float32)
-        
-        # --- Vectorized Logic ---
+    def update(self, state, dt, w, h):
+        pos, vel = state["pos"], state["vel"]
+        # Сили задані на кадр при ~30 FPS
+        step = dt * 30
+        mouse_target = np.array(self.target, dtype=np.float32)
         
         # 1. Attraction to mouse
-        # vector to mouse = mouse - pos
-        diff = mouse_target - self.pos # (N, 2)
-        dist_sq = np.sum(diff**2, axis=1) # (N,)
-        dist = np.sqrt(dist_sq)
+        diff = mouse_target - pos # (N, 2)
+        dist = np.sqrt(np.sum(diff**2, axis=1)) # (N,)
         
         # Avoid division by zero
         mask = dist > 0
-        
-        # Update velocity (attraction)
         # Boids move towards mouse. Factor 0.5 is strength.
-        # Check shapes: diff[mask] is (M, 2), dist[mask] is (M,) -> reshape to (M, 1)
-        force = (diff[mask] / dist[mask][:, np.newaxis]) * 0.5
-        self.vel[mask] += force
+        vel[mask] += (diff[mask] / dist[mask][:, np.newaxis]) * 0.5 * step
                 
         # 2. Speed Limit
-        speed_sq = np.sum(self.vel**2, axis=1)
-        speed = np.sqrt(speed_sq)
-        
+        speed = np.sqrt(np.sum(vel**2, axis=1))
         max_speed = 6.0
         fast_mask = speed > max_speed
-        
-        # Normalize and scale to max_speed
         if np.any(fast_mask):
-            self.vel[fast_mask] = (self.vel[fast_mask] / speed[fast_mask][:, np.newaxis]) * max_speed
+            vel[fast_mask] = (vel[fast_mask] / speed[fast_mask][:, np.newaxis]) * max_speed
             
         # 3. Move
-        self.pos += self.vel
+        pos += vel * step
+
+    def snapshot(self, state):
+        # Для малювання потрібні лише позиції й кути
+        vel = state["vel"]
+        return {
+            "pos": state["pos"].copy(),
+            "angles": np.degrees(np.arctan2(vel[:, 1], vel[:, 0])),
+            "colors": state["colors"],
+        }
+
+    def render(self, p: QPainter, w: int, h: int, frame, phase: float):
+        if self.show_background:
+            p.fillRect(0, 0, w, h, QColor(10, 20, 30))
+            
+        mouse_pos = self.input.pos()
+        self.target = (mouse_pos.x(), mouse_pos.y())
         
-        # 4. Draw
         p.setPen(Qt.NoPen)
+        pos, angles, colors = frame["pos"], frame["angles"], frame["colors"]
         
-        # Pre-calculate angles for drawing
-        angles = np.arctan2(self.vel[:, 1], self.vel[:, 0])
-        
-        # We can't vectorized QPainter calls easily without OpenGL, 
-        # but we can loop faster over numpy arrays.
-        
-        # To optimize drawing, we construct polygons in local space and map them?
-        # Or just loop. Loop is fine for < 2000 in Python if logic is offset.
-        
-        # Cache polygon shape
-        poly_points = [QPointF(10, 0), QPointF(-5, 5), QPointF(-5, -5)]
-        base_poly = QPolygonF(poly_points)
-        
-        for i in range(self.num_boids):
+        for i in range(len(pos)):
             p.save()
-            p.translate(float(self.pos[i, 0]), float(self.pos[i, 1]))
-            p.rotate(math.degrees(angles[i]))
+            p.translate(float(pos[i, 0]), float(pos[i, 1]))
+            p.rotate(float(angles[i]))
             
-            p.setBrush(QColor.fromHsv(int(self.colors[i]), 200, 255))
-            p.drawPolygon(base_poly)
+            p.setBrush(QColor.fromHsv(int(colors[i]), 200, 255))
+            p.drawPolygon(self.base_poly)
             p.restore()
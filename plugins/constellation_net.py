@@ -1,7 +1,7 @@
 import math
 import random
 from PySide6.QtCore import Qt, QPointF
-from PySide6.QtGui import QColor, QPainter, QBrush, QPen, QCursor
+from PySide6.QtGui import QColor, QPainter, QBrush, QPen
 
 from effects import BaseEffect
 
@@ -75,7 +75,7 @@ class ConstellationNetEffect(BaseEffect):
         if self.show_background:
             p.fillRect(0, 0, w, h, QColor(10, 10, 15))
         
-        mouse_pos = QCursor.pos()
+        mouse_pos = self.input.pos()
         mx, my = mouse_pos.x(), mouse_pos.y()
         
         # Interaction radius
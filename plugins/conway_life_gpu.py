@@ -0,0 +1,103 @@
+from shader_effect import ShaderEffect
+
+class ConwayLifeGPUEffect(ShaderEffect):
+    EFFECT_NAME = "conway_life_gpu"
+    CELL_SIZE = 2 # Screen pixels per cell
+
+    def __init__(self):
+        super().__init__()
+        self.density = 0.2
+
+    @classmethod
+    def get_schema(cls):
+        return {
+            "density": {
+                "type": "float",
+                "min": 0.05,
+                "max": 0.6,
+                "default": 0.2,
+                "label": "Initial Density"
+            }
+        }
+
+    def configure(self, config: dict):
+        if 'density' in config: self.density = float(config['density'])
+
+    def get_uniforms(self, pass_name, w, h):
+        return {"uDensity": self.density}
+
+    def get_buffers(self):
+        # Buffer A: r = alive, g = fading trail. Reads its own previous frame.
+        return [{
+            "name": "A",
+            "inputs": ["A"],
+            "scale": 1.0 / self.CELL_SIZE,
+            "filter": "nearest",
+            "wrap": "repeat",
+            "fragment": """
+        #version 330 core
+        out vec4 fragColor;
+        uniform sampler2D iChannel0;
+        uniform vec2 iResolution;
+        uniform float iTime;
+        uniform int iFrame;
+        uniform vec4 iMouse;
+        uniform float uDensity;
+
+        float hash(vec2 p) { return fract(sin(dot(p, vec2(127.1, 311.7))) * 43758.5453); }
+
+        void main() {
+            ivec2 size = ivec2(iResolution);
+            ivec2 cell = ivec2(gl_FragCoord.xy);
+
+            if (iFrame == 0) {
+                float alive = step(1.0 - uDensity, hash(gl_FragCoord.xy + fract(iTime)));
+                fragColor = vec4(alive, alive, 0.0, 1.0);
+                return;
+            }
+
+            vec4 state = texelFetch(iChannel0, cell, 0);
+            float n = 0.0;
+            for (int y = -1; y <= 1; y++)
+                for (int x = -1; x <= 1; x++)
+                    if (x != 0 || y != 0)
+                        n += texelFetch(iChannel0, (cell + ivec2(x, y) + size) % size, 0).r;
+
+            float alive = state.r > 0.5 ? float(n > 1.5 && n < 3.5) : float(n > 2.5 && n < 3.5);
+
+            // Random sparks so the board never dies out
+            if (hash(gl_FragCoord.xy + fract(iTime)) > 0.99998) alive = 1.0;
+            // Left click seeds noise under the cursor
+            if (iMouse.z > 0.0 && distance(gl_FragCoord.xy, iMouse.xy) < 8.0)
+                alive = step(0.5, hash(gl_FragCoord.xy * 1.7 + fract(iTime)));
+
+            fragColor = vec4(alive, max(alive, state.g * 0.92), 0.0, 1.0);
+        }
+        """,
+        }]
+
+    def get_fragment_shader(self):
+        return """
+        #version 330 core
+        out vec4 fragColor;
+        uniform sampler2D iChannel0;
+        uniform vec2 iResolution;
+        uniform float iTime;
+        uniform vec3 iAudio; // bass, mid, treble
+
+        vec3 hsv2rgb(vec3 c) {
+            vec3 p = abs(fract(c.xxx + vec3(1.0, 2.0 / 3.0, 1.0 / 3.0)) * 6.0 - 3.0);
+            return c.z * mix(vec3(1.0), clamp(p - 1.0, 0.0, 1.0), c.y);
+        }
+
+        void main() {
+            vec2 uv = gl_FragCoord.xy / iResolution.xy;
+            vec4 state = texture(iChannel0, uv);
+
+            // Hue drifts across the screen like the CPU version
+            vec3 col = hsv2rgb(vec3(fract(uv.x + iTime * 0.2), 0.8, 1.0));
+            float glow = state.r + state.g * (0.35 + iAudio.x * 0.5);
+
+            fragColor = vec4(col * min(glow, 1.0), 1.0);
+        }
+        """
@@ -1,11 +1,12 @@
 import random
-from PySide6.QtGui import QColor, QLinearGradient, QBrush
-from PySide6.QtCore import Qt
+from PySide6.QtGui import QColor, QLinearGradient, QBrush, QImage, QPainter
+from PySide6.QtCore import Qt, QRectF
 from effects import BaseEffect
 
 class CyberCityEffect(BaseEffect):
     EFFECT_NAME = "cyber_city"
-    
+    SKY_STEP = 16 # Colour quantisation of the audio-driven sky
+
     def __init__(self):
         super().__init__()
         self.building_count = 20
@@ -26,7 +27,7 @@ class CyberCityEffect(BaseEffect):
     def configure(self, config: dict):
         if 'count' in config:
             self.building_count = int(config['count'])
-            self.buildings = [] # Force re-init
+            self.buildings = None # Force re-init
 
     def _init_city(self, h):
         self.buildings = []
@@ -35,6 +36,33 @@ class CyberCityEffect(BaseEffect):
             bh = random.randint(200, int(h // 1.5))
             self.buildings.append({'x': i * 100 - 100, 'w': bw, 'h': bh, 'speed': random.uniform(0.5, 1.5)})
 
+    def _paint_sky(self, p, w, h, r_top, b_bot):
+        bg = QLinearGradient(0, 0, 0, h)
+        bg.setColorAt(0.0, QColor(r_top, 0, 40))
+        bg.setColorAt(0.6, QColor(80, 0, 80))
+        bg.setColorAt(1.0, QColor(255, 50, b_bot))
+        p.fillRect(0, 0, w, h, QBrush(bg))
+
+    def _build_windows(self, w, h):
+        """ Window sheets (normal and "drop" lighting), pre-rendered once per resolution.
+        A building shows the top-left part of a sheet matching its size """
+        sheets = {}
+        for threshold in (0.3, 0.1):
+            sheet = QImage(160, h, QImage.Format_ARGB32_Premultiplied)
+            sheet.fill(Qt.transparent)
+            sp = QPainter(sheet)
+            sp.setPen(Qt.NoPen)
+            sp.setBrush(QColor(0, 255, 255))
+            for wx in range(0, 160, 20):
+                for wy in range(0, h, 30):
+                    # Deterministic pattern (relative to the building) so windows don't flicker
+                    seed = ((wx + 10) * (wy + 10)) % 100
+                    if (seed / 100.0) > threshold:
+                        sp.drawRect(wx, wy, 10, 15)
+            sp.end()
+            sheets[threshold] = sheet
+        return sheets
+
     def draw(self, p, w, h, phase):
         if self.buildings is None:
             self._init_city(h) # type: ignore
@@ -50,14 +78,11 @@ class CyberCityEffect(BaseEffect):
 
         # Cyber sunset background
         if self.show_background:
-            bg = QLinearGradient(0, 0, 0, h)
-            # Modulate sky color with mid/treble
-            r_top = min(255, 20 + int(mid * 100))
-            b_bot = min(255, 100 + int(treble * 155))
-            bg.setColorAt(0.0, QColor(r_top, 0, 40))
-            bg.setColorAt(0.6, QColor(80, 0, 80))
-            bg.setColorAt(1.0, QColor(255, 50, b_bot))
-            p.fillRect(0, 0, w, h, QBrush(bg))
+            # Modulate sky color with mid/treble, quantised to SKY_STEP so the baked
+            # layer is re-rendered only when the level actually changes
+            r_top = min(255, 20 + int(mid * 100) // self.SKY_STEP * self.SKY_STEP)
+            b_bot = min(255, 100 + int(treble * 155) // self.SKY_STEP * self.SKY_STEP)
+            self.draw_layer(p, "sky", w, h, self._paint_sky, r_top, b_bot)
 
         # Retro sun
         sun_y = h // 2
@@ -86,21 +111,13 @@ class CyberCityEffect(BaseEffect):
             # Windows
             # Pulse window transparency with treble
             alpha = 100 + int(treble * 155)
-            p.setBrush(QColor(0, 255, 255, alpha))
-            
-            # Draw windows (simplified loop)
-            wx_start = int(b['x']) + 10
-            wx_end = int(b['x'] + b['w']) - 10
-            wy_start = h - b['h'] + 10
+            # More windows light up on drop
+            sheet = self.geometry("windows", w, h, self._build_windows)[0.1 if bass > 0.5 else 0.3]
             
-            for wx in range(wx_start, wx_end, 20):
-                for wy in range(wy_start, h - 10, 30):
-                    # Use deterministic random based on position so windows don't flicker
-                    # unless we want them to flicker with beat? 
-                    # Let's make them flicker if bass is high
-                    seed = (wx * wy) % 100
-                    threshold = 0.3
-                    if bass > 0.5: threshold = 0.1 # More windows light up on drop
-                    
-                    if (seed / 100.0) > threshold:
-                        p.drawRect(wx, wy, 10, 15)
+            cols = len(range(10, b['w'] - 10, 20))
+            rows = len(range(10, b['h'] - 10, 30))
+            if cols and rows:
+                src = QRectF(0, 0, cols * 20 - 10, rows * 30 - 15)
+                p.setOpacity(min(255, alpha) / 255.0)
+                p.drawImage(QRectF(int(b['x']) + 10, h - b['h'] + 10, src.width(), src.height()), sheet, src)
+                p.setOpacity(1.0)
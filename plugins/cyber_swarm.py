@@ -1,20 +1,10 @@
 import math
 import random
-import ctypes
 from PySide6.QtCore import Qt, QPointF
-from PySide6.QtGui import QColor, QPainter, QBrush, QPen, QCursor
+from PySide6.QtGui import QColor, QPainter, QBrush, QPen
 
 from effects import BaseEffect
 
-# Mouse polling
-user32 = ctypes.windll.user32
-
-def is_left_clicked():
-    return user32.GetAsyncKeyState(0x01) & 0x8000 != 0
-
-def is_right_clicked():
-    return user32.GetAsyncKeyState(0x02) & 0x8000 != 0
-
 class CyberSwarmEffect(BaseEffect):
     EFFECT_NAME = "cyber_swarm"
 
@@ -86,10 +76,11 @@ class CyberSwarmEffect(BaseEffect):
             p.fillRect(0, 0, w, h, QColor(5, 10, 20))
         
         # 2. Input
-        mouse_pos = QCursor.pos()
-        mx, my = mouse_pos.x(), mouse_pos.y()
-        l_click = is_left_clicked()
-        r_click = is_right_clicked()
+        # Один знімок вводу на тік (позиція й кнопки)
+        mouse = self.input.snapshot()
+        mx, my = mouse.x, mouse.y
+        l_click = mouse.left
+        r_click = mouse.right
         
         # 3. Optimization Setup
         neighbor_dist = 100
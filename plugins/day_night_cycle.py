@@ -1,6 +1,4 @@
 import math
-import time
-import random
 from PySide6.QtGui import QColor, QLinearGradient, QBrush, QPen, QRadialGradient
 from PySide6.QtCore import Qt, QPointF
 from effects import BaseEffect
@@ -50,7 +48,7 @@ class DayNightCycleEffect(BaseEffect):
             if self.DEBUG_MODE:
                  time_factor = (phase * 0.1) % 1.0 
             else:
-                t = time.localtime()
+                t = self.clock.localtime()
                 current_hour = t.tm_hour + t.tm_min / 60.0 + t.tm_sec / 3600.0
                 time_factor = current_hour / 24.0
 
@@ -95,11 +93,11 @@ class DayNightCycleEffect(BaseEffect):
                 self.stars = []
                 for _ in range(200):
                     self.stars.append({
-                        'x': random.uniform(0, w),
-                        'y': random.uniform(0, horizon_y),
-                        'size': random.uniform(0.5, 1.8),
-                        'blink_speed': random.uniform(1, 3),
-                        'blink_offset': random.uniform(0, math.pi * 2)
+                        'x': self.rng.uniform(0, w),
+                        'y': self.rng.uniform(0, horizon_y),
+                        'size': self.rng.uniform(0.5, 1.8),
+                        'blink_speed': self.rng.uniform(1, 3),
+                        'blink_offset': self.rng.uniform(0, math.pi * 2)
                     })
             for s in self.stars:
                 blink = (math.sin(phase * s['blink_speed'] + s['blink_offset']) * 0.5 + 0.5)
@@ -112,11 +110,11 @@ class DayNightCycleEffect(BaseEffect):
             self.clouds = []
             for _ in range(8):
                 self.clouds.append({
-                    'x': random.uniform(-100, w),
-                    'y': random.uniform(50, horizon_y - 100),
-                    'speed': random.uniform(0.2, 0.5),
-                    'scale': random.uniform(0.8, 1.5),
-                    'parts': [{'ox': random.uniform(-30, 30), 'oy': random.uniform(-10, 10), 'r': random.uniform(20, 40)} for _ in range(5)]
+                    'x': self.rng.uniform(-100, w),
+                    'y': self.rng.uniform(50, horizon_y - 100),
+                    'speed': self.rng.uniform(0.2, 0.5),
+                    'scale': self.rng.uniform(0.8, 1.5),
+                    'parts': [{'ox': self.rng.uniform(-30, 30), 'oy': self.rng.uniform(-10, 10), 'r': self.rng.uniform(20, 40)} for _ in range(5)]
                 })
         
         # Колір хмар залежно від сонця
@@ -186,32 +184,38 @@ class DayNightCycleEffect(BaseEffect):
             # Дальні гори
             m1 = []
             for i in range(11):
-                m1.append(QPointF(i * (w/10), horizon_y - random.uniform(50, 120)))
+                m1.append(QPointF(i * (w/10), horizon_y - self.rng.uniform(50, 120)))
             self.mountains.append(m1)
             # Ближчі гори
             m2 = []
             for i in range(11):
-                m2.append(QPointF(i * (w/10), horizon_y - random.uniform(20, 60)))
+                m2.append(QPointF(i * (w/10), horizon_y - self.rng.uniform(20, 60)))
             self.mountains.append(m2)
 
         # Колір гір залежить від освітлення
         m_color1 = self._blend_colors(QColor(10, 20, 40), QColor(60, 80, 120), max(0, sun_height))
         m_color2 = self._blend_colors(QColor(5, 10, 25), QColor(40, 60, 90), max(0, sun_height))
 
-        for idx, m in enumerate(self.mountains):
-            color = m_color1 if idx == 0 else m_color2
-            p.setBrush(color)
-            poly = [QPointF(0, horizon_y)] + m + [QPointF(w, horizon_y)]
-            p.drawPolygon(poly)
+        # Колір змінюється повільно: шар перепікається лише коли він інший
+        self.draw_layer(p, "mountains", w, h, self._paint_mountains, m_color1, m_color2)
 
         # Рябь на воді
         p.setPen(QPen(QColor(255, 255, 255, 30), 1))
         for _ in range(10):
-            rx = random.uniform(0, w)
-            ry = random.uniform(horizon_y, h)
-            rw = random.uniform(20, 50)
+            rx = self.rng.uniform(0, w)
+            ry = self.rng.uniform(horizon_y, h)
+            rw = self.rng.uniform(20, 50)
             p.drawLine(int(rx), int(ry), int(rx + rw), int(ry))
     
+    def _paint_mountains(self, p, w, h, m_color1, m_color2):
+        horizon_y = h * 0.7
+        p.setPen(Qt.NoPen)
+        for idx, m in enumerate(self.mountains):
+            color = m_color1 if idx == 0 else m_color2
+            p.setBrush(color)
+            poly = [QPointF(0, horizon_y)] + m + [QPointF(w, horizon_y)]
+            p.drawPolygon(poly)
+
     def _blend_colors(self, c1, c2, factor):
         factor = max(0, min(1, factor))
         r = int(c1.red() + (c2.red() - c1.red()) * factor)
@@ -1,8 +1,7 @@
-import random
 import math
-from PySide6.QtGui import QColor, QRadialGradient, QBrush
-from PySide6.QtCore import Qt, QPointF
-from effects import BaseEffect
+import numpy as np
+from PySide6.QtGui import QColor
+from effects import BaseEffect, ParticlePool, draw_particles
 
 class FirefliesEffect(BaseEffect):
     EFFECT_NAME = "fireflies"
@@ -11,7 +10,7 @@ class FirefliesEffect(BaseEffect):
         super().__init__()
         self.count = 60
         self.speed_mult = 1.0
-        self.fireflies = []
+        self.fireflies = ParticlePool(self.count, fields={"base": 2, "phase_offset": 1, "wander_speed": 1})
         
     @classmethod
     def get_schema(cls):
@@ -35,22 +34,22 @@ class FirefliesEffect(BaseEffect):
     def configure(self, config: dict):
         if 'count' in config:
             self.count = int(config['count'])
-            self.fireflies = []
+            self.fireflies.clear()
         if 'speed' in config:
             self.speed_mult = float(config['speed'])
 
     def _init_fireflies(self, w, h):
-         self.fireflies = []
-         for _ in range(self.count):
-            self.fireflies.append({
-                'x': random.uniform(0, w),
-                'y': random.uniform(0, h),
-                'base_x': random.uniform(0, w),
-                'base_y': random.uniform(0, h),
-                'size': random.uniform(2, 6),
-                'phase_offset': random.uniform(0, math.pi * 2),
-                'wander_speed': random.uniform(0.5, 1.5)
-            })
+        rng, n = self.np_rng, self.count
+        self.fireflies.clear()
+        self.fireflies.emit(
+            n,
+            life=np.inf,
+            pos=np.stack((rng.uniform(0, w, n), rng.uniform(0, h, n)), axis=1),
+            base=np.stack((rng.uniform(0, w, n), rng.uniform(0, h, n)), axis=1),
+            size=rng.uniform(2, 6, n),
+            phase_offset=rng.uniform(0, math.pi * 2, n),
+            wander_speed=rng.uniform(0.5, 1.5, n),
+        )
 
     def draw(self, p, w, h, phase):
         # Dark forest night background
@@ -58,43 +57,32 @@ class FirefliesEffect(BaseEffect):
             p.fillRect(0, 0, w, h, QColor(5, 10, 5))
 
         # Initialize fireflies
-        if not self.fireflies:
+        if not len(self.fireflies):
             self._init_fireflies(w, h)
 
-        p.setPen(Qt.NoPen)
+        ff = self.fireflies
+        base, offset = ff.field("base"), ff.field("phase_offset")
         
-        for f in self.fireflies:
-            # Natural wandering movement
-            t = phase * f['wander_speed'] * self.speed_mult
-            
-            # Update base position slightly (brownian-like drift)
-            f['base_x'] += math.sin(t * 0.3 + f['phase_offset']) * 0.5
-            f['base_y'] += math.cos(t * 0.2 + f['phase_offset']) * 0.5
-            
-            # Add wobbly sine movement on top
-            curr_x = f['base_x'] + math.sin(t + f['phase_offset']) * 20
-            curr_y = f['base_y'] + math.cos(t * 0.8 + f['phase_offset']) * 20
-            
-            # Wrap around logic for base coordinates
-            f['base_x'] %= w
-            f['base_y'] %= h
-            
-            # Adjust current draw coordinates for wrapping appearance
-            # (Simple wrap logic: just draw at wrapped curr_x/y)
-            draw_x = curr_x % w
-            draw_y = curr_y % h
-            
-            # Pulse logic
-            pulse = (math.sin(phase * 2 + f['phase_offset']) + 1) * 0.5 # 0.0 to 1.0
-            alpha = int(50 + 205 * pulse)
-            
-            # Color: Yellow-Green
-            # Core
-            p.setBrush(QColor(255, 255, 200, alpha))
-            p.drawEllipse(QPointF(draw_x, draw_y), f['size'], f['size'])
-            
-            # Glow
-            glow_alpha = int(alpha * 0.3)
-            if glow_alpha > 0:
-                p.setBrush(QColor(180, 255, 50, glow_alpha))
-                p.drawEllipse(QPointF(draw_x, draw_y), f['size'] * 3, f['size'] * 3)
+        # Natural wandering movement
+        t = phase * ff.field("wander_speed") * self.speed_mult
+        
+        # Update base position slightly (brownian-like drift)
+        base[:, 0] += np.sin(t * 0.3 + offset) * 0.5
+        base[:, 1] += np.cos(t * 0.2 + offset) * 0.5
+        
+        # Wrap around logic for base coordinates
+        base[:, 0] %= w
+        base[:, 1] %= h
+        
+        # Add wobbly sine movement on top, drawn at wrapped coordinates
+        pos = ff.pos
+        pos[:, 0] = (base[:, 0] + np.sin(t + offset) * 20) % w
+        pos[:, 1] = (base[:, 1] + np.cos(t * 0.8 + offset) * 20) % h
+        
+        # Pulse logic
+        pulse = (np.sin(phase * 2 + offset) + 1) * 0.5 # 0.0 to 1.0
+        alpha = (50 + 205 * pulse) / 255.0
+        
+        # Color: Yellow-Green core, then a faint glow three times wider
+        draw_particles(p, pos, ff.size * 2, (255, 255, 200, 255), alpha)
+        draw_particles(p, pos, ff.size * 6, (180, 255, 50, 255), alpha * 0.3)
@@ -52,18 +52,9 @@ class GalacticCoreEffect(BaseEffect):
                 "label": "Spread"
             },
             "color_core": {
-                "type": "float",
-                "min": 0.0,
-                "max": 1.0,
-                "default": 0.15,
-                "label": "Core Hue"
-            },
-            "color_arms": {
-                "type": "float",
-                "min": 0.0,
-                "max": 1.0,
-                "default": 0.6,
-                "label": "Arms Hue"
+                "type": "color",
+                "default": (255, 255, 200),
+                "label": "Core Color"
             }
         }
 
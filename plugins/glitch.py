@@ -5,8 +5,8 @@ from effects import BaseEffect
 class GlitchEffect(BaseEffect):
     EFFECT_NAME = "glitch"
     
-    def draw(self, p, w, h, phase):
-        if self.show_background:
+    def _paint_backdrop(self, p, w, h, show_background):
+        if show_background:
             # Background gradient (dark blue-gray)
             grad = QLinearGradient(0, 0, 0, h)
             grad.setColorAt(0.0, QColor(12, 16, 24))
@@ -19,6 +19,10 @@ class GlitchEffect(BaseEffect):
         for y in range(0, h, 3):
             p.drawLine(0, y, w, y)
 
+    def draw(self, p, w, h, phase):
+        # Gradient + h/3 scanlines never move: baked once per size
+        self.draw_layer(p, "backdrop", w, h, self._paint_backdrop, self.show_background)
+
         # Glitch bands
         bands = 6
         band_min, band_max = 10, 32
@@ -2,7 +2,7 @@ import random
 import math
 import numpy as np
 from PySide6.QtCore import Qt, QPointF
-from PySide6.QtGui import QColor, QPainter, QBrush, QCursor
+from PySide6.QtGui import QColor, QPainter, QBrush
 
 from effects import BaseEffect
 
@@ -55,7 +55,7 @@ class InteractiveParticlesEffect(BaseEffect):
         p.fillRect(0, 0, w, h, QColor(10, 15, 20))
         
         # 2. Physics & Interaction
-        mouse_pos = QCursor.pos()
+        mouse_pos = self.input.pos()
         mx, my = mouse_pos.x(), mouse_pos.y()
         mouse_active = (-100 < mx < w + 100) and (-100 < my < h + 100)
         
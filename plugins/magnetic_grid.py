@@ -1,6 +1,6 @@
 import math
 from PySide6.QtCore import Qt, QPointF
-from PySide6.QtGui import QColor, QPainter, QCursor, QBrush
+from PySide6.QtGui import QColor, QPainter, QBrush
 
 from effects import BaseEffect
 
@@ -29,7 +29,7 @@ class MagneticGridEffect(BaseEffect):
     def draw(self, p: QPainter, w: int, h: int, phase: float):
         p.fillRect(0, 0, w, h, QColor(10, 10, 15))
         
-        mouse_pos = QCursor.pos()
+        mouse_pos = self.input.pos()
         mx, my = mouse_pos.x(), mouse_pos.y()
         
         p.setPen(Qt.NoPen)
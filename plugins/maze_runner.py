@@ -1,6 +1,6 @@
 import random
 from PySide6.QtCore import Qt, QPointF, QRectF
-from PySide6.QtGui import QColor, QPainter, QBrush, QPen
+from PySide6.QtGui import QColor, QPainter, QBrush, QPen, QPainterPath
 
 from effects import BaseEffect
 
@@ -40,6 +40,22 @@ class MazeRunnerEffect(BaseEffect):
         self.stack = [(0, 0)]
         self.generated = False
         self.runner = None
+        self.invalidate_geometry("walls")
+
+    def _build_walls(self, w, h):
+        # All walls as one path: after generation the maze is static
+        path = QPainterPath()
+        for r in range(self.rows):
+            for c in range(self.cols):
+                cell = self.grid[r][c]
+                x = c * self.cell_size
+                y = r * self.cell_size
+                
+                if cell['walls'][0]: path.moveTo(x, y); path.lineTo(x + self.cell_size, y) # Top
+                if cell['walls'][1]: path.moveTo(x + self.cell_size, y); path.lineTo(x + self.cell_size, y + self.cell_size) # Right
+                if cell['walls'][2]: path.moveTo(x + self.cell_size, y + self.cell_size); path.lineTo(x, y + self.cell_size) # Bottom
+                if cell['walls'][3]: path.moveTo(x, y + self.cell_size); path.lineTo(x, y) # Left
+        return path
 
     def draw(self, p: QPainter, w: int, h: int, phase: float):
         p.fillRect(0, 0, w, h, QColor(20, 20, 20))
@@ -73,6 +89,7 @@ class MazeRunnerEffect(BaseEffect):
                         # Remove walls
                         self.grid[cy][cx]['walls'][wall] = False
                         self.grid[ny][nx]['walls'][opp_wall] = False
+                        self.invalidate_geometry("walls")
                         
                         self.current = (nx, ny)
                         self.grid[ny][nx]['visited'] = True
@@ -96,20 +113,13 @@ class MazeRunnerEffect(BaseEffect):
         # Draw Maze
         p.setPen(QPen(QColor(0, 255, 255), 2))
         
-        for r in range(self.rows):
-            for c in range(self.cols):
-                cell = self.grid[r][c]
-                x = c * self.cell_size
-                y = r * self.cell_size
-                
-                if cell['walls'][0]: p.drawLine(x, y, x + self.cell_size, y) # Top
-                if cell['walls'][1]: p.drawLine(x + self.cell_size, y, x + self.cell_size, y + self.cell_size) # Right
-                if cell['walls'][2]: p.drawLine(x + self.cell_size, y + self.cell_size, x, y + self.cell_size) # Bottom
-                if cell['walls'][3]: p.drawLine(x, y + self.cell_size, x, y) # Left
-                
-                # Highlight current generation head
-                if not self.generated and (c, r) == self.current:
-                    p.fillRect(x+5, y+5, self.cell_size-10, self.cell_size-10, QColor(255, 0, 0))
+        p.setBrush(Qt.NoBrush)
+        p.drawPath(self.geometry("walls", w, h, self._build_walls))
+        
+        # Highlight current generation head
+        if not self.generated:
+            c, r = self.current
+            p.fillRect(c * self.cell_size + 5, r * self.cell_size + 5, self.cell_size - 10, self.cell_size - 10, QColor(255, 0, 0))
 
     def spawn_runner(self):
         self.runner = (0, 0)
@@ -1,6 +1,6 @@
 from collections import deque
 from PySide6.QtCore import Qt, QPointF
-from PySide6.QtGui import QColor, QPainter, QCursor, QPen
+from PySide6.QtGui import QColor, QPainter, QPen
 
 from effects import BaseEffect
 
@@ -14,7 +14,7 @@ class NeonCursorEffect(BaseEffect):
     def draw(self, p: QPainter, w: int, h: int, phase: float):
         p.fillRect(0, 0, w, h, QColor(0, 0, 0))
         
-        mouse_pos = QCursor.pos()
+        mouse_pos = self.input.pos()
         mx, my = mouse_pos.x(), mouse_pos.y()
         
         # Add current position
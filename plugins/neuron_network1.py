@@ -1,7 +1,7 @@
 import math
 import random
 from PySide6.QtCore import Qt, QPointF
-from PySide6.QtGui import QColor, QPainter, QBrush, QPen, QCursor
+from PySide6.QtGui import QColor, QPainter, QBrush, QPen
 
 from effects import BaseEffect
 
@@ -55,7 +55,7 @@ class NeuronNetwork1Effect(BaseEffect):
     def draw(self, p: QPainter, w: int, h: int, phase: float):
         p.fillRect(0, 0, w, h, QColor(0, 5, 10)) # Dark biological background
         
-        mouse_pos = QCursor.pos()
+        mouse_pos = self.input.pos()
         mx, my = mouse_pos.x(), mouse_pos.y()
         
         # 1. Update Neurons
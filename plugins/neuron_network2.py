@@ -1,7 +1,7 @@
 import math
 import random
 from PySide6.QtCore import Qt, QPointF
-from PySide6.QtGui import QColor, QPainter, QBrush, QPen, QCursor, QRadialGradient
+from PySide6.QtGui import QColor, QPainter, QBrush, QPen, QRadialGradient
 
 from effects import BaseEffect
 
@@ -57,7 +57,7 @@ class NeuronNetworkEffect(BaseEffect):
     def draw(self, p: QPainter, w: int, h: int, phase: float):
         p.fillRect(0, 0, w, h, QColor(0, 2, 8)) # Darker background
         
-        mouse_pos = QCursor.pos()
+        mouse_pos = self.input.pos()
         mx, my = mouse_pos.x(), mouse_pos.y()
         
         # 1. Physics (Force Directed) & Update
@@ -1,7 +1,7 @@
 import random
 import math
 from PySide6.QtCore import Qt, QPointF
-from PySide6.QtGui import QColor, QPainter, QCursor, QBrush, QPen
+from PySide6.QtGui import QColor, QPainter, QBrush, QPen
 
 from effects import BaseEffect
 
@@ -29,7 +29,7 @@ class ParallaxLayersEffect(BaseEffect):
 
     def draw(self, p: QPainter, w: int, h: int, phase: float):
         # Mouse interaction for parallax
-        mouse_pos = QCursor.pos()
+        mouse_pos = self.input.pos()
         mx, my = mouse_pos.x(), mouse_pos.y()
         
         # Calculate offset based on center
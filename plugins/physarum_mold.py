@@ -1,9 +1,8 @@
-import random
 import math
 from PySide6.QtCore import Qt, QPointF
-from PySide6.QtGui import QColor, QPainter, QBrush, QPen, QCursor, QImage, QPainterPath
+from PySide6.QtGui import QColor, QPainter, QBrush, QPen, QImage, QPainterPath
 
-from effects import BaseEffect
+from effects import BaseEffect, TrailBuffer
 
 class PhysarumMoldEffect(BaseEffect):
     EFFECT_NAME = "physarum_mold"
@@ -14,13 +13,13 @@ class PhysarumMoldEffect(BaseEffect):
         self.num_particles = 300
         # Initialize particles in center
         for _ in range(self.num_particles):
-            angle = random.uniform(0, math.pi * 2)
-            dist = random.uniform(0, 100)
+            angle = self.rng.uniform(0, math.pi * 2)
+            dist = self.rng.uniform(0, 100)
             self.particles.append({
                 'x': 960 + math.cos(angle) * dist,
                 'y': 540 + math.sin(angle) * dist,
                 'angle': angle,
-                'color': QColor.fromHsv(random.randint(100, 150), 200, 255) # Green slime
+                'color': QColor.fromHsv(self.rng.randint(100, 150), 200, 255) # Green slime
             })
         
         # Grid to store trails (simplified)
@@ -30,12 +29,19 @@ class PhysarumMoldEffect(BaseEffect):
         
         self.sensor_angle = math.pi / 4
         self.sensor_dist = 20
+        # Own trail canvas instead of fading the shared window surface
+        self.trail = TrailBuffer(fade=20 / 255, scale=0.5)
 
     def draw(self, p: QPainter, w: int, h: int, phase: float):
-        # Translucent black background for trail effect
-        p.fillRect(0, 0, w, h, QColor(0, 0, 0, 20))
+        if self.show_background:
+            p.fillRect(0, 0, w, h, QColor(0, 0, 0))
         
-        mouse_pos = QCursor.pos()
+        with self.trail.paint(w, h) as tp:
+            self._step(tp, w, h)
+        self.trail.draw(p, w, h)
+
+    def _step(self, p: QPainter, w: int, h: int):
+        mouse_pos = self.input.pos()
         mx, my = mouse_pos.x(), mouse_pos.y()
         
         p.setPen(Qt.NoPen)
@@ -53,11 +59,11 @@ class PhysarumMoldEffect(BaseEffect):
                  speed = 3.0
             elif dist < 600:
                  # Move towards mouse with noise
-                 target_angle = angle_to_mouse + random.uniform(-0.5, 0.5)
+                 target_angle = angle_to_mouse + self.rng.uniform(-0.5, 0.5)
                  speed = 4.0
             else:
                  # Wander
-                 target_angle = pt['angle'] + random.uniform(-0.2, 0.2)
+                 target_angle = pt['angle'] + self.rng.uniform(-0.2, 0.2)
                  speed = 2.0
             
             # Smooth turn
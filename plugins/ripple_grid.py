@@ -1,6 +1,6 @@
 import math
 from PySide6.QtCore import Qt, QPointF
-from PySide6.QtGui import QColor, QPainter, QCursor, QPen
+from PySide6.QtGui import QColor, QPainter, QPen
 
 from effects import BaseEffect
 
@@ -45,7 +45,7 @@ class RippleGridEffect(BaseEffect):
         self.cols = w // self.spacing + 2
         self.rows = h // self.spacing + 2
         
-        mouse_pos = QCursor.pos()
+        mouse_pos = self.input.pos()
         mx, my = mouse_pos.x(), mouse_pos.y()
         
         p.setPen(QPen(QColor(*self.color_grid), 1))
@@ -3,19 +3,15 @@ import math
 import numpy as np
 from PySide6.QtGui import QColor
 from PySide6.QtCore import Qt
-from effects import BaseEffect
+from effects import SimulatedEffect
 
-class SnowfallEffect(BaseEffect):
+class SnowfallEffect(SimulatedEffect):
     EFFECT_NAME = "snowfall"
     
     def __init__(self):
         super().__init__()
         self.count = 250
         self.speed_mult = 1.0
-        self.pos = None # (N, 2)
-        self.params = None # (N, 3) speed, size, drift
-        self.opacities = None # (N,)
-        self._init_flakes(1920, 1080)
 
     @classmethod
     def get_schema(cls):
@@ -39,51 +35,54 @@ class SnowfallEffect(BaseEffect):
     def configure(self, config: dict):
         if 'count' in config:
             self.count = int(config['count'])
-            self._init_flakes(1920, 1080)
+            self.reset_state()
         if 'speed' in config:
             self.speed_mult = float(config['speed'])
 
-    def _init_flakes(self, w, h):
-        self.pos = np.empty((self.count, 2), dtype=np.float32)
-        self.pos[:, 0] = np.random.uniform(0, w, self.count)
-        self.pos[:, 1] = np.random.uniform(-h, h, self.count)
+    def create_state(self, w, h):
+        pos = np.empty((self.count, 2), dtype=np.float32)
+        pos[:, 0] = self.np_rng.uniform(0, w, self.count)
+        pos[:, 1] = self.np_rng.uniform(-h, h, self.count)
         
-        self.params = np.empty((self.count, 3), dtype=np.float32)
-        self.params[:, 0] = np.random.uniform(1, 3, self.count) # speed
-        self.params[:, 1] = np.random.uniform(2, 5, self.count) # size
-        self.params[:, 2] = np.random.uniform(0.5, 1.5, self.count) # drift
+        params = np.empty((self.count, 3), dtype=np.float32)
+        params[:, 0] = self.np_rng.uniform(1, 3, self.count) # speed
+        params[:, 1] = self.np_rng.uniform(2, 5, self.count) # size
+        params[:, 2] = self.np_rng.uniform(0.5, 1.5, self.count) # drift
         
-        self.opacities = np.random.randint(100, 255, self.count).astype(np.int32)
+        opacities = self.np_rng.integers(100, 255, self.count).astype(np.int32)
+        return {"pos": pos, "params": params, "opacities": opacities}
 
-    def draw(self, p, w, h, phase):
-        if self.pos is None or len(self.pos) != self.count:
-            self._init_flakes(w, h)
-
-        p.setPen(Qt.NoPen)
+    def update(self, state, dt, w, h):
+        pos, params = state["pos"], state["params"]
+        # Швидкості задані в пікселях за кадр при ~30 FPS
+        step = dt * 30
         
-        # Vectorized Update
         # y += speed * speed_mult
-        self.pos[:, 1] += self.params[:, 0] * self.speed_mult
+        pos[:, 1] += params[:, 0] * self.speed_mult * step
         
-        # x += sin(phase * 2 + y * 0.01) * drift
-        self.pos[:, 0] += np.sin(phase * 2 + self.pos[:, 1] * 0.01) * self.params[:, 2]
+        # x += sin(t * 2 + y * 0.01) * drift
+        pos[:, 0] += np.sin(self.sim_time * 2 + pos[:, 1] * 0.01) * params[:, 2] * step
         
         # Reset if off screen
-        reset_mask = self.pos[:, 1] > h
+        reset_mask = pos[:, 1] > h
         if np.any(reset_mask):
-            self.pos[reset_mask, 1] = -20
-            self.pos[reset_mask, 0] = np.random.uniform(0, w, np.sum(reset_mask))
+            pos[reset_mask, 1] = -20
+            pos[reset_mask, 0] = self.np_rng.uniform(0, w, np.sum(reset_mask))
 
-        # Draw
-        # Loop for variable opacity and size (QPainter is the bottleneck now)
-        # Optimized approach: Maybe bin by opacity? 
-        # For now, standard loop is fine as logic is the heavy part usually.
-        
-        for i in range(self.count):
-            size = int(self.params[i, 1])
-            p.setBrush(QColor(255, 255, 255, int(self.opacities[i])))
-            x = int(self.pos[i, 0])
-            y = int(self.pos[i, 1])
+    def snapshot(self, state):
+        # params/opacities змінюються лише при перестворенні стану - копіюємо тільки позиції
+        return {"pos": state["pos"].astype(np.int32), "params": state["params"], "opacities": state["opacities"]}
+
+    def render(self, p, w, h, frame, phase):
+        pos, sizes, opacities = frame["pos"], frame["params"][:, 1].astype(np.int32), frame["opacities"]
+        p.setPen(Qt.NoPen)
+
+        # QPainter is the bottleneck now; the simulation runs on its own thread
+        for i in range(len(pos)):
+            size = int(sizes[i])
+            p.setBrush(QColor(255, 255, 255, int(opacities[i])))
+            x = int(pos[i, 0])
+            y = int(pos[i, 1])
             p.drawEllipse(x, y, size, size)
             
             # Subtle glow for larger flakes
@@ -1,5 +1,6 @@
 import random
 import math
+import numpy as np
 from PySide6.QtGui import QColor, QRadialGradient, QBrush, QLinearGradient, QPen, QPainterPath, QPolygonF
 from PySide6.QtCore import Qt, QPointF
 from effects import BaseEffect
@@ -14,7 +15,6 @@ class SpaceForceFieldEffect(BaseEffect):
         self.ships = []
         self.asteroids = []
         self.field_impacts = [] # Points where the field is "hit"
-        self.hex_grid = None
 
     def _init_assets(self, w, h):
         base_radius = min(w, h) * 0.35
@@ -301,29 +301,34 @@ class SpaceForceFieldEffect(BaseEffect):
         p.setPen(Qt.NoPen)
         p.drawEllipse(QPointF(cx, cy), base_radius * 1.2, base_radius * 1.2)
 
-        if self.hex_grid is None:
-            self.hex_grid = self._generate_hex_grid(base_radius * 1.1)
+        grid = self.geometry("hex_grid", w, h, self._generate_hex_grid)
+
+        # Ripple depends only on distance from the center: one alpha per ring
+        ring_alpha = (15 + (np.sin(grid['ring_dist'] * 0.05 - phase * 4) * 0.5 + 0.5) * 45).astype(int)
+
+        impact_bonus = np.zeros(len(grid['polys']))
+        for imp in self.field_impacts:
+            dist_to_imp = np.hypot(grid['centers'][:, 0] + cx - imp['x'], grid['centers'][:, 1] + cy - imp['y'])
+            np.maximum(impact_bonus, (1.0 - dist_to_imp / 60) * imp['life'] * 150, out=impact_bonus, where=dist_to_imp < 60)
+        hit_rings = set(grid['ring'][impact_bonus > 0].tolist())
 
         p.save()
         p.translate(cx, cy)
-        for hex_poly, center_dist in self.hex_grid:
-            ripple = math.sin(center_dist * 0.05 - phase * 4) * 0.5 + 0.5
-            alpha = int(15 + ripple * 45)
-            
-            impact_bonus = 0
-            for imp in self.field_impacts:
-                dist_to_imp = math.sqrt((hex_poly.boundingRect().center().x() + cx - imp['x'])**2 + 
-                                      (hex_poly.boundingRect().center().y() + cy - imp['y'])**2)
-                if dist_to_imp < 60:
-                    impact_bonus = max(impact_bonus, (1.0 - dist_to_imp/60) * imp['life'] * 150)
-            
-            final_alpha = min(255, alpha + int(impact_bonus))
-            color = QColor(100, 200, 255, final_alpha)
-            if impact_bonus > 50:
-                color = QColor(200, 230, 255, final_alpha)
-                
-            p.setPen(QPen(color, 1))
-            p.drawPolygon(hex_poly)
+        for ring, path in enumerate(grid['ring_paths']):
+            alpha = int(ring_alpha[ring])
+            if ring not in hit_rings:
+                # Untouched ring: all hexes share a color, one drawPath
+                p.setPen(QPen(QColor(100, 200, 255, alpha), 1))
+                p.drawPath(path)
+                continue
+            for i in grid['ring_members'][ring]:
+                bonus = impact_bonus[i]
+                final_alpha = min(255, alpha + int(bonus))
+                color = QColor(100, 200, 255, final_alpha)
+                if bonus > 50:
+                    color = QColor(200, 230, 255, final_alpha)
+                p.setPen(QPen(color, 1))
+                p.drawPolygon(grid['polys'][i])
         p.restore()
 
         for imp in self.field_impacts:
@@ -342,9 +347,12 @@ class SpaceForceFieldEffect(BaseEffect):
             p.setBrush(Qt.NoBrush)
             p.drawEllipse(QPointF(imp['x'], imp['y']), ring_radius, ring_radius)
 
-    def _generate_hex_grid(self, radius):
+    def _generate_hex_grid(self, w, h):
+        """ Static hex shell for this resolution: polygons, centers (NumPy),
+        and one combined path per ring of equal distance from the center """
+        radius = min(w, h) * 0.35 * 1.1
         hex_size = 25
-        grid = []
+        polys, centers, dists = [], [], []
         for q in range(-15, 16):
             for r in range(-15, 16):
                 x = hex_size * (3/2 * q)
@@ -356,5 +364,24 @@ class SpaceForceFieldEffect(BaseEffect):
                         angle_rad = math.pi / 180 * (60 * i)
                         points.append(QPointF(x + hex_size * 0.9 * math.cos(angle_rad), 
                                             y + hex_size * 0.9 * math.sin(angle_rad)))
-                    grid.append((QPolygonF(points), dist))
-        return grid
+                    polys.append(QPolygonF(points))
+                    centers.append((x, y))
+                    dists.append(dist)
+
+        ring_dist, ring = np.unique(np.round(dists, 3), return_inverse=True)
+        ring_members = [np.flatnonzero(ring == i) for i in range(len(ring_dist))]
+        ring_paths = []
+        for members in ring_members:
+            path = QPainterPath()
+            for i in members:
+                path.addPolygon(polys[i])
+                path.closeSubpath()
+            ring_paths.append(path)
+        return {
+            'polys': polys,
+            'centers': np.array(centers, dtype=float).reshape(-1, 2),
+            'ring': ring,
+            'ring_dist': ring_dist,
+            'ring_members': ring_members,
+            'ring_paths': ring_paths,
+        }
@@ -1,7 +1,7 @@
 import random
 import math
 from PySide6.QtCore import Qt, QPointF
-from PySide6.QtGui import QColor, QPainter, QCursor, QPen, QBrush
+from PySide6.QtGui import QColor, QPainter, QPen, QBrush
 
 from effects import BaseEffect
 
@@ -73,7 +73,7 @@ class SpiderSwarmEffect(BaseEffect):
         if self.show_background:
             p.fillRect(0, 0, w, h, QColor(20, 15, 15)) # Dark, slightly reddish bg
         
-        mouse_pos = QCursor.pos()
+        mouse_pos = self.input.pos()
         mx, my = mouse_pos.x(), mouse_pos.y()
         
         # Calculate mouse speed
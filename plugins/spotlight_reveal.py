@@ -1,6 +1,6 @@
 import random
 from PySide6.QtCore import Qt, QPointF, QRectF
-from PySide6.QtGui import QColor, QPainter, QCursor, QRadialGradient, QBrush, QFont
+from PySide6.QtGui import QColor, QPainter, QRadialGradient, QBrush, QFont
 
 from effects import BaseEffect
 
@@ -24,7 +24,7 @@ class SpotlightRevealEffect(BaseEffect):
         # 1. Fill black (The darkness)
         p.fillRect(0, 0, w, h, QColor(0, 0, 0))
         
-        mouse_pos = QCursor.pos()
+        mouse_pos = self.input.pos()
         mx, my = mouse_pos.x(), mouse_pos.y()
         
         # 2. Define Spotlight Gradient
@@ -1,7 +1,7 @@
 import random
 import math
 from PySide6.QtCore import Qt, QPointF, QRectF
-from PySide6.QtGui import QColor, QPainter, QBrush, QPen, QCursor, QLinearGradient, QPolygonF
+from PySide6.QtGui import QColor, QPainter, QBrush, QPen, QLinearGradient, QPolygonF
 
 from effects import BaseEffect
 
@@ -91,7 +91,7 @@ class SynthwaveDriveEffect(BaseEffect):
         cx = w / 2
         
         # Mouse Interaction (Parallax)
-        mouse_pos = QCursor.pos()
+        mouse_pos = self.input.pos()
         mx = mouse_pos.x()
         
         # Shift -1 to 1 based on mouse x relative to center
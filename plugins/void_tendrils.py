@@ -1,7 +1,7 @@
 import math
 import random
 from PySide6.QtCore import Qt, QPointF
-from PySide6.QtGui import QColor, QPainter, QBrush, QPen, QCursor, QRadialGradient
+from PySide6.QtGui import QColor, QPainter, QBrush, QPen, QRadialGradient
 
 from effects import BaseEffect
 
@@ -98,7 +98,7 @@ class VoidTendrilsEffect(BaseEffect):
         if self.show_background:
             p.fillRect(0, 0, w, h, QColor(0, 0, 0)) 
         
-        mouse_pos = QCursor.pos()
+        mouse_pos = self.input.pos()
         mx, my = mouse_pos.x(), mouse_pos.y()
         
         # Vignette
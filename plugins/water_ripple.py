@@ -26,6 +26,12 @@ class WaterRippleEffect(BaseEffect):
     def configure(self, config: dict):
         if 'chance' in config: self.spawn_chance = float(config['chance'])
 
+    def _paint_background(self, p, w, h):
+        bg = QLinearGradient(0, 0, 0, h)
+        bg.setColorAt(0, QColor(0, 20, 40))
+        bg.setColorAt(1, QColor(0, 5, 10))
+        p.fillRect(0, 0, w, h, QBrush(bg))
+
     def draw(self, p, w, h, phase):
         if self.ripples is None:
             self.ripples = []
@@ -33,10 +39,7 @@ class WaterRippleEffect(BaseEffect):
                 self.ripples.append(self._create_ripple(w, h))
 
         if self.show_background:
-            bg = QLinearGradient(0, 0, 0, h)
-            bg.setColorAt(0, QColor(0, 20, 40))
-            bg.setColorAt(1, QColor(0, 5, 10))
-            p.fillRect(0, 0, w, h, QBrush(bg))
+            self.draw_layer(p, "background", w, h, self._paint_background)
 
         if random.random() < self.spawn_chance:
             self.ripples.append(self._create_ripple(w, h))
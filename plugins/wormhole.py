@@ -1,7 +1,7 @@
 import math
 import random
 from PySide6.QtCore import Qt, QPointF
-from PySide6.QtGui import QColor, QPainter, QBrush, QPen, QCursor, QPolygonF
+from PySide6.QtGui import QColor, QPainter, QBrush, QPen, QPolygonF
 
 from effects import BaseEffect
 
@@ -89,7 +89,7 @@ class WormholeEffect(BaseEffect):
         cx, cy = w / 2, h / 2
         
         # Mouse Interaction (Camera Steering)
-        mouse_pos = QCursor.pos()
+        mouse_pos = self.input.pos()
         mx, my = mouse_pos.x(), mouse_pos.y()
         
         # Target camera position based on mouse relative to center
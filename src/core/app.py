@@ -1,23 +1,20 @@
 import sys
-import ctypes
-import json
 import os
 
 from PySide6.QtWidgets import QApplication
 
 from src.core.resources import get_resource_path
-from src.utils.win_utils import attach_to_workerw
+from src.core.preset_schema import load_preset_file
+from src.platform.base import get_platform
 from src.ui.settings import SettingsWindow
 from src.core.wallpaper import DynamicWallpaper
-from src.utils.hotkeys import HotkeyFilter
 
 def run():
     config = None
     if len(sys.argv) > 1 and sys.argv[1] == "--config":
         if len(sys.argv) > 2 and os.path.exists(sys.argv[2]):
             try:
-                with open(sys.argv[2], 'r', encoding='utf-8') as f:
-                    config = json.load(f)
+                config = load_preset_file(sys.argv[2])
             except Exception as e:
                 print(f"Error loading config: {e}")
 
@@ -26,12 +23,16 @@ def run():
         default_preset = get_resource_path(os.path.join('presets', 'main.json'))
         if os.path.exists(default_preset):
             try:
-                with open(default_preset, 'r', encoding='utf-8') as f:
-                    config = json.load(f)
-            except: pass
+                config = load_preset_file(default_preset)
+            except Exception as e:
+                print(f"Error loading default preset: {e}")
+
+    platform = get_platform()
+    print(f"Platform: {platform.name}")
 
     # GPU Shims
-    os.environ["SHIM_MCCOMPAT"] = "0x800000001" 
+    if platform.name == "windows":
+        os.environ["SHIM_MCCOMPAT"] = "0x800000001" 
     os.environ["QT_OPENGL"] = "desktop"
 
     app = QApplication(sys.argv)
@@ -59,18 +60,13 @@ def run():
             )
             settings_win.set_fps(wall.fps)
 
-    user32 = ctypes.windll.user32
-    if user32.RegisterHotKey(None, 1, 0x0002, 0x33): 
-        print("Hotkey Ctrl+3 registered!")
-        hotkey_filter = HotkeyFilter(toggle_settings)
-        app.installNativeEventFilter(hotkey_filter)
-    
     settings_win.change_effect_signal.connect(wall.switch_effect)
     settings_win.load_preset_signal.connect(wall.load_preset)
     settings_win.toggle_background_signal.connect(wall.set_show_background)
     settings_win.set_background_signal.connect(wall.set_background_source)
     settings_win.set_fps_signal.connect(wall.set_target_fps)
     wall.fps_update_signal.connect(settings_win.update_fps)
+    wall.audio_latency_signal.connect(settings_win.update_audio_latency)
 
     settings_win.add_widget_signal.connect(wall.add_local_widget)
     settings_win.remove_widget_signal.connect(wall.remove_local_widget)
@@ -103,12 +99,22 @@ def run():
         if settings_win.isVisible():
             sync_settings_widgets()
             
-    app.removeNativeEventFilter(hotkey_filter)
-    hotkey_filter = HotkeyFilter(new_toggle)
-    app.installNativeEventFilter(hotkey_filter)
+    if platform.register_hotkey(app, "Ctrl+3", new_toggle):
+        print("Hotkey Ctrl+3 registered!")
+    # Опитування гарячих клавіш теж зупиняється разом зі шпалерами
+    wall.lifecycle.register(platform)
 
-    attached = attach_to_workerw(int(wall.winId()))
+    attached = platform.attach_to_desktop(wall.winId())
     if not attached:
-        print("[WARN] Failed to attach to WorkerW")
+        print(f"[WARN] Failed to attach to desktop ({platform.name})")
+    else:
+        wall.screens.attach_all(platform.attach_to_desktop)
+
+    # Locked session -> suspend everything, same as occlusion
+    platform.register_session_notifications(
+        app, wall.winId(),
+        lambda: wall.lifecycle.suspend("locked"),
+        lambda: wall.lifecycle.resume("locked"),
+    )
 
     sys.exit(app.exec())
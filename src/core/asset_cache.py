@@ -0,0 +1,183 @@
+import atexit
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+
+from src.core.resources import get_resource_path
+
+
+def hash_bytes(data):
+    return hashlib.sha1(data).hexdigest()
+
+
+class AssetCache:
+    """ Кеш похідних ассетів, адресований вмістом.
+
+    Ключ = хеш вмісту джерела + параметри перетворення, тож змінений файл
+    за тим самим шляхом дає новий ключ, а однакові файли - спільний запис.
+    Усі записи описані в index.json: пошук не звертається до диска,
+    запис атомарний (tempfile + os.replace), а розмір обмежений LRU-витісненням.
+    Підходить для масштабованих фонів, атласів спрайтів, бінарників шейдерів.
+    """
+    INDEX_NAME = "index.json"
+
+    def __init__(self, root=None, max_bytes=512 * 1024 * 1024):
+        self.root = root or get_resource_path(os.path.join("cache", "assets"))
+        self.max_bytes = max_bytes
+        self._lock = threading.RLock()
+        self._entries = {}   # key -> {"file", "size", "atime"}
+        self._sources = {}   # abs path -> {"mtime_ns", "size", "hash"}
+        self._dirty = False
+        self._load_index()
+        atexit.register(self.flush)
+
+    # --- Ключі ---
+
+    def source_hash(self, path):
+        """ Хеш вмісту файлу; перераховується лише коли змінились mtime/розмір """
+        path = os.path.abspath(path)
+        st = os.stat(path)
+        with self._lock:
+            known = self._sources.get(path)
+            if known and known["mtime_ns"] == st.st_mtime_ns and known["size"] == st.st_size:
+                return known["hash"]
+        h = hashlib.sha1()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                h.update(chunk)
+        digest = h.hexdigest()
+        with self._lock:
+            self._sources[path] = {"mtime_ns": st.st_mtime_ns, "size": st.st_size, "hash": digest}
+            self._dirty = True
+        return digest
+
+    @staticmethod
+    def key(content_hash, **params):
+        if not params:
+            return content_hash
+        return hash_bytes(f"{content_hash}|{json.dumps(params, sort_keys=True)}".encode())
+
+    # --- Читання ---
+
+    def get_path(self, key):
+        """ Шлях до закешованого файлу або None (без звернення до диска) """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            entry["atime"] = time.time()
+            self._dirty = True
+            return os.path.join(self.root, entry["file"])
+
+    def get_bytes(self, key):
+        path = self.get_path(key)
+        if path is None:
+            return None
+        try:
+            with open(path, 'rb') as f:
+                return f.read()
+        except OSError:
+            self.discard(key)
+            return None
+
+    # --- Запис ---
+
+    def put_bytes(self, key, data, ext=""):
+        return self.put_file(key, ext, lambda tmp: _write_bytes(tmp, data))
+
+    def put_file(self, key, ext, writer):
+        """ writer(tmp_path) пише файл; у кеш він потрапляє атомарно """
+        os.makedirs(self.root, exist_ok=True)
+        name = key + ext
+        target = os.path.join(self.root, name)
+        fd, tmp = tempfile.mkstemp(dir=self.root, suffix=".tmp")
+        os.close(fd)
+        try:
+            if writer(tmp) is False:
+                raise OSError(f"writer failed for {name}")
+            os.replace(tmp, target)
+        except Exception:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise
+        with self._lock:
+            self._entries[key] = {"file": name, "size": os.path.getsize(target), "atime": time.time()}
+            self._dirty = True
+            self._evict()
+        self.flush()
+        return target
+
+    def discard(self, key):
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            self._dirty = True
+        if entry:
+            try:
+                os.remove(os.path.join(self.root, entry["file"]))
+            except OSError:
+                pass
+
+    def total_bytes(self):
+        with self._lock:
+            return sum(e["size"] for e in self._entries.values())
+
+    def _evict(self):
+        total = sum(e["size"] for e in self._entries.values())
+        if total <= self.max_bytes:
+            return
+        for key, entry in sorted(self._entries.items(), key=lambda kv: kv[1]["atime"]):
+            if total <= self.max_bytes:
+                break
+            total -= entry["size"]
+            del self._entries[key]
+            try:
+                os.remove(os.path.join(self.root, entry["file"]))
+            except OSError:
+                pass
+
+    # --- Індекс ---
+
+    def _load_index(self):
+        try:
+            with open(os.path.join(self.root, self.INDEX_NAME), 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            self._entries = data.get("entries", {})
+            self._sources = data.get("sources", {})
+        except (OSError, ValueError):
+            pass
+
+    def flush(self):
+        with self._lock:
+            if not self._dirty:
+                return
+            payload = json.dumps({"entries": self._entries, "sources": self._sources})
+            self._dirty = False
+        try:
+            os.makedirs(self.root, exist_ok=True)
+            _write_bytes_atomic(os.path.join(self.root, self.INDEX_NAME), payload.encode())
+        except OSError as e:
+            print(f"Asset cache index write error: {e}")
+
+
+def _write_bytes(path, data):
+    with open(path, 'wb') as f:
+        f.write(data)
+
+
+def _write_bytes_atomic(path, data):
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    with os.fdopen(fd, 'wb') as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+_cache = None
+
+def get_asset_cache():
+    global _cache
+    if _cache is None:
+        _cache = AssetCache()
+    return _cache
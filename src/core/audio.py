@@ -1,11 +1,16 @@
 import time
+import threading
 import numpy as np
 import pyaudio
-from PySide6.QtCore import QThread, Signal, QObject
+from PySide6.QtCore import QThread
+
+from src.utils.ring_buffer import TimedRingBuffer
+
+AUDIO_BANDS = ('bass', 'mid', 'treble')
 
 class AudioCapture(QThread):
-    # Sends (bass, mid, treble) normalized 0.0-1.0
-    data_signal = Signal(float, float, float)
+    # Writes (bass, mid, treble) normalized 0.0-1.0 into a timestamped ring,
+    # the renderer pulls the sample closest to its frame time.
 
     def __init__(self):
         super().__init__()
@@ -14,6 +19,10 @@ class AudioCapture(QThread):
         self.stream = None
         self.chunk_size = 1024
         self.rate = 44100
+        self.ring = TimedRingBuffer(len(AUDIO_BANDS), capacity=64)
+        self.input_latency = 0.0
+        self._active = threading.Event()
+        self._active.set()
         
     def run(self):
         try:
@@ -45,11 +54,26 @@ class AudioCapture(QThread):
                 frames_per_buffer=self.chunk_size
             )
             
-            print(f"Audio Capture started on device: {device_index}")
+            try:
+                self.input_latency = self.stream.get_input_latency()
+            except Exception:
+                self.input_latency = 0.0
+            print(f"Audio Capture started on device: {device_index} (input latency {self.input_latency * 1000:.1f} ms)")
 
             while self.running:
+                if not self._active.is_set():
+                    # Suspended: stop the device stream and sleep until resumed
+                    self.stream.stop_stream()
+                    self._active.wait()
+                    if not self.running:
+                        break
+                    self.stream.start_stream()
+                    continue
                 try:
                     data = self.stream.read(self.chunk_size, exception_on_overflow=False)
+                    # Середина чанку з урахуванням затримки пристрою
+                    captured_at = (time.perf_counter() - self.input_latency
+                                   - self.chunk_size / self.rate / 2)
                     # Convert to numpy array
                     audio_data = np.frombuffer(data, dtype=np.int16)
                     
@@ -75,7 +99,7 @@ class AudioCapture(QThread):
                     mid = min(1.0, mid * 3.0)
                     treble = min(1.0, treble * 5.0)
                     
-                    self.data_signal.emit(bass, mid, treble)
+                    self.ring.write((bass, mid, treble), captured_at)
                     
                 except Exception as e:
                     print(f"Audio read error: {e}")
@@ -85,11 +109,26 @@ class AudioCapture(QThread):
             print(f"Audio Capture Init Error: {e}")
         finally:
             if self.stream:
-                self.stream.stop_stream()
+                if not self.stream.is_stopped():
+                    self.stream.stop_stream()
                 self.stream.close()
             if self.pa:
                 self.pa.terminate()
 
+    def snapshot_at(self, t):
+        """ Повертає (audio_dict, timestamp) зразка, найближчого до часу кадру t """
+        ts, values = self.ring.sample_at(t)
+        if ts is None:
+            return None, None
+        return dict(zip(AUDIO_BANDS, values.tolist())), ts
+
+    def on_suspend(self):
+        self._active.clear()
+
+    def on_resume(self):
+        self._active.set()
+
     def stop(self):
         self.running = False
+        self._active.set()
         self.wait()
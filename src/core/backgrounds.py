@@ -1,10 +1,14 @@
 import os
-import hashlib
-from PySide6.QtCore import Qt, QSize, QUrl, Signal, QObject, QRect
+from PySide6.QtCore import Qt, QSize, QUrl, Signal, QObject, QRect, QThreadPool
 from PySide6.QtGui import QImage, QPixmap, QMovie, QPainter
 from PySide6.QtMultimedia import QMediaPlayer, QVideoSink, QAudioOutput
 
+from src.core.asset_cache import get_asset_cache
+
 class BackgroundManager(QObject):
+    # Результат preload() з пулу потоків; приймається в GUI-потоці
+    image_decoded = Signal(QImage, int, int)
+
     def __init__(self, config=None):
         super().__init__()
         self.config = config or {}
@@ -18,15 +22,15 @@ class BackgroundManager(QObject):
         self.audio_output = None
         self.current_frame = None
         self._processing_frame = False
-        
-        self.cache_dir = "cache"
-        if not os.path.exists(self.cache_dir):
-            os.makedirs(self.cache_dir)
+        self._decoding = None  # (w, h) фонового декодування, що ще триває
+        self._closed = False
+        self.image_decoded.connect(self._on_image_decoded)
             
         self._init_background()
 
     def cleanup(self):
         """Очистка ресурсів перед видаленням менеджера"""
+        self._closed = True
         if self.player:
             self.player.stop()
             self.player.setVideoSink(None)
@@ -36,6 +40,30 @@ class BackgroundManager(QObject):
         self.current_frame = None
         self.image = None
 
+    def on_suspend(self):
+        """Зупиняє декодування відео/GIF, поки шпалери не видно"""
+        if self.player:
+            self.player.pause()
+        if self.movie:
+            self.movie.setPaused(True)
+
+    def on_resume(self):
+        if self.player:
+            self.player.play()
+        if self.movie:
+            self.movie.setPaused(False)
+
+    def matches(self, conf):
+        """ Чи показує менеджер те саме джерело (шлях порівнюється після resolve) """
+        from src.core.resources import resolve_path
+
+        conf = conf or {}
+        if not conf.get("path") or self.bg_type == "none":
+            return False
+        same_opts = ({k: v for k, v in conf.items() if k != "path"}
+                     == {k: v for k, v in self.config.items() if k != "path"})
+        return same_opts and resolve_path(conf["path"]) == self.path
+
     def _init_background(self):
         from src.core.resources import resolve_path
         
@@ -79,16 +107,48 @@ class BackgroundManager(QObject):
     def _on_video_frame(self, frame):
         self.current_frame = frame.toImage()
 
+    def preload(self, w, h):
+        """ Декодує зображення у пулі потоків, щоб перший draw() не блокував кадр """
+        if self.bg_type != "image" or (self.image is not None and self.image.size() == QSize(w, h)):
+            return
+
+        if self._decoding == (w, h):
+            return
+        self._decoding = (w, h)
+
+        def decode():
+            img = self.get_cached_image(w, h)
+            try:
+                self.image_decoded.emit(img if img is not None else QImage(), w, h)
+            except RuntimeError:
+                pass  # менеджер уже знищено
+
+        QThreadPool.globalInstance().start(decode)
+
+    def _on_image_decoded(self, img, w, h):
+        if self._decoding == (w, h):
+            self._decoding = None
+        if self._closed or img.isNull() or img.width() != w or img.height() != h:
+            return
+        if self.image is None or self.image.size() != img.size():
+            self.image = img
+
     def get_cached_image(self, w, h):
         if not self.path:
             return None
             
-        # Create a unique key for the cache based on path and size
-        file_hash = hashlib.md5(self.path.encode()).hexdigest()
-        cache_file = os.path.join(self.cache_dir, f"{file_hash}_{w}x{h}.png")
+        # Ключ - вміст файлу + параметри масштабування, а не шлях
+        cache = get_asset_cache()
+        try:
+            key = cache.key(cache.source_hash(self.path), op="scale", w=w, h=h, mode="ignore_aspect_smooth")
+        except OSError:
+            return None
         
-        if os.path.exists(cache_file):
-            return QImage(cache_file)
+        if cache_file := cache.get_path(key):
+            cached = QImage(cache_file)
+            if not cached.isNull():
+                return cached
+            cache.discard(key)
         
         # If not cached, load original and scale
         original = QImage(self.path)
@@ -96,7 +156,10 @@ class BackgroundManager(QObject):
             return None
             
         scaled = original.scaled(w, h, Qt.IgnoreAspectRatio, Qt.SmoothTransformation)
-        scaled.save(cache_file, "PNG")
+        try:
+            cache.put_file(key, ".png", lambda tmp: scaled.save(tmp, "PNG"))
+        except OSError as e:
+            print(f"BackgroundManager: cache write failed: {e}")
         return scaled
 
     def _on_video_frame(self, frame):
@@ -131,6 +194,10 @@ class BackgroundManager(QObject):
         
         if self.bg_type == "image":
             if self.image is None or self.image.width() != w or self.image.height() != h:
+                if self._decoding == (w, h):
+                    # preload() ще декодує саме цей розмір - не дублюємо роботу
+                    p.setCompositionMode(QPainter.CompositionMode_SourceOver)
+                    return
                 self.image = self.get_cached_image(w, h)
             if self.image:
                 p.drawImage(target_rect, self.image)
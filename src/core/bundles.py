@@ -0,0 +1,218 @@
+import hashlib
+import importlib.util
+import json
+import mmap
+import os
+import sys
+import zipfile
+import zipimport
+
+from src.core.asset_cache import get_asset_cache
+
+BUNDLE_EXT = ".dwb"
+INDEX_NAME = "index.json"
+PRESET_NAME = "preset.json"
+MODULE_DIRS = ("effects", "widgets")
+
+
+def _norm(path):
+    path = path.replace("\\", "/")
+    while path.startswith("./"):
+        path = path[2:]
+    return path
+
+
+class DirectoryBundle:
+    """ Звичайна тека бандла. Файли індексуються один раз при відкритті,
+    тож resolve() - пошук у множині; os.path.isfile лише для промахів """
+    def __init__(self, path):
+        self.path = path
+        self.files = set()
+        for root, dirs, files in os.walk(path):
+            dirs[:] = [d for d in dirs if d != "__pycache__"]
+            for f in files:
+                self.files.add(_norm(os.path.relpath(os.path.join(root, f), path)))
+
+    def read_config(self):
+        with open(os.path.join(self.path, PRESET_NAME), 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def config_path(self):
+        return os.path.join(self.path, PRESET_NAME)
+
+    def module_names(self, kind):
+        return sorted(f[len(kind) + 1:-3] for f in self.files
+                      if f.startswith(kind + "/") and f.endswith(".py") and f.count("/") == 1)
+
+    def load_module(self, kind, name):
+        """ Модуль без реєстрації в sys.modules (PluginEffectWrapper однаково перезавантажує з файлу) """
+        file_path = self.module_path(kind, name)
+        spec = importlib.util.spec_from_file_location(f"bundle_{kind}_{name}", file_path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        return module
+
+    def module_path(self, kind, name):
+        return os.path.join(self.path, kind, name + ".py")
+
+    def resolve(self, path):
+        rel = _norm(path)
+        full = os.path.join(self.path, rel)
+        if rel in self.files:
+            return full
+        # Файл могли додати в підтеку вже після індексації: mtime кореня
+        # (ключ кешу open_bundle) від цього не змінюється
+        if os.path.isfile(full):
+            self.files.add(rel)
+            return full
+        return None
+
+    def close(self):
+        pass
+
+
+class ZipBundle:
+    """ Бандл одним файлом (zip з index.json).
+
+    Код ефектів/віджетів імпортується через zipimport без засмічення
+    sys.modules, ассети читаються з mmap (stored-члени - без копіювання)
+    і розпаковуються лише при першому зверненні в кеш за хешем вмісту.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, 'rb')
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        # ZipFile читає через звичайний файл (mmap до 3.13 не має seekable()),
+        # а stored-ассети беруться напряму з mmap
+        self.zip = zipfile.ZipFile(self._file)
+        self.members = {info.filename: info for info in self.zip.infolist()}
+        if INDEX_NAME in self.members:
+            self.index = json.loads(self.zip.read(INDEX_NAME))
+        else:
+            self.index = build_index(self.members)
+        self._importers = {}
+        self._resolved = {}
+
+    def read_config(self):
+        return json.loads(self.zip.read(self.index.get("preset", PRESET_NAME)))
+
+    def config_path(self):
+        return None
+
+    def module_names(self, kind):
+        return list(self.index.get(kind, []))
+
+    def load_module(self, kind, name):
+        importer = self._importers.get(kind)
+        if importer is None:
+            importer = self._importers[kind] = zipimport.zipimporter(f"{self.path}/{kind}")
+        spec = importer.find_spec(name)
+        if spec is None:
+            raise ImportError(f"{kind}/{name}.py not found in {self.path}")
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        return module
+
+    def module_path(self, kind, name):
+        return f"{self.path}/{kind}/{name}.py"
+
+    def asset_view(self, name):
+        """ Вміст члена архіву; для ZIP_STORED - memoryview прямо над mmap """
+        info = self.members[name]
+        if info.compress_type != zipfile.ZIP_STORED:
+            return self.zip.read(info)
+        # Локальний заголовок: 30 байт + ім'я + extra, далі дані
+        off = info.header_offset
+        name_len = int.from_bytes(self._mm[off + 26:off + 28], "little")
+        extra_len = int.from_bytes(self._mm[off + 28:off + 30], "little")
+        start = off + 30 + name_len + extra_len
+        return memoryview(self._mm)[start:start + info.file_size]
+
+    def resolve(self, path):
+        rel = _norm(path)
+        if rel in self._resolved:
+            return self._resolved[rel]
+        if rel not in self.members or rel.endswith("/"):
+            return None
+        self._resolved[rel] = self._extract(rel)
+        return self._resolved[rel]
+
+    def _extract(self, rel):
+        asset = self.index.get("assets", {}).get(rel, {})
+        data = None
+        digest = asset.get("sha1")
+        if digest is None:
+            data = self.asset_view(rel)
+            digest = hashlib.sha1(data).hexdigest()
+        cache = get_asset_cache()
+        if target := cache.get_path(digest):
+            return target
+
+        if data is None:
+            data = self.asset_view(rel)
+        return cache.put_bytes(digest, data, os.path.splitext(rel)[1])
+
+    def close(self):
+        self.zip.close()
+        self._mm.close()
+        self._file.close()
+
+
+def build_index(names):
+    """ Індекс бандла: модулі та ассети (без хешів, якщо вони не відомі) """
+    index = {"version": 1, "preset": PRESET_NAME, "assets": {}}
+    for kind in MODULE_DIRS:
+        index[kind] = sorted(n[len(kind) + 1:-3] for n in names
+                             if n.startswith(kind + "/") and n.endswith(".py") and n.count("/") == 1)
+    for n in names:
+        if not n.endswith((".py", "/")) and n not in (INDEX_NAME, PRESET_NAME):
+            index["assets"][n] = {}
+    return index
+
+
+def is_bundle_file(path):
+    return path.endswith(BUNDLE_EXT) and os.path.isfile(path)
+
+
+_open = {}
+
+def open_bundle(path):
+    """ Кешує відкриті бандли: повторне перемикання не відкриває файл знову """
+    path = os.path.abspath(path)
+    stamp = os.stat(path).st_mtime_ns
+    cached = _open.get(path)
+    if cached and cached[0] == stamp:
+        return cached[1]
+    if cached:
+        cached[1].close()
+    bundle = ZipBundle(path) if is_bundle_file(path) else DirectoryBundle(path)
+    _open[path] = (stamp, bundle)
+    return bundle
+
+
+def pack_bundle(src_dir, out_path=None):
+    """ Пакує теку бандла в один .dwb: код і JSON стискаються, ассети
+    зберігаються без стиснення (читаються через mmap) з sha1 в індексі """
+    out_path = out_path or src_dir.rstrip("/\\") + BUNDLE_EXT
+    src = DirectoryBundle(src_dir)
+    index = build_index(src.files)
+    with zipfile.ZipFile(out_path, 'w') as zf:
+        for rel in sorted(src.files):
+            with open(os.path.join(src_dir, rel), 'rb') as f:
+                data = f.read()
+            if rel in index["assets"]:
+                index["assets"][rel] = {"sha1": hashlib.sha1(data).hexdigest(), "size": len(data)}
+                zf.writestr(rel, data, compress_type=zipfile.ZIP_STORED)
+            else:
+                zf.writestr(rel, data, compress_type=zipfile.ZIP_DEFLATED)
+        zf.writestr(INDEX_NAME, json.dumps(index, indent=1), compress_type=zipfile.ZIP_DEFLATED)
+    return out_path
+
+
+if __name__ == "__main__":
+    # python -m src.core.bundles <bundle_dir> [out.dwb]
+    if len(sys.argv) < 2:
+        print("usage: python -m src.core.bundles <bundle_dir> [out.dwb]")
+        sys.exit(1)
+    print(pack_bundle(sys.argv[1], sys.argv[2] if len(sys.argv) > 2 else None))
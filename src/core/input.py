@@ -0,0 +1,208 @@
+import os
+import sys
+import time
+from collections import namedtuple
+
+from PySide6.QtCore import QPoint
+from PySide6.QtGui import QCursor, QGuiApplication
+
+# Бітова маска кнопок
+LEFT = 1
+RIGHT = 2
+MIDDLE = 4
+
+
+class InputSnapshot(namedtuple("InputSnapshot", [
+    "x", "y",          # у координатах поверхні, що зараз малюється
+    "gx", "gy",        # глобальні (віртуальний робочий стіл)
+    "vx", "vy",        # швидкість, пікселів за секунду
+    "buttons",         # маска LEFT | RIGHT | MIDDLE
+    "clicks",          # ((button, x, y), ...) натиснуті з попереднього тіку
+    "inside",          # курсор над цією поверхнею
+    "frame",
+])):
+    """ Стан вводу на один тік: ефекти читають його замість QCursor/GetAsyncKeyState """
+
+    def pos(self):
+        return QPoint(int(self.x), int(self.y))
+
+    @property
+    def left(self):
+        return bool(self.buttons & LEFT)
+
+    @property
+    def right(self):
+        return bool(self.buttons & RIGHT)
+
+    @property
+    def speed(self):
+        return (self.vx * self.vx + self.vy * self.vy) ** 0.5
+
+
+# --- Бекенди: poll() -> (gx, gy, buttons) або None, якщо курсора немає ---
+
+class QtBackend:
+    """ Позиція з QCursor. Кнопки Qt бачить лише для власних вікон,
+    а шпалери прозорі для миші - тож на практиці без кліків """
+    def poll(self):
+        pos = QCursor.pos()
+        buttons = QGuiApplication.mouseButtons().value if QGuiApplication.instance() else 0
+        return pos.x(), pos.y(), _qt_mask(buttons)
+
+
+class WindowsBackend:
+    """ Позиція з QCursor (логічні пікселі, як QScreen.geometry(); GetCursorPos
+    при DPI-awareness Qt 6 дав би фізичні) + GetAsyncKeyState для кнопок:
+    їх видно й поверх чужих вікон """
+    VK = ((0x01, LEFT), (0x02, RIGHT), (0x04, MIDDLE))
+
+    def __init__(self):
+        import ctypes
+        self._user32 = ctypes.windll.user32
+
+    def poll(self):
+        pos = QCursor.pos()
+        buttons = 0
+        for vk, bit in self.VK:
+            if self._user32.GetAsyncKeyState(vk) & 0x8000:
+                buttons |= bit
+        return pos.x(), pos.y(), buttons
+
+
+class ScriptedBackend:
+    """ Ввід за сценарієм: список (x, y[, buttons]) по кадрах (останній
+    повторюється) або callable(frame) -> (x, y[, buttons]) """
+    def __init__(self, script):
+        self.script = script
+        self.frame = 0
+
+    def poll(self):
+        if callable(self.script):
+            point = self.script(self.frame)
+        else:
+            point = self.script[min(self.frame, len(self.script) - 1)]
+        self.frame += 1
+        if point is None:
+            return None
+        x, y, *rest = point
+        return x, y, rest[0] if rest else 0
+
+
+class NullBackend:
+    """ Без курсора (headless-бенчмарки): ефекти бачать центр поверхні """
+    def poll(self):
+        return None
+
+
+def _qt_mask(buttons):
+    # Qt.LeftButton=1, RightButton=2, MiddleButton=4 - збігаються з нашою маскою
+    return int(buttons) & (LEFT | RIGHT | MIDDLE)
+
+
+def create_backend(name=None):
+    """ name: qt | windows | null; за замовчуванням DW_INPUT або найкращий для ОС """
+    name = name or os.environ.get("DW_INPUT") or ("windows" if sys.platform == "win32" else "qt")
+    if name == "windows":
+        try:
+            return WindowsBackend()
+        except (ImportError, AttributeError, OSError) as e:
+            print(f"Windows input backend unavailable ({e}), using Qt")
+            return QtBackend()
+    if name == "null":
+        return NullBackend()
+    return QtBackend()
+
+
+class InputService:
+    """ Один опит курсора й кнопок за тік для всіх ефектів.
+
+    sample() викликається таймером шпалер, set_surface() - перед малюванням
+    кожної поверхні (монітора), тож snapshot()/pos() повертають координати
+    відносно тієї поверхні, яку зараз малюють.
+    """
+    def __init__(self, backend=None):
+        self.backend = backend or create_backend()
+        self.frame = 0
+        self._global = None          # (gx, gy, buttons, clicks)
+        self._velocity = (0.0, 0.0)
+        self._last = None            # (gx, gy, buttons, t)
+        self._surface = (0, 0, 1920, 1080)
+        self._cache = {}
+
+    def set_backend(self, backend):
+        self.backend = backend
+        self._last = None
+
+    def sample(self, now=None):
+        now = time.perf_counter() if now is None else now
+        try:
+            polled = self.backend.poll()
+        except Exception as e:
+            print(f"Input backend error: {e}")
+            polled = None
+        self.frame += 1
+        self._cache.clear()
+
+        if polled is None:
+            self._global = None
+            self._velocity = (0.0, 0.0)
+            self._last = None
+            return
+
+        gx, gy, buttons = polled
+        clicks = 0
+        if self._last is not None:
+            lx, ly, lbuttons, lt = self._last
+            dt = now - lt
+            if dt > 0:
+                self._velocity = ((gx - lx) / dt, (gy - ly) / dt)
+            clicks = buttons & ~lbuttons
+        self._last = (gx, gy, buttons, now)
+        self._global = (gx, gy, buttons, clicks)
+
+    def set_surface(self, rect):
+        """ rect: QRect або (x, y, w, h) поверхні в глобальних координатах """
+        if hasattr(rect, "x") and callable(rect.x):
+            rect = (rect.x(), rect.y(), rect.width(), rect.height())
+        self._surface = tuple(rect)
+
+    def snapshot(self):
+        surface = self._surface
+        snap = self._cache.get(surface)
+        if snap is not None:
+            return snap
+        sx, sy, sw, sh = surface
+        if self._global is None:
+            snap = InputSnapshot(sw / 2, sh / 2, sx + sw / 2, sy + sh / 2, 0.0, 0.0, 0, (), False, self.frame)
+        else:
+            gx, gy, buttons, clicks = self._global
+            x, y = gx - sx, gy - sy
+            events = tuple((bit, x, y) for bit in (LEFT, RIGHT, MIDDLE) if clicks & bit)
+            inside = 0 <= x < sw and 0 <= y < sh
+            snap = InputSnapshot(x, y, gx, gy, *self._velocity, buttons, events, inside, self.frame)
+        self._cache[surface] = snap
+        return snap
+
+    def pos(self):
+        return self.snapshot().pos()
+
+
+class SnapshotInput:
+    """ Готовий знімок замість сервісу (процес пісочниці отримує його з кадром) """
+    def __init__(self, snapshot):
+        self.snap = snapshot
+
+    def snapshot(self):
+        return self.snap
+
+    def pos(self):
+        return self.snap.pos()
+
+
+_service = None
+
+def get_input_service():
+    global _service
+    if _service is None:
+        _service = InputService()
+    return _service
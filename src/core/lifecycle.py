@@ -0,0 +1,98 @@
+import time
+from PySide6.QtCore import QObject, Signal
+
+
+class LifecycleManager(QObject):
+    """ Централізоване призупинення/відновлення всіх підсистем.
+
+    Учасники - будь-які об'єкти з методами on_suspend()/on_resume().
+    Призупинення має причини ("occluded", "locked", ...): відновлення
+    відбувається лише коли не лишилось жодної активної причини.
+    """
+    suspended = Signal()
+    resumed = Signal()
+
+    def __init__(self):
+        super().__init__()
+        self._participants = []
+        self._providers = []
+        self.reasons = set()
+        self.is_suspended = False
+
+        # Metrics
+        self.suspend_count = 0
+        self.total_suspended = 0.0
+        self._suspended_at = None
+        self._created_at = time.monotonic()
+
+    def register(self, participant):
+        if participant not in self._participants:
+            self._participants.append(participant)
+
+    def unregister(self, participant):
+        if participant in self._participants:
+            self._participants.remove(participant)
+
+    def add_provider(self, provider):
+        """ provider() повертає поточний список учасників (ефекти, віджети, ...) """
+        self._providers.append(provider)
+
+    def participants(self):
+        seen = set()
+        for obj in self._participants + [o for prov in self._providers for o in prov()]:
+            if obj is not None and id(obj) not in seen:
+                seen.add(id(obj))
+                yield obj
+
+    def suspend(self, reason="manual"):
+        self.reasons.add(reason)
+        if self.is_suspended:
+            return
+        print(f"Lifecycle: suspend ({reason})")
+        self.is_suspended = True
+        self.suspend_count += 1
+        self._suspended_at = time.monotonic()
+        for obj in list(self.participants()):
+            self._call(obj, 'on_suspend')
+        self.suspended.emit()
+
+    def resume(self, reason="manual"):
+        self.reasons.discard(reason)
+        if not self.is_suspended or self.reasons:
+            return
+        print(f"Lifecycle: resume ({reason})")
+        self.is_suspended = False
+        if self._suspended_at is not None:
+            self.total_suspended += time.monotonic() - self._suspended_at
+            self._suspended_at = None
+        for obj in list(self.participants()):
+            self._call(obj, 'on_resume')
+        self.resumed.emit()
+
+    def adopt(self, participant):
+        """ Синхронізує новий об'єкт (наприклад, віджет з пресету) з поточним станом """
+        if self.is_suspended:
+            self._call(participant, 'on_suspend')
+
+    def get_metrics(self):
+        now = time.monotonic()
+        suspended = self.total_suspended
+        if self._suspended_at is not None:
+            suspended += now - self._suspended_at
+        uptime = max(now - self._created_at, 1e-6)
+        return {
+            "suspended": self.is_suspended,
+            "reasons": sorted(self.reasons),
+            "suspend_count": self.suspend_count,
+            "suspended_seconds": suspended,
+            "suspended_ratio": suspended / uptime,
+        }
+
+    def _call(self, obj, method):
+        hook = getattr(obj, method, None)
+        if hook is None:
+            return
+        try:
+            hook()
+        except Exception as e:
+            print(f"Lifecycle {method} error in {obj.__class__.__name__}: {e}")
@@ -0,0 +1,175 @@
+import threading
+import time
+from collections import namedtuple
+
+import psutil
+
+from src.utils.ring_buffer import RingBuffer
+
+MetricsSnapshot = namedtuple("MetricsSnapshot", [
+    "seq", "timestamp",
+    "cpu_percent", "cpu_per_core",
+    "mem_percent", "mem_used", "mem_total",
+    "disk_percent", "disk_read_bps", "disk_write_bps",
+    "net_up_bps", "net_down_bps",
+])
+
+EMPTY_SNAPSHOT = MetricsSnapshot(0, 0.0, 0.0, (), 0.0, 0, 0, 0.0, 0.0, 0.0, 0.0, 0.0)
+
+HISTORY_NAMES = ("cpu", "mem", "disk_read", "disk_write", "net_up", "net_down")
+
+
+class MetricsService:
+    """ Один фоновий потік, що опитує psutil для всіх системних віджетів.
+
+    Віджети читають незмінний MetricsSnapshot без блокувань і системних
+    викликів у draw(). Потік працює, поки є хоча б один підписник.
+    """
+    def __init__(self, interval=1.0, history_len=600, disk_interval=30.0, disk_path='/'):
+        self.interval = interval
+        self.disk_interval = disk_interval
+        self.disk_path = disk_path
+        self._snapshot = EMPTY_SNAPSHOT
+        self._listeners = []
+        self._refs = 0
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread = None
+        self._running = False
+
+        self.histories = {name: RingBuffer(history_len) for name in HISTORY_NAMES}
+        self.core_history = None
+
+    def snapshot(self) -> MetricsSnapshot:
+        return self._snapshot
+
+    def history(self, name, n=None):
+        with self._lock:
+            return self.histories[name].values(n)
+
+    def series(self, name):
+        """ Сам RingBuffer (один писач; читання без блокування для графіків) """
+        return self.histories[name]
+
+    def ensure_history(self, samples):
+        """ Збільшує глибину історії, якщо віджету потрібно довше вікно """
+        with self._lock:
+            for buf in self.histories.values():
+                if buf.capacity < samples:
+                    buf.resize(samples)
+
+    def set_interval(self, seconds):
+        self.interval = max(0.1, float(seconds))
+        self._wake.set()
+
+    def acquire(self, listener=None):
+        with self._lock:
+            self._refs += 1
+            if listener is not None:
+                self._listeners.append(listener)
+            if self._thread is None:
+                self._running = True
+                self._wake.clear()
+                self._thread = threading.Thread(target=self._run, name="MetricsService", daemon=True)
+                self._thread.start()
+
+    def release(self, listener=None):
+        with self._lock:
+            if listener is not None and listener in self._listeners:
+                self._listeners.remove(listener)
+            self._refs = max(0, self._refs - 1)
+            thread = self._thread if self._refs == 0 else None
+            if thread:
+                self._running = False
+                self._thread = None
+        if thread:
+            self._wake.set()
+            thread.join(timeout=2.0)
+
+    def _run(self):
+        psutil.cpu_percent(percpu=True)  # prime the counters
+        last_net = psutil.net_io_counters()
+        last_disk = psutil.disk_io_counters()
+        last_time = time.monotonic()
+        disk_percent, last_disk_usage = 0.0, 0.0
+
+        while self._running:
+            self._wake.wait(self.interval)
+            self._wake.clear()
+            if not self._running:
+                break
+            try:
+                now = time.monotonic()
+                dt = max(now - last_time, 1e-3)
+                per_core = tuple(psutil.cpu_percent(percpu=True))
+                cpu = sum(per_core) / len(per_core) if per_core else 0.0
+                mem = psutil.virtual_memory()
+                net = psutil.net_io_counters()
+                disk = psutil.disk_io_counters()
+                if now - last_disk_usage >= self.disk_interval or last_disk_usage == 0.0:
+                    disk_percent = psutil.disk_usage(self.disk_path).percent
+                    last_disk_usage = now
+
+                net_up = (net.bytes_sent - last_net.bytes_sent) / dt
+                net_down = (net.bytes_recv - last_net.bytes_recv) / dt
+                disk_read = disk_write = 0.0
+                if disk and last_disk:
+                    disk_read = (disk.read_bytes - last_disk.read_bytes) / dt
+                    disk_write = (disk.write_bytes - last_disk.write_bytes) / dt
+                last_net, last_disk, last_time = net, disk, now
+
+                with self._lock:
+                    if self.core_history is None or self.core_history.width != len(per_core):
+                        self.core_history = RingBuffer(self.histories["cpu"].capacity, width=len(per_core))
+                    self.core_history.push(per_core)
+                    for name, value in (("cpu", cpu), ("mem", mem.percent),
+                                        ("disk_read", disk_read), ("disk_write", disk_write),
+                                        ("net_up", net_up), ("net_down", net_down)):
+                        self.histories[name].push(value)
+                    listeners = list(self._listeners)
+
+                # Заміна посилання атомарна - читачі бачать або старий, або новий знімок
+                self._snapshot = MetricsSnapshot(
+                    self._snapshot.seq + 1, time.time(),
+                    cpu, per_core,
+                    mem.percent, mem.used, mem.total,
+                    disk_percent, disk_read, disk_write,
+                    net_up, net_down,
+                )
+                for listener in listeners:
+                    listener()
+            except Exception as e:
+                print(f"Metrics sampling error: {e}")
+
+
+class MetricsSubscription:
+    """ Підписка віджета: тримає сервіс запущеним і позначає віджет брудним на новий зразок.
+    Призупинення віджета відпускає сервіс, тож без видимих віджетів опитування стоїть.
+    """
+    def __init__(self, widget):
+        self.service = get_metrics_service()
+        self.listener = widget.mark_dirty
+        self.active = False
+        self.start()
+
+    def start(self):
+        if not self.active:
+            self.active = True
+            self.service.acquire(self.listener)
+
+    def stop(self):
+        if self.active:
+            self.active = False
+            self.service.release(self.listener)
+
+    def snapshot(self):
+        return self.service.snapshot()
+
+
+_service = None
+
+def get_metrics_service():
+    global _service
+    if _service is None:
+        _service = MetricsService()
+    return _service
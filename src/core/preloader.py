@@ -0,0 +1,126 @@
+import json
+
+from PySide6.QtCore import QObject, QTimer
+
+from src.core.backgrounds import BackgroundManager
+
+
+class PreparedItem:
+    """ Ефект (і тло) наступного елемента плейлиста, готові до показу """
+    def __init__(self, key, effect, bg_manager=None):
+        self.key = key
+        self.effect = effect
+        self.bg_manager = bg_manager
+
+
+def playlist_item(item):
+    """ (name, config, background) з рядка або словника плейлиста """
+    if isinstance(item, str):
+        return item, {}, None
+    return item.get("effect", "none"), item.get("config", {}), item.get("background")
+
+
+class Preloader(QObject):
+    """ Готує наступний ефект за preload_lead мс до перемикання плейлиста.
+
+    Ефект - окремий екземпляр (create_effect), тож налаштування й прогрів
+    не зачіпають ефект, що зараз на екрані, навіть якщо це той самий ефект.
+    Він створюється, налаштовується і малює перший кадр поза екраном
+    (шейдери компілюються з активним GL-контекстом), зображення тла
+    декодується у пулі потоків, відео стартує заздалегідь. Перехід
+    потім починається з уже прогрітим ефектом.
+    """
+    def __init__(self, wallpaper, lead_ms=3000):
+        super().__init__(wallpaper)
+        self.wallpaper = wallpaper
+        self.lead_ms = lead_ms
+        self.prepared = None
+        self.created = []  # створені тут екземпляри, які ще треба закрити
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.timeout.connect(self._prepare_upcoming)
+
+    def schedule(self, interval_ms):
+        """ Викликається при (пере)запуску таймера плейлиста """
+        if not self.wallpaper.playlist:
+            self.timer.stop()
+            return
+        self.timer.start(max(0, interval_ms - self.lead_ms))
+
+    def _prepare_upcoming(self):
+        app = self.wallpaper
+        if not app.playlist:
+            return
+        idx = (app.current_playlist_idx + 1) % len(app.playlist)
+        self.prepare(app.playlist[idx])
+
+    def _key(self, item):
+        return json.dumps(item, sort_keys=True)
+
+    def prepare(self, item):
+        app = self.wallpaper
+        key = self._key(item)
+        if self.prepared and self.prepared.key == key:
+            return self.prepared
+        self.clear()
+
+        name, conf, bg_conf = playlist_item(item)
+        current = app.current_effect
+        if getattr(current, 'effect_name', None) == name and getattr(current, 'config', {}) == conf:
+            # Той самий ефект з тими ж налаштуваннями вже на екрані
+            effect = current
+        else:
+            effect = app.effect_registry.create_effect(name)
+            if effect is None:
+                return None
+            self.created.append(effect)
+            if conf:
+                effect.configure(conf)
+            if hasattr(current, 'show_background'):
+                effect.set_show_background(current.show_background)
+            app.lifecycle.adopt(effect)
+
+        bg_manager = None
+        if bg_conf and not app.bg_manager.matches(bg_conf):
+            bg_manager = BackgroundManager(bg_conf)
+            bg_manager.preload(app.width(), app.height())
+            app.lifecycle.adopt(bg_manager)
+
+        if effect is not app.current_effect:
+            self.warm_up(effect)
+        self.prepared = PreparedItem(key, effect, bg_manager)
+        return self.prepared
+
+    def warm_up(self, effect):
+        """ Перший кадр поза екраном; для GL-ефектів - у контексті основного вікна """
+        app = self.wallpaper
+        effect.audio_data = app.last_audio
+        app.makeCurrent()
+        try:
+            effect.warm_up(app.width(), app.height(), app.phase)
+        finally:
+            app.doneCurrent()
+
+    def take(self, item):
+        """ Віддає підготовлений елемент, якщо він для item, інакше готує його зараз """
+        prepared = self.prepare(item)
+        self.prepared = None
+        return prepared
+
+    def release(self, effect):
+        """ Ефект зійшов з екрана: закриває його, якщо його створив Preloader """
+        if effect in self.created and effect is not self.wallpaper.current_effect:
+            self.created.remove(effect)
+            if hasattr(effect, 'close'):
+                effect.close()
+
+    def clear(self):
+        if self.prepared:
+            if self.prepared.bg_manager:
+                self.prepared.bg_manager.cleanup()
+            self.release(self.prepared.effect)
+        self.prepared = None
+
+    def stop(self):
+        self.timer.stop()
+        self.clear()
@@ -1,7 +1,51 @@
 import os
 import json
 from PySide6.QtCore import QTimer
-from src.core.resources import get_resource_path, set_preset_root
+from src.core.resources import get_resource_path, set_preset_root, get_active_bundle
+from src.core.metrics import get_metrics_service
+from src.core.weather import get_weather_service
+from src.core.preset_schema import load_preset_file, validate_preset, PresetValidationError
+from src.core.bundles import BUNDLE_EXT, is_bundle_file
+
+# Ключі, які можна змінити на живому віджеті без його перестворення
+WIDGET_PLACEMENT_KEYS = ("x", "y", "anchor", "id")
+
+def widget_key(conf):
+    """ Ідентичність віджета без урахування розташування """
+    rest = {k: v for k, v in conf.items() if k not in WIDGET_PLACEMENT_KEYS}
+    return json.dumps(rest, sort_keys=True, default=str)
+
+def _apply_widgets(app, widget_configs):
+    """ Перевикористовує віджети з тим самим типом і налаштуваннями, решту створює/прибирає """
+    pool = {}
+    for w in app.active_widgets:
+        key = getattr(w, 'preset_key', None) or widget_key(w.config)
+        pool.setdefault(key, []).append(w)
+
+    widgets = []
+    for i, w_conf in enumerate(widget_configs):
+        key = widget_key(w_conf)
+        if pool.get(key):
+            widget = pool[key].pop(0)
+            for k in ("x", "y", "anchor"):
+                if k in w_conf:
+                    setattr(widget, k, w_conf[k])
+            # Живий віджет і config пресету знову ділять один словник
+            widget_configs[i] = widget.config
+        else:
+            widget = app.widget_registry.create_widget(w_conf.get("type"), w_conf)
+            if not widget:
+                continue
+            widget.preset_key = key
+            app.lifecycle.adopt(widget)
+            app.widget_layers.invalidate(widget)
+        widget.id = w_conf.get('id') or getattr(widget, 'id', None) or f"widget_{i}"
+        widgets.append(widget)
+
+    for leftovers in pool.values():
+        for w in leftovers:
+            if hasattr(w, 'cleanup'): w.cleanup()
+    app.active_widgets = widgets
 
 def load_preset(app, preset_name):
     # Check if full path provided or just name
@@ -10,20 +54,24 @@ def load_preset(app, preset_name):
     else:
         target_path = get_resource_path(os.path.join('presets', preset_name))
         
-    # Handle Bundle (Directory)
-    if os.path.isdir(target_path):
-        config_path = os.path.join(target_path, 'preset.json')
-        if not os.path.exists(config_path):
-             # Try adding .json to dir name if user missed it? No, strict.
+    if not os.path.exists(target_path) and os.path.isfile(target_path + BUNDLE_EXT):
+        target_path += BUNDLE_EXT
+
+    # Handle Bundle (Directory or single-file .dwb archive)
+    bundle = None
+    if os.path.isdir(target_path) or is_bundle_file(target_path):
+        if os.path.isdir(target_path) and not os.path.exists(os.path.join(target_path, 'preset.json')):
              print(f"Bundle missing preset.json: {target_path}")
              return
         set_preset_root(target_path)
+        bundle = get_active_bundle()
         
         # Load Bundle Plugins
         if hasattr(app, 'effect_registry'):
-            app.effect_registry.load_bundle_effects(target_path)
+            app.effect_registry.load_bundle_effects(bundle)
         if hasattr(app, 'widget_registry'):
-            app.widget_registry.load_bundle_widgets(target_path)
+            app.widget_registry.load_bundle_widgets(bundle)
+        config_path = bundle.config_path()
             
     else:
         # Handle simple JSON file
@@ -32,25 +80,48 @@ def load_preset(app, preset_name):
         config_path = target_path
         set_preset_root(None) # Reset for single files
 
-    if not os.path.exists(config_path):
-        print(f"Preset not found: {config_path}")
+        if not os.path.exists(config_path):
+            print(f"Preset not found: {config_path}")
+            return
+
+    try:
+        if config_path is None:
+            # .dwb: preset.json читається з уже відкритого архіву
+            new_config = validate_preset(bundle.read_config(), app.effect_registry, app.widget_registry,
+                                         source=target_path)
+        else:
+            new_config = load_preset_file(config_path, app.effect_registry, app.widget_registry)
+    except PresetValidationError as e:
+        print(e)
+        return
+    except Exception as e:
+        print(f"Error reading preset {preset_name}: {e}")
         return
 
     try:
-        with open(config_path, 'r', encoding='utf-8') as f:
-            new_config = json.load(f)
-        
         print(f"Loading preset: {preset_name}")
         
+        app.effect_registry.set_sandbox(new_config.get("effect_sandbox"))
+
         # 1. Update Effect
         effect_name = new_config.get("effect")
         effect_config = new_config.get("effect_config", {})
         
-        if effect_name:
+        # Порівнюємо екземпляри: switch_effect і плейлист не оновлюють app.config["effect"]
+        if effect_name and app.current_effect and not app.is_transitioning \
+                and app.effect_registry.get_effect(effect_name) is app.current_effect:
+            # Той самий ефект: переналаштовуємо без переходу та скидання стану
+            if effect_config != getattr(app.current_effect, 'config', {}):
+                app.current_effect.configure(effect_config)
+            app.current_effect.set_show_background(new_config.get("show_background", True))
+        elif effect_name:
             app.next_effect = app.effect_registry.get_effect(effect_name) or app.effect_registry.get_effect("none")
             
             if effect_config:
                 app.next_effect.configure(effect_config)
+            app.lifecycle.adopt(app.next_effect)
+            if app.next_effect is not app.current_effect:
+                app.preloader.warm_up(app.next_effect)
 
             app.is_transitioning = True
             app.transition_alpha = 0.0
@@ -64,41 +135,48 @@ def load_preset(app, preset_name):
         app.set_target_fps(app.fps)
         print(f"Preset loaded with FPS: {app.fps}")
 
-        # 3. Update Background
+        get_metrics_service().set_interval(new_config.get("metrics_interval", 1.0))
+        get_weather_service().configure(new_config.get("weather"))
+
+        # 3. Update Background (same source keeps decoding)
         bg_conf = new_config.get("background")
         if bg_conf:
             app.set_background_source(bg_conf)
 
         # 4. Update Widgets
-        widget_configs = new_config.get("widgets", [])
-        for w in app.active_widgets:
-            if hasattr(w, 'cleanup'): w.cleanup()
-        app.active_widgets = []
-        for i, w_conf in enumerate(widget_configs):
-            w_type = w_conf.get("type")
-            widget = app.widget_registry.create_widget(w_type, w_conf)
-            if widget:
-                if not hasattr(widget, 'id') or not widget.id:
-                    widget.id = w_conf.get('id', f"widget_{i}")
-                app.active_widgets.append(widget)
+        widget_configs = new_config.setdefault("widgets", [])
+        _apply_widgets(app, widget_configs)
         
         # 5. Update Playlist
-        app.playlist = new_config.get("effects_playlist", [])
-        app.playlist_interval = new_config.get("playlist_interval", 30000)
-        app.current_playlist_idx = 0 
+        playlist = new_config.get("effects_playlist", [])
+        playlist_interval = new_config.get("playlist_interval", 30000)
+        playlist_changed = playlist != app.playlist or playlist_interval != app.playlist_interval
+        app.playlist = playlist
+        app.playlist_interval = playlist_interval
         
         if not hasattr(app, 'playlist_timer'):
             app.playlist_timer = QTimer(app)
             app.playlist_timer.timeout.connect(app.next_playlist_effect)
+            playlist_changed = True
         
-        app.playlist_timer.setInterval(app.playlist_interval)
-        if app.playlist:
-            app.playlist_timer.start()
-        else:
-            app.playlist_timer.stop()
+        app.preloader.lead_ms = new_config.get("preload_lead", 3000)
+        if playlist_changed:
+            app.current_playlist_idx = 0 
+            app.preloader.clear()
+            app.playlist_timer.setInterval(app.playlist_interval)
+            if app.playlist and not app.lifecycle.is_suspended:
+                app.playlist_timer.start()
+                app.preloader.schedule(app.playlist_interval)
+            else:
+                app.playlist_timer.stop()
+                app.preloader.timer.stop()
 
         # 6. Update overall config
         app.config.update(new_config)
+
+        # 7. Per-monitor surfaces (after config so mirrors see the new effect)
+        app.config["screens"] = new_config.get("screens", [])
+        app.screens.configure(app.config["screens"])
         
     except Exception as e:
         print(f"Error loading preset {preset_name}: {e}")
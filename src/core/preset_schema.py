@@ -0,0 +1,219 @@
+import hashlib
+import json
+import os
+import pickle
+import tempfile
+from collections import namedtuple
+
+from src.core.resources import get_resource_path
+
+# Поля описуються в тому ж форматі, що й get_schema() ефектів
+# (type/min/max/default), плюс типи str, number, list, dict і choice.
+BACKGROUND_SCHEMA = {
+    "type": {"type": "choice", "options": ("none", "image", "gif", "video"), "default": "none"},
+    "path": {"type": "str", "default": ""},
+}
+
+WIDGET_SCHEMA = {
+    "type": {"type": "str", "required": True},
+    "id": {"type": "str"},
+    "x": {"type": "number", "default": 30},
+    "y": {"type": "number", "default": 30},
+    "anchor": {"type": "choice", "options": ("top-left", "top-right", "bottom-left", "bottom-right", "center"),
+               "default": "top-left"},
+    "update_interval": {"type": "number", "min": 0},
+    "refresh": {"type": "choice", "options": ("frame", "interval", "data")},
+}
+
+SCREEN_SCHEMA = {
+    "effect": {"type": "str"},
+    "effect_config": {"type": "dict"},
+    "show_background": {"type": "bool"},
+    "background": {"type": "dict", "fields": BACKGROUND_SCHEMA},
+    "enabled": {"type": "bool"},
+}
+
+PRESET_SCHEMA = {
+    "effect": {"type": "str", "default": "glitch"},
+    "effect_config": {"type": "dict", "default": {}},
+    "fps": {"type": "int", "min": 1, "max": 240, "default": 22},
+    "show_background": {"type": "bool", "default": True},
+    "background": {"type": "dict", "fields": BACKGROUND_SCHEMA},
+    "widgets": {"type": "list", "items": {"type": "dict", "fields": WIDGET_SCHEMA}, "default": []},
+    "effects_playlist": {"type": "list", "default": []},
+    "playlist_interval": {"type": "int", "min": 1000, "default": 30000},
+    "preload_lead": {"type": "int", "min": 0, "default": 3000},
+    "metrics_interval": {"type": "number", "min": 0.1, "default": 1.0},
+    "screens": {"type": "list", "items": {"type": "dict", "fields": SCREEN_SCHEMA}, "default": []},
+    "weather": {"type": "dict"},
+    # true | [назви ефектів] | {"effects", "timeout", "max_restarts", "fallback"}
+    "effect_sandbox": {"type": "any"},
+}
+
+# Версія формату кешу: змінюється разом зі схемою
+CACHE_VERSION = 1
+
+# fatal=False - значення поза min/max і невідомі ефекти/віджети: пресет
+# завантажується з попередженням, як і до появи схеми
+PresetIssue = namedtuple("PresetIssue", ["path", "message", "fatal"], defaults=(True,))
+
+
+class PresetValidationError(Exception):
+    """ Усі знайдені помилки пресету разом, а не перший KeyError """
+    def __init__(self, source, issues):
+        self.source = source
+        self.issues = issues
+        lines = "\n".join(f"  {i.path}: {i.message}{'' if i.fatal else ' (warning)'}" for i in issues)
+        super().__init__(f"Invalid preset {source} ({len(issues)} errors):\n{lines}")
+
+
+def _is_number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _check_color(value):
+    if isinstance(value, str):
+        return True
+    return (isinstance(value, (list, tuple)) and len(value) in (3, 4)
+            and all(isinstance(c, int) and 0 <= c <= 255 for c in value))
+
+
+def check_value(spec, value, path, issues):
+    """ Перевіряє одне значення за описом поля, помилки додає в issues """
+    kind = spec.get("type")
+    ok = {
+        "int": lambda v: isinstance(v, int) and not isinstance(v, bool),
+        "float": _is_number,
+        "number": _is_number,
+        "bool": lambda v: isinstance(v, bool),
+        "str": lambda v: isinstance(v, str),
+        "color": _check_color,
+        "list": lambda v: isinstance(v, list),
+        "dict": lambda v: isinstance(v, dict),
+        "choice": lambda v: v in spec.get("options", ()),
+    }.get(kind, lambda v: True)
+
+    if not ok(value):
+        if kind == "choice":
+            issues.append(PresetIssue(path, f"expected one of {list(spec['options'])}, got {value!r}"))
+        else:
+            issues.append(PresetIssue(path, f"expected {kind}, got {type(value).__name__} {value!r}"))
+        return
+
+    if _is_number(value):
+        if "min" in spec and value < spec["min"]:
+            issues.append(PresetIssue(path, f"{value} is below minimum {spec['min']}", False))
+        if "max" in spec and value > spec["max"]:
+            issues.append(PresetIssue(path, f"{value} is above maximum {spec['max']}", False))
+    elif kind == "dict" and "fields" in spec:
+        check_fields(spec["fields"], value, path, issues)
+    elif kind == "list" and "items" in spec:
+        for i, item in enumerate(value):
+            check_value(spec["items"], item, f"{path}[{i}]", issues)
+
+
+def check_fields(schema, data, path, issues):
+    for key, spec in schema.items():
+        sub = f"{path}.{key}" if path else key
+        if key not in data:
+            if spec.get("required"):
+                issues.append(PresetIssue(sub, "missing required field"))
+            continue
+        check_value(spec, data[key], sub, issues)
+
+
+def validate_preset(config, effect_registry=None, widget_registry=None, source="preset"):
+    """ Один прохід по всьому пресету. Без реєстрів перевіряється лише структура """
+    issues = []
+    if not isinstance(config, dict):
+        raise PresetValidationError(source, [PresetIssue("", "preset must be a JSON object")])
+    check_fields(PRESET_SCHEMA, config, "", issues)
+
+    def check_effect(name, effect_config, path):
+        if effect_registry is None or not isinstance(name, str) or name == "none":
+            return
+        effect = effect_registry.get_effect(name)
+        if effect is None:
+            # load_preset підставляє "none", як і раніше
+            issues.append(PresetIssue(path, f"unknown effect {name!r}, using 'none'", False))
+        elif isinstance(effect_config, dict):
+            check_fields(effect.get_schema() or {}, effect_config, f"{path}_config", issues)
+
+    check_effect(config.get("effect"), config.get("effect_config", {}), "effect")
+
+    playlist = config.get("effects_playlist", [])
+    if isinstance(playlist, list):
+        for i, item in enumerate(playlist):
+            path = f"effects_playlist[{i}]"
+            if isinstance(item, str):
+                check_effect(item, {}, path)
+            elif isinstance(item, dict):
+                check_effect(item.get("effect", "none"), item.get("config", {}), f"{path}.effect")
+                if "background" in item:
+                    check_value({"type": "dict", "fields": BACKGROUND_SCHEMA}, item["background"],
+                                f"{path}.background", issues)
+            else:
+                issues.append(PresetIssue(path, "expected effect name or object"))
+
+    screens = config.get("screens", [])
+    if isinstance(screens, list):
+        for i, conf in enumerate(screens):
+            if isinstance(conf, dict) and "effect" in conf:
+                check_effect(conf["effect"], conf.get("effect_config", {}), f"screens[{i}].effect")
+
+    widgets = config.get("widgets", [])
+    if widget_registry is not None and isinstance(widgets, list):
+        for i, w_conf in enumerate(widgets):
+            if not isinstance(w_conf, dict) or not isinstance(w_conf.get("type"), str):
+                continue
+            if w_conf["type"] not in widget_registry.available_classes:
+                issues.append(PresetIssue(f"widgets[{i}].type", f"unknown widget {w_conf['type']!r}, skipped", False))
+            else:
+                check_fields(widget_registry.get_schema(w_conf["type"]), w_conf, f"widgets[{i}]", issues)
+
+    if any(i.fatal for i in issues):
+        raise PresetValidationError(source, issues)
+    for i in issues:
+        print(f"Preset {source}: {i.path}: {i.message}")
+    return config
+
+
+def _cache_file(path):
+    digest = hashlib.md5(os.path.abspath(path).encode()).hexdigest()
+    return get_resource_path(os.path.join("cache", "presets", f"{digest}.pickle"))
+
+
+def load_preset_file(path, effect_registry=None, widget_registry=None):
+    """ Читає й перевіряє пресет; розібраний JSON кешується (pickle) за mtime і розміром """
+    st = os.stat(path)
+    stamp = (CACHE_VERSION, st.st_mtime_ns, st.st_size)
+    cache_file = _cache_file(path)
+
+    config = None
+    try:
+        with open(cache_file, 'rb') as f:
+            cached = pickle.load(f)
+        if cached.get("stamp") == stamp:
+            config = cached["config"]
+    except Exception:
+        pass
+
+    if config is None:
+        with open(path, 'r', encoding='utf-8') as f:
+            config = json.load(f)
+        # Структура перевіряється до запису, у кеш потрапляють лише коректні пресети
+        validate_preset(config, source=path)
+        _write_cache(cache_file, {"stamp": stamp, "config": config})
+
+    return validate_preset(config, effect_registry, widget_registry, source=path)
+
+
+def _write_cache(cache_file, payload):
+    try:
+        os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(cache_file), suffix=".tmp")
+        with os.fdopen(fd, 'wb') as f:
+            pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, cache_file)
+    except OSError as e:
+        print(f"Preset cache write error: {e}")
@@ -2,10 +2,20 @@ import sys
 import os
 
 _preset_root = None
+_bundle = None
 
 def set_preset_root(path):
-    global _preset_root
+    """ Активний бандл пресету (тека або .dwb); None - звичайний JSON """
+    global _preset_root, _bundle
     _preset_root = path
+    if path:
+        from src.core.bundles import open_bundle
+        _bundle = open_bundle(path)
+    else:
+        _bundle = None
+
+def get_active_bundle():
+    return _bundle
 
 def get_resource_path(relative_path):
     """ Get absolute path to resource, works for dev and for PyInstaller """
@@ -20,9 +30,10 @@ def resolve_path(path):
     if os.path.isabs(path):
         return path
         
-    if _preset_root:
-        bundle_path = os.path.join(_preset_root, path)
-        if os.path.exists(bundle_path):
+    if _bundle is not None:
+        # Індекс бандла замість os.path.exists; з .dwb ассет розпаковується при першому зверненні
+        bundle_path = _bundle.resolve(path)
+        if bundle_path:
             return bundle_path
             
     return get_resource_path(path)
@@ -0,0 +1,313 @@
+import json
+
+from PySide6.QtCore import Qt, QObject
+from PySide6.QtGui import QGuiApplication, QImage, QPainter
+from PySide6.QtOpenGLWidgets import QOpenGLWidget
+
+from src.core.backgrounds import BackgroundManager
+from src.core.input import get_input_service
+from src.utils.performance import VisibilityChecker
+
+
+def is_frame_shareable(effect):
+    """ Чи можна намалювати ефект у QImage і роздати кадр кільком екранам.
+    Нероздільні (ShaderEffect) тримають програми, VAO та FBO свого GL-контексту,
+    тож кожна поверхня мусить мати власний екземпляр """
+    target = getattr(effect, 'instance', None) or effect
+    return getattr(target, 'SHAREABLE_FRAME', True)
+
+
+class SharedEffectFrames:
+    """ Ефект, показаний на кількох екранах однакового розміру, крокує
+    симуляцію один раз за тік.
+
+    Перший такий екран малює ефект в офскрін-кадр, решта лише виводять його.
+    Екрани іншого розміру малюють ефект у власній роздільності.
+    """
+    def __init__(self):
+        self.shared = set()   # (id(effect), w, h), що мають кількох користувачів
+        self.images = {}      # (id(effect), w, h) -> QImage
+        self.rendered = set() # ключі, вже намальовані в цьому тіку
+
+    def begin_tick(self, users):
+        """ users: {id(effect): [(w, h), ...]} видимих екранів цього тіку """
+        self.shared = set()
+        for key, sizes in users.items():
+            for size in set(sizes):
+                if sizes.count(size) > 1:
+                    self.shared.add((key, *size))
+        self.rendered.clear()
+        for key in list(self.images):
+            if key not in self.shared:
+                del self.images[key]
+
+    def draw(self, effect, p, w, h, phase):
+        key = (id(effect), w, h)
+        if key not in self.shared or not is_frame_shareable(effect):
+            effect.draw(p, w, h, phase)
+            return
+
+        img = self.images.get(key)
+        if key not in self.rendered:
+            if img is None:
+                img = QImage(w, h, QImage.Format_ARGB32_Premultiplied)
+                self.images[key] = img
+            img.fill(Qt.transparent)
+            ip = QPainter(img)
+            try:
+                ip.setRenderHint(QPainter.Antialiasing, True)
+                effect.draw(ip, w, h, phase)
+            finally:
+                ip.end()
+            self.rendered.add(key)
+
+        p.drawImage(0, 0, img)
+
+
+class ScreenSurface(QOpenGLWidget):
+    """ Поверхня шпалер для додаткового монітора (власний ефект і тло) """
+    def __init__(self, manager, screen, conf):
+        super().__init__()
+        self.manager = manager
+        self.wallpaper = manager.wallpaper
+        self.screen_ref = screen
+        self.conf = conf
+        self.effect = None
+        self.bg_manager = None
+        self.mirror_source = None  # нероздільний ефект основного екрана
+        self.mirror_effect = None  # і його копія в контексті цієї поверхні
+
+        self.setWindowFlags(Qt.Window | Qt.FramelessWindowHint | Qt.Tool | Qt.BypassWindowManagerHint)
+        self.setAttribute(Qt.WA_TransparentForMouseEvents, True)
+        self.setGeometry(screen.geometry())
+        self.apply_config(conf)
+
+        self.vis_checker = VisibilityChecker()
+
+    def apply_config(self, conf):
+        self.conf = conf
+        if conf is None:
+            # Mirror: follow the primary effect and share its background
+            self.effect = None
+            self._set_background(None)
+            return
+        self.effect = self.manager.effect_for(self, conf.get("effect", "none"), conf.get("effect_config", {}))
+        if self.effect and self.effect is not self.wallpaper.current_effect:
+            self.effect.set_show_background(conf.get("show_background", True))
+        self._set_background(conf.get("background"))
+
+    def _set_background(self, bg_conf):
+        if self.bg_manager and self.bg_manager is not self.wallpaper.bg_manager:
+            self.bg_manager.cleanup()
+        primary_conf = self.wallpaper.config.get("background") or {}
+        if bg_conf is None or (bg_conf == primary_conf and primary_conf.get("type") in ("video", "gif")):
+            # Відео/GIF декодуємо один раз - спільний менеджер
+            self.bg_manager = None
+        else:
+            self.bg_manager = BackgroundManager(bg_conf)
+
+    def current_effect(self):
+        if self.conf is not None:
+            return self.effect
+        primary = self.wallpaper.current_effect
+        if primary is None or is_frame_shareable(primary):
+            return primary
+        return self._mirror_of(primary)
+
+    def _mirror_of(self, primary):
+        """ Дзеркало нероздільного ефекту: власний екземпляр з тими ж налаштуваннями """
+        if primary is not self.mirror_source:
+            self.mirror_source = primary
+            name = getattr(primary, 'effect_name', None)
+            self.mirror_effect = self.wallpaper.effect_registry.create_effect(name) if name else None
+            if self.mirror_effect:
+                self.mirror_effect.configure(getattr(primary, 'config', {}))
+                self.wallpaper.lifecycle.adopt(self.mirror_effect)
+        mirror = self.mirror_effect
+        if mirror:
+            config = getattr(primary, 'config', {})
+            if getattr(mirror, 'config', None) != config:
+                mirror.configure(config)
+            mirror.set_show_background(primary.show_background)
+        return mirror
+
+    def start_visibility_checks(self):
+        self.vis_checker.start(
+            self.winId(),
+            lambda: self.manager.set_occluded(self, False),
+            lambda: self.manager.set_occluded(self, True),
+        )
+
+    def is_active(self):
+        return self.isVisible() and self not in self.manager.occluded
+
+    def paintGL(self):
+        p = QPainter(self)
+        try:
+            p.setRenderHint(QPainter.Antialiasing, True)
+            w, h = self.width(), self.height()
+            (self.bg_manager or self.wallpaper.bg_manager).draw(p, w, h)
+            get_input_service().set_surface(self.screen_ref.geometry())
+            if effect := self.current_effect():
+                effect.audio_data = self.wallpaper.last_audio
+                self.manager.frames.draw(effect, p, w, h, self.wallpaper.phase)
+        finally:
+            p.end()
+
+    def lifecycle_participants(self):
+        return [self.bg_manager, self.effect if self.conf is not None else self.mirror_effect]
+
+    def cleanup(self):
+        self.vis_checker.stop()
+        if self.bg_manager:
+            self.bg_manager.cleanup()
+            self.bg_manager = None
+
+
+class ScreenManager(QObject):
+    """ По одній поверхні на кожен монітор; основний малює DynamicWallpaper.
+
+    config["screens"]: [{"screen": <name|index>, "effect", "effect_config",
+    "show_background", "background", "enabled"}]. Монітори без запису
+    дзеркалять ефект основного екрана.
+    """
+    def __init__(self, wallpaper):
+        super().__init__()
+        self.wallpaper = wallpaper
+        self.frames = SharedEffectFrames()
+        self.surfaces = {}
+        self.occluded = set()
+        self.attach_fn = None
+        self.screens_conf = []
+        self._effects = {}
+
+        app = QGuiApplication.instance()
+        app.screenAdded.connect(self._on_screen_added)
+        app.screenRemoved.connect(self._on_screen_removed)
+        app.primaryScreenChanged.connect(lambda _s: self.rebuild())
+
+    def configure(self, screens_conf):
+        self.screens_conf = screens_conf or []
+        self.rebuild()
+
+    def effect_for(self, surface, name, effect_config):
+        """ Однаковий ефект з однаковими налаштуваннями = один спільний екземпляр.
+        Нероздільні ефекти живуть у GL-контексті поверхні - кожній свій """
+        registry = self.wallpaper.effect_registry
+        shareable = is_frame_shareable(registry.effects.get(name))
+        primary = self.wallpaper.config
+        if shareable and name == primary.get("effect") and effect_config == primary.get("effect_config", {}):
+            return self.wallpaper.current_effect
+        key = (name, json.dumps(effect_config, sort_keys=True), None if shareable else surface.screen_ref.name())
+        if key not in self._effects:
+            effect = registry.create_effect(name)
+            if effect and effect_config:
+                effect.configure(effect_config)
+            self._effects[key] = effect
+        return self._effects[key]
+
+    def _conf_for(self, screen, index):
+        for conf in self.screens_conf:
+            key = conf.get("screen")
+            if key == screen.name() or key == index:
+                return conf
+        return None
+
+    def _placement(self, screen):
+        geo = screen.geometry()
+        if self.attach_fn:
+            # WorkerW covers the virtual desktop, child coords are relative to it
+            virt = screen.virtualGeometry()
+            geo.translate(-virt.x(), -virt.y())
+        return geo
+
+    def rebuild(self):
+        primary = QGuiApplication.primaryScreen()
+        self.wallpaper.setGeometry(self._placement(primary))
+
+        screens = QGuiApplication.screens()
+        for name in [n for n in self.surfaces if n not in {s.name() for s in screens}]:
+            self._remove_surface(name)
+
+        for index, screen in enumerate(screens):
+            if screen is primary:
+                if screen.name() in self.surfaces:
+                    self._remove_surface(screen.name())
+                continue
+            conf = self._conf_for(screen, index)
+            if conf is not None and not conf.get("enabled", True):
+                if screen.name() in self.surfaces:
+                    self._remove_surface(screen.name())
+                continue
+            surface = self.surfaces.get(screen.name())
+            if surface is None:
+                surface = ScreenSurface(self, screen, conf)
+                self.surfaces[screen.name()] = surface
+                surface.show()
+                if self.attach_fn:
+                    self.attach_fn(int(surface.winId()))
+                surface.start_visibility_checks()
+            elif conf != surface.conf:
+                surface.apply_config(conf)
+            surface.setGeometry(self._placement(screen))
+
+        used = {id(s.effect) for s in self.surfaces.values()}
+        self._effects = {k: e for k, e in self._effects.items() if id(e) in used}
+
+    def attach_all(self, attach_fn):
+        """ Прикріплює додаткові поверхні до WorkerW (основну - app.py) """
+        self.attach_fn = attach_fn
+        for surface in self.surfaces.values():
+            attach_fn(int(surface.winId()))
+        self.rebuild()
+
+    def _remove_surface(self, name):
+        surface = self.surfaces.pop(name)
+        self.occluded.discard(surface)
+        surface.cleanup()
+        surface.hide()
+        surface.deleteLater()
+
+    def _on_screen_added(self, screen):
+        self.rebuild()
+
+    def _on_screen_removed(self, screen):
+        self.rebuild()
+
+    def set_occluded(self, surface, occluded):
+        """ Повна пауза лише коли закриті всі монітори """
+        if occluded:
+            self.occluded.add(surface)
+        else:
+            self.occluded.discard(surface)
+        surfaces = [self.wallpaper, *self.surfaces.values()]
+        if all(s in self.occluded for s in surfaces):
+            self.wallpaper.lifecycle.suspend("occluded")
+        else:
+            self.wallpaper.lifecycle.resume("occluded")
+
+    def is_primary_active(self):
+        return self.wallpaper not in self.occluded
+
+    def tick(self):
+        """ Викликається з таймера основного вікна: рахує спільні ефекти й оновлює екрани """
+        users = {}
+        w, h = self.wallpaper.width(), self.wallpaper.height()
+        if self.is_primary_active():
+            for eff in (self.wallpaper.current_effect, self.wallpaper.next_effect):
+                if eff is not None:
+                    users.setdefault(id(eff), []).append((w, h))
+        active = [s for s in self.surfaces.values() if s.is_active()]
+        for surface in active:
+            if eff := surface.current_effect():
+                users.setdefault(id(eff), []).append((surface.width(), surface.height()))
+        self.frames.begin_tick(users)
+        for surface in active:
+            surface.update()
+
+    def lifecycle_participants(self):
+        return [obj for s in self.surfaces.values() for obj in s.lifecycle_participants()]
+
+    def cleanup(self):
+        for name in list(self.surfaces):
+            self._remove_surface(name)
@@ -1,3 +1,5 @@
+import time
+
 from PySide6.QtCore import Qt, QTimer, Signal, Slot
 from PySide6.QtWidgets import QApplication
 from PySide6.QtGui import QPainter
@@ -5,19 +7,28 @@ from PySide6.QtOpenGLWidgets import QOpenGLWidget
 
 from src.effects.base import EffectRegistry
 from src.widgets.base import WidgetRegistry
+from src.widgets.layers import WidgetCompositor
 from src.core.backgrounds import BackgroundManager
 from src.core.audio import AudioCapture
-from src.core.preset_handler import load_preset
-from src.utils.performance import VisibilityChecker, FPSCounter
+from src.core.preset_handler import load_preset, widget_key
+from src.core.lifecycle import LifecycleManager
+from src.core.screens import ScreenManager
+from src.core.preloader import Preloader, playlist_item
+from src.core.metrics import get_metrics_service
+from src.core.weather import get_weather_service
+from src.core.input import get_input_service
+from src.utils.performance import VisibilityChecker, FPSCounter, LatencyMeter
 
 class DynamicWallpaper(QOpenGLWidget):
     fps_update_signal = Signal(int)
+    audio_latency_signal = Signal(float)
 
     def __init__(self, config=None):
         super().__init__()
         self.config = config or {"effect": "glitch", "widgets": [], "fps": 22}
         
         self.effect_registry = EffectRegistry()
+        self.effect_registry.set_sandbox(self.config.get("effect_sandbox"))
         self.widget_registry = WidgetRegistry()
         self.bg_manager = BackgroundManager(self.config.get("background"))
         
@@ -31,19 +42,25 @@ class DynamicWallpaper(QOpenGLWidget):
         self.is_transitioning = False
         
         self.active_widgets = []
+        self.widget_layers = WidgetCompositor()
         for i, w_conf in enumerate(self.config.get("widgets", [])):
             if widget := self.widget_registry.create_widget(w_conf.get("type"), w_conf):
                 widget.id = w_conf.get('id', f"widget_{i}")
+                widget.preset_key = widget_key(w_conf)
                 self.active_widgets.append(widget)
 
         self.setWindowFlags(Qt.Window | Qt.FramelessWindowHint | Qt.Tool | Qt.BypassWindowManagerHint)
         self.setAttribute(Qt.WA_TransparentForMouseEvents, True)
         self.resize(QApplication.primaryScreen().size())
+        self.last_audio = {'bass': 0, 'mid': 0, 'treble': 0}
 
         self.phase = 0.0
         self.fps = self.config.get("fps", 22)
         self.frame_interval = int(1000 / self.fps)
         
+        get_metrics_service().set_interval(self.config.get("metrics_interval", 1.0))
+        get_weather_service().configure(self.config.get("weather"))
+
         self.fps_counter = FPSCounter()
         self.vis_checker = VisibilityChecker()
 
@@ -52,23 +69,59 @@ class DynamicWallpaper(QOpenGLWidget):
         self.timer.timeout.connect(self._tick)
         self.timer.start(self.frame_interval)
         
-        self.vis_checker.start(self.winId(), self.timer.start, self.timer.stop)
-
+        self.lifecycle = LifecycleManager()
+        self.lifecycle.register(self)
+        self.lifecycle.add_provider(self._lifecycle_participants)
+
+        # Per-monitor surfaces; the primary screen is this widget
+        self.screens = ScreenManager(self)
+        self.screens.configure(self.config.get("screens", []))
+        self.vis_checker.start(
+            self.winId(),
+            lambda: self.screens.set_occluded(self, False),
+            lambda: self.screens.set_occluded(self, True),
+        )
+
+        self.preloader = Preloader(self, self.config.get("preload_lead", 3000))
         if self.playlist:
             self.p_timer = QTimer(self)
             self.p_timer.timeout.connect(self.next_playlist_effect)
             self.p_timer.start(self.playlist_interval)
+            self.preloader.schedule(self.playlist_interval)
 
         self.audio = AudioCapture()
-        self.audio.data_signal.connect(self._on_audio)
         self.audio.start()
-        self.last_audio = {'bass': 0, 'mid': 0, 'treble': 0}
+        self.audio_latency = LatencyMeter()
+        self._frame_audio_ts = None
+        self.frameSwapped.connect(self._on_frame_swapped)
+
+    def _lifecycle_participants(self):
+        prepared = self.preloader.prepared
+        return [getattr(self, 'audio', None), self.bg_manager,
+                self.current_effect, self.next_effect, *self.active_widgets,
+                *self.screens.lifecycle_participants(),
+                *((prepared.effect, prepared.bg_manager) if prepared else ())]
+
+    def on_suspend(self):
+        self.timer.stop()
+        self.preloader.timer.stop()
+        for t in (getattr(self, 'p_timer', None), getattr(self, 'playlist_timer', None)):
+            if t: t.stop()
+
+    def on_resume(self):
+        self.timer.start(self.frame_interval)
+        if self.playlist:
+            for t in (getattr(self, 'p_timer', None), getattr(self, 'playlist_timer', None)):
+                if t: t.start()
+            self.preloader.schedule(self.playlist_interval)
 
     def switch_effect(self, name):
         if new_eff := self.effect_registry.get_effect(name):
             if self.is_transitioning and self.next_effect:
-                self.current_effect = self.next_effect
+                previous, self.current_effect = self.current_effect, self.next_effect
+                self.preloader.release(previous)
             self.next_effect = new_eff
+            self.lifecycle.adopt(new_eff)
             self.is_transitioning = True
             self.transition_alpha = 0.0
             if hasattr(self.current_effect, 'show_background'):
@@ -79,8 +132,14 @@ class DynamicWallpaper(QOpenGLWidget):
         if self.next_effect: self.next_effect.set_show_background(show)
 
     def set_background_source(self, conf):
+        if self.bg_manager and self.bg_manager.matches(conf):
+            # Те саме джерело - не перезапускаємо декодування відео
+            self.config['background'] = conf
+            return
         if self.bg_manager: self.bg_manager.cleanup()
         self.bg_manager = BackgroundManager(conf)
+        self.bg_manager.preload(self.width(), self.height())
+        self.lifecycle.adopt(self.bg_manager)
         self.config['background'] = conf
 
     def set_target_fps(self, fps):
@@ -90,6 +149,7 @@ class DynamicWallpaper(QOpenGLWidget):
 
     def add_local_widget(self, conf):
         if w := self.widget_registry.create_widget(conf.get("type"), conf):
+            self.lifecycle.adopt(w)
             self.active_widgets.append(w)
             self.config.setdefault('widgets', []).append(conf)
 
@@ -102,8 +162,10 @@ class DynamicWallpaper(QOpenGLWidget):
     def update_local_widget(self, idx, conf):
         if 0 <= idx < len(self.active_widgets):
             self.active_widgets[idx].config.update(conf)
+            self.active_widgets[idx].preset_key = widget_key(self.active_widgets[idx].config)
             for k in ['x', 'y', 'anchor']:
                 if k in conf: setattr(self.active_widgets[idx], k, conf[k])
+            self.widget_layers.invalidate(self.active_widgets[idx])
             if 0 <= idx < len(self.config.get('widgets', [])):
                 self.config['widgets'][idx].update(conf)
 
@@ -113,29 +175,45 @@ class DynamicWallpaper(QOpenGLWidget):
         if not self.playlist or self.is_transitioning: return
         self.current_playlist_idx = (self.current_playlist_idx + 1) % len(self.playlist)
         item = self.playlist[self.current_playlist_idx]
-        name = item if isinstance(item, str) else item.get("effect", "none")
-        conf = item.get("config", {}) if isinstance(item, dict) else {}
         
-        self.next_effect = self.effect_registry.get_effect(name)
-        if conf and self.next_effect: self.next_effect.configure(conf)
-        if self.next_effect != self.current_effect:
+        # Зазвичай уже підготовлено Preloader'ом за preload_lead мс до цього
+        prepared = self.preloader.take(item)
+        self.preloader.schedule(self.playlist_interval)
+        if prepared is None: return
+        if prepared.bg_manager:
+            self.bg_manager.cleanup()
+            self.bg_manager = prepared.bg_manager
+            self.config['background'] = playlist_item(item)[2]
+        if prepared.effect is not self.current_effect:
+            self.next_effect = prepared.effect
             self.is_transitioning, self.transition_alpha = True, 0.0
 
     def closeEvent(self, e):
+        m = self.lifecycle.get_metrics()
+        print(f"Time suspended: {m['suspended_seconds']:.0f}s ({m['suspended_ratio']:.0%}), {m['suspend_count']} suspends")
         if self.audio: self.audio.stop()
+        self.preloader.stop()
         for w in self.active_widgets: 
             if hasattr(w, 'cleanup'): w.cleanup()
         if self.bg_manager: self.bg_manager.cleanup()
+        self.screens.cleanup()
         super().closeEvent(e)
 
     def _tick(self):
         self.phase = (self.phase + 0.0035) % 1.0
+        get_input_service().sample()
         if self.is_transitioning:
             self.transition_alpha += 0.015
             if self.transition_alpha >= 1.0:
+                previous = self.current_effect
                 self.transition_alpha, self.current_effect, self.next_effect, self.is_transitioning = 1.0, self.next_effect, None, False
-        self.update()
-        if (fps := self.fps_counter.tick()) != -1: self.fps_update_signal.emit(fps)
+                self.preloader.release(previous)
+        if self.screens.is_primary_active(): self.update()
+        self.screens.tick()
+        if (fps := self.fps_counter.tick()) != -1:
+            self.fps_update_signal.emit(fps)
+            if latency := self.audio_latency.report():
+                self.audio_latency_signal.emit(latency[0])
 
     def paintGL(self):
         p = QPainter(self)
@@ -143,20 +221,28 @@ class DynamicWallpaper(QOpenGLWidget):
             p.setRenderHint(QPainter.Antialiasing, True)
             w, h = self.width(), self.height()
             self.bg_manager.draw(p, w, h)
+            # Глобальні координати екрана: geometry() після attach - у координатах WorkerW
+            get_input_service().set_surface(QApplication.primaryScreen().geometry())
 
+            audio, self._frame_audio_ts = self.audio.snapshot_at(time.perf_counter())
+            if audio: self.last_audio = audio
             audio = self.last_audio
             if self.current_effect:
                 self.current_effect.audio_data = audio
                 if self.is_transitioning and self.next_effect:
                     p.setOpacity(1.0 - self.transition_alpha)
-                    self.current_effect.draw(p, w, h, self.phase)
+                    self.screens.frames.draw(self.current_effect, p, w, h, self.phase)
                     p.setOpacity(self.transition_alpha)
                     self.next_effect.audio_data = audio
-                    self.next_effect.draw(p, w, h, self.phase)
+                    self.screens.frames.draw(self.next_effect, p, w, h, self.phase)
                     p.setOpacity(1.0)
                 else:
-                    self.current_effect.draw(p, w, h, self.phase)
-            for wid in self.active_widgets: wid.draw(p, w, h, self.phase)
+                    self.screens.frames.draw(self.current_effect, p, w, h, self.phase)
+            self.widget_layers.draw(p, self.active_widgets, w, h, self.phase)
         finally: p.end()
 
-    def _on_audio(self, b, m, t): self.last_audio = {'bass': b, 'mid': m, 'treble': t}
+    def _on_frame_swapped(self):
+        # Audio-to-pixel: from the captured chunk to the swapped frame that used it
+        if self._frame_audio_ts is not None:
+            self.audio_latency.add((time.perf_counter() - self._frame_audio_ts) * 1000)
+            self._frame_audio_ts = None
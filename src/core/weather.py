@@ -0,0 +1,188 @@
+import json
+import os
+import threading
+import time
+
+from src.core.resources import get_resource_path
+
+OPEN_METEO_GEOCODE = "https://geocoding-api.open-meteo.com/v1/search"
+OPEN_METEO_FORECAST = "https://api.open-meteo.com/v1/forecast"
+
+
+class HttpTransport:
+    """ Звичайний HTTP; base_url дозволяє підставити локальний stub-сервер """
+    def __init__(self, base_url=None, timeout=10):
+        self.timeout = timeout
+        if base_url:
+            base_url = base_url.rstrip('/')
+            self.geocode_url = f"{base_url}/v1/search"
+            self.forecast_url = f"{base_url}/v1/forecast"
+        else:
+            self.geocode_url = OPEN_METEO_GEOCODE
+            self.forecast_url = OPEN_METEO_FORECAST
+
+    def geocode(self, query):
+        import requests
+        params = {"name": query, "count": 1, "language": "en", "format": "json"}
+        return requests.get(self.geocode_url, params=params, timeout=self.timeout).json()
+
+    def forecast(self, lat, lon):
+        import requests
+        params = {"latitude": lat, "longitude": lon, "current_weather": "true"}
+        return requests.get(self.forecast_url, params=params, timeout=self.timeout).json()
+
+
+class FixtureTransport:
+    """ Відповіді з JSON-файлу, без мережі: {"geocode": {query: resp}, "forecast": resp} """
+    def __init__(self, path):
+        with open(path, 'r', encoding='utf-8') as f:
+            self.data = json.load(f)
+
+    def geocode(self, query):
+        return self.data.get("geocode", {}).get(query, {})
+
+    def forecast(self, lat, lon):
+        forecast = self.data.get("forecast", {})
+        return forecast.get(f"{lat},{lon}", forecast)
+
+
+def location_key(city, country=None, region=None, lat=None, lon=None):
+    if lat is not None and lon is not None:
+        return f"@{float(lat):.4f},{float(lon):.4f}"
+    return "|".join((p or "").strip().lower() for p in (city, region, country))
+
+
+class WeatherService:
+    """ Спільне джерело погоди для всіх weather-віджетів.
+
+    Запити дедуплікуються за локацією, геокодинг кешується на диску назавжди,
+    прогноз - з TTL. Кеш з диска віддається одразу при старті (навіть
+    застарілий); віджети забирають свіжі дані через get(key) зі свого draw.
+    """
+    def __init__(self, transport=None, ttl=1800, cache_path=None):
+        self.transport = transport or HttpTransport()
+        self.ttl = ttl
+        self.cache_path = cache_path or get_resource_path(os.path.join("cache", "weather.json"))
+        self._lock = threading.Lock()
+        self._inflight = set()
+        self._cache = {"geocode": {}, "forecast": {}}
+        self._load_cache()
+
+    def configure(self, conf):
+        """ Ключ пресету "weather": {"ttl", "base_url", "fixture"} """
+        conf = conf or {}
+        self.ttl = conf.get("ttl", self.ttl)
+        fixture = conf.get("fixture") or os.environ.get("DW_WEATHER_FIXTURE")
+        if fixture:
+            self.transport = FixtureTransport(fixture)
+        else:
+            self.transport = HttpTransport(conf.get("base_url") or os.environ.get("DW_WEATHER_BASE_URL"))
+
+    def request(self, city, country=None, region=None, lat=None, lon=None):
+        """ Повертає ключ локації; якщо даних немає або вони застарілі - фоновий запит """
+        key = location_key(city, country, region, lat, lon)
+        with self._lock:
+            entry = self._cache["forecast"].get(key)
+            stale = entry is None or time.time() - entry["fetched_at"] > self.ttl
+            if stale and key not in self._inflight:
+                self._inflight.add(key)
+                threading.Thread(
+                    target=self._fetch, args=(key, city, country, region, lat, lon),
+                    name=f"Weather {key}", daemon=True,
+                ).start()
+        return key
+
+    def get(self, key):
+        """ {"fetched_at", "data"} з кешу (можливо застарілі) або None """
+        with self._lock:
+            return self._cache["forecast"].get(key)
+
+    def _geocode(self, city, country, region):
+        queries = []
+        full_q = city
+        if region: full_q += f" {region}"
+        if country: full_q += f" {country}"
+        queries.append(full_q)
+        if country:
+            queries.append(f"{city} {country}")
+        queries.append(city)
+
+        for q in dict.fromkeys(queries):
+            with self._lock:
+                cached = self._cache["geocode"].get(q)
+            if cached:
+                return cached
+        for q in dict.fromkeys(queries):
+            geo = self.transport.geocode(q)
+            if geo.get("results"):
+                res = geo["results"][0]
+                found = {"lat": res["latitude"], "lon": res["longitude"], "name": res.get("name", city)}
+                with self._lock:
+                    self._cache["geocode"][q] = found
+                return found
+        print(f"Location not found after trying: {queries}")
+        return None
+
+    def _fetch(self, key, city, country, region, lat, lon):
+        try:
+            name = city
+            if lat is None or lon is None:
+                found = self._geocode(city, country, region)
+                if not found:
+                    return
+                lat, lon, name = found["lat"], found["lon"], found["name"]
+
+            data = self.transport.forecast(lat, lon)
+            if "current_weather" not in data:
+                return
+            cw = data["current_weather"]
+            result = {
+                "temp": round(cw["temperature"]),
+                "weathercode": cw["weathercode"],
+                "wind": cw.get("windspeed", 0),
+                "city": name,
+                "lat": lat,
+                "lon": lon,
+            }
+            entry = {"fetched_at": time.time(), "data": result}
+            with self._lock:
+                self._cache["forecast"][key] = entry
+                # Віджети зберігають знайдені координати - той самий запис і під ними
+                self._cache["forecast"][location_key(None, lat=lat, lon=lon)] = entry
+            self._save_cache()
+        except Exception as e:
+            print(f"Weather update error: {e}")
+        finally:
+            with self._lock:
+                self._inflight.discard(key)
+
+    def _load_cache(self):
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            self._cache["geocode"].update(data.get("geocode", {}))
+            self._cache["forecast"].update(data.get("forecast", {}))
+        except (OSError, ValueError):
+            pass
+
+    def _save_cache(self):
+        with self._lock:
+            payload = json.dumps(self._cache, ensure_ascii=False, indent=1)
+        try:
+            os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+            tmp = f"{self.cache_path}.{threading.get_ident()}.tmp"
+            with open(tmp, 'w', encoding='utf-8') as f:
+                f.write(payload)
+            os.replace(tmp, self.cache_path)
+        except OSError as e:
+            print(f"Weather cache write error: {e}")
+
+
+_service = None
+
+def get_weather_service():
+    global _service
+    if _service is None:
+        _service = WeatherService()
+        _service.configure(None)
+    return _service
@@ -5,21 +5,77 @@ import sys
 import time
 import importlib.util
 import inspect
+from contextlib import contextmanager
 from PySide6.QtCore import Qt, QPointF
-from PySide6.QtGui import  QPainter, QColor, QLinearGradient, QBrush, QPen, QFont, QRadialGradient
+from PySide6.QtGui import  QPainter, QColor, QLinearGradient, QBrush, QPen, QFont, QRadialGradient, QImage
 
 from src.core.resources import get_resource_path
+from src.core.input import get_input_service
 
 # Add root to sys.path so plugins can import properly if needed
 root_dir = get_resource_path("")
 if root_dir not in sys.path:
     sys.path.append(root_dir)
 
+class SystemClock:
+    """ Справжній час; у режимі відтворення замінюється на src.effects.replay.FrameClock """
+    def time(self):
+        return time.time()
+
+    def localtime(self):
+        return time.localtime(self.time())
+
+
+class EffectSources:
+    """ Звідки ефект бере випадковість, час і курсор.
+    seed=None - недетермінований режим, як і раніше """
+    def __init__(self, seed=None, clock=None, input=None):
+        self.seed = seed
+        self.clock = clock or SystemClock()
+        # Будь-що з pos()/snapshot(), зазвичай src.core.input.InputService
+        self.input = input or get_input_service()
+
+
+_default_sources = None
+
+@contextmanager
+def effect_sources(sources):
+    """ Ефекти, створені всередині блоку, отримують ці джерела (вже в __init__) """
+    global _default_sources
+    previous, _default_sources = _default_sources, sources
+    try:
+        yield sources
+    finally:
+        _default_sources = previous
+
+
 class BaseEffect:
+    # False for effects that paint through native GL and can't render into a QImage
+    SHAREABLE_FRAME = True
+    # True - always run in a worker process (see src.effects.sandbox)
+    SANDBOX = False
+
     def __init__(self):
         self.cache = {}
         self.show_background = True
         self.audio_data = None # {'bass': 0.0, 'mid': 0.0, 'treble': 0.0}
+        self.use_sources(_default_sources or EffectSources())
+
+    def use_sources(self, sources):
+        """ self.rng / self.np_rng замість глобальних random і np.random,
+        self.clock замість time, self.input замість QCursor/GetAsyncKeyState """
+        self.sources = sources
+        self.rng = random.Random(sources.seed)
+        self._np_rng = None
+        self.clock = sources.clock
+        self.input = sources.input
+
+    @property
+    def np_rng(self):
+        if self._np_rng is None:
+            import numpy as np
+            self._np_rng = np.random.default_rng(self.sources.seed)
+        return self._np_rng
 
     def set_show_background(self, show: bool):
         self.show_background = show
@@ -34,9 +90,61 @@ class BaseEffect:
     def draw(self, p: QPainter, w: int, h: int, phase: float):
         pass
 
+    def warm_up(self, w: int, h: int, phase: float = 0.0):
+        """ Перший (найважчий) кадр поза екраном, щоб перехід не стартував з ривка """
+        img = QImage(w, h, QImage.Format_ARGB32_Premultiplied)
+        img.fill(Qt.transparent)
+        p = QPainter(img)
+        try:
+            p.setRenderHint(QPainter.Antialiasing, True)
+            self.draw(p, w, h, phase)
+        finally:
+            p.end()
+
+    def geometry(self, name, w, h, build, key=()):
+        """ Статичні дані ефекту (центри в NumPy, зведені QPainterPath, шари QImage),
+        що залежать лише від розміру й налаштувань. build(w, h) викликається один раз
+        на розмір і key; configure() скидає весь кеш, invalidate_geometry(name) - один запис """
+        entry = self.cache.get(name)
+        if entry is None or entry[0] != (w, h, key):
+            entry = self.cache[name] = ((w, h, key), build(w, h))
+        return entry[1]
+
+    def invalidate_geometry(self, name):
+        self.cache.pop(name, None)
+
+    def layer(self, name, w, h, paint, *params):
+        """ Статичний шар: paint(p, w, h, *params) запікається в QImage один раз
+        на розмір і набір params; поки вони ті самі, кадр - це один drawImage """
+        def bake(w, h):
+            img = QImage(w, h, QImage.Format_ARGB32_Premultiplied)
+            img.fill(Qt.transparent)
+            lp = QPainter(img)
+            try:
+                lp.setRenderHint(QPainter.Antialiasing, True)
+                paint(lp, w, h, *params)
+            finally:
+                lp.end()
+            return img
+        return self.geometry(name, w, h, bake, params)
+
+    def draw_layer(self, p, name, w, h, paint, *params):
+        p.drawImage(0, 0, self.layer(name, w, h, paint, *params))
+
     def reset_cache(self):
         self.cache = {}
 
+    def on_suspend(self):
+        """ Шпалери приховані: зупинити фонові потоки/таймери ефекту """
+        pass
+
+    def on_resume(self):
+        pass
+
+    def on_unload(self):
+        """ Екземпляр замінено новим (hot reload): звільнити зовнішні ресурси """
+        pass
+
 class PluginEffectWrapper(BaseEffect):
     """ Обертка для динамічного завантаження та Hot Reload ефектів """
     def __init__(self, file_path, class_name):
@@ -44,6 +152,7 @@ class PluginEffectWrapper(BaseEffect):
         self.file_path = file_path
         self.class_name = class_name
         self.instance = None
+        self.config = {}
         self.last_mtime = 0
         self.last_check_time = 0
         self._reload_if_needed()
@@ -67,10 +176,13 @@ class PluginEffectWrapper(BaseEffect):
                 spec.loader.exec_module(module)
                 
                 cls = getattr(module, self.class_name)
-                new_instance = cls()
+                with effect_sources(self.sources):
+                    new_instance = cls()
                 # Зберігаємо налаштування тла
                 new_instance.show_background = self.show_background
-                self.instance = new_instance
+                previous, self.instance = self.instance, new_instance
+                if previous is not None:
+                    previous.on_unload()
                 self.last_mtime = mtime
                 print(f"Ефект {self.class_name} перезавантажено з {os.path.basename(self.file_path)}")
         except Exception as e:
@@ -78,6 +190,11 @@ class PluginEffectWrapper(BaseEffect):
             if self.instance is None:
                 print(f"Помилка завантаження плагіна {self.file_path}: {e}")
 
+    def use_sources(self, sources):
+        super().use_sources(sources)
+        if getattr(self, 'instance', None):
+            self.instance.use_sources(sources)
+
     def draw(self, p, w, h, phase):
         self._reload_if_needed()
         if self.instance:
@@ -89,14 +206,40 @@ class PluginEffectWrapper(BaseEffect):
                 # Виводимо помилку в консоль, але не "палимо" всю програму
                 print(f"Помилка виконання ефекту {self.class_name}: {e}")
 
+    def warm_up(self, w, h, phase=0.0):
+        self._reload_if_needed()
+        if self.instance and hasattr(self.instance, 'warm_up'):
+            self.instance.show_background = self.show_background
+            self.instance.audio_data = self.audio_data
+            try:
+                self.instance.warm_up(w, h, phase)
+            except Exception as e:
+                print(f"Error warming up effect {self.class_name}: {e}")
+
     def configure(self, config: dict):
+        self.config = dict(config)
         self._reload_if_needed()
         if self.instance and hasattr(self.instance, 'configure'):
             try:
                 self.instance.configure(config)
+                self.instance.reset_cache()
             except Exception as e:
                 print(f"Error configuring effect {self.class_name}: {e}")
 
+    def on_suspend(self):
+        if self.instance:
+            try:
+                self.instance.on_suspend()
+            except Exception as e:
+                print(f"Error suspending effect {self.class_name}: {e}")
+
+    def on_resume(self):
+        if self.instance:
+            try:
+                self.instance.on_resume()
+            except Exception as e:
+                print(f"Error resuming effect {self.class_name}: {e}")
+
     def get_schema(self):
         # We need to reload to get the latest schema if it changed
         self._reload_if_needed()
@@ -109,9 +252,29 @@ class PluginEffectWrapper(BaseEffect):
         # we can just call it on self.instance.
         return {}
 
+class BundleEffectWrapper(PluginEffectWrapper):
+    """ Ефект з архіву бандла: клас імпортовано один раз, без hot reload """
+    def __init__(self, cls):
+        self.cls = cls
+        super().__init__(f"<bundle>/{cls.__name__}", cls.__name__)
+
+    def _reload_if_needed(self):
+        if self.instance is not None or self.last_check_time:
+            return
+        self.last_check_time = time.time()
+        try:
+            with effect_sources(self.sources):
+                self.instance = self.cls()
+            self.instance.show_background = self.show_background
+        except Exception as e:
+            print(f"Error creating bundle effect {self.class_name}: {e}")
+
 class EffectRegistry:
     def __init__(self):
         self.effects = {}
+        self.sandbox = None
+        self._sandboxed = {}
+        self.set_sandbox(None)
         self._load_plugins()
 
     def _load_plugins(self):
@@ -134,45 +297,88 @@ class EffectRegistry:
                     spec.loader.exec_module(module)
                     
                     for name, obj in inspect.getmembers(module):
-                        if inspect.isclass(obj) and issubclass(obj, BaseEffect) and obj != BaseEffect:
+                        # Лише класи самого плагіна, не імпортовані базові (ShaderEffect, SimulatedEffect)
+                        if inspect.isclass(obj) and issubclass(obj, BaseEffect) and obj.__module__ == mod_name:
                             # Шукаємо назву в EFFECT_NAME або генеруємо з імені класу
                             effect_id = getattr(obj, 'EFFECT_NAME', name.lower().replace('effect', ''))
-                            self.effects[effect_id] = PluginEffectWrapper(file_path, name)
+                            self.effects[effect_id] = _tag(PluginEffectWrapper(file_path, name), obj)
                             print(f"Зареєстровано ефект: {effect_id} (клас {name})")
                 except Exception as e:
                     print(f"Не вдалося завантажити плагін {file}: {e}")
 
-    def load_bundle_effects(self, bundle_path):
-        effects_dir = os.path.join(bundle_path, "effects")
-        if not os.path.exists(effects_dir): return
+    def load_bundle_effects(self, bundle):
+        """ bundle - шлях до теки/.dwb або вже відкритий бандл (src.core.bundles) """
+        if isinstance(bundle, str):
+            from src.core.bundles import open_bundle
+            bundle = open_bundle(bundle)
 
-        print(f"Scanning bundle effects in {effects_dir}...")
-        for file in os.listdir(effects_dir):
-            if file.endswith(".py"):
-                file_path = os.path.join(effects_dir, file)
-                try:
-                    # Dynamic load with unique name for bundle
-                    mod_name = f"bundle_effect_{os.path.basename(bundle_path)}_{file[:-3]}"
-                    spec = importlib.util.spec_from_file_location(mod_name, file_path)
-                    module = importlib.util.module_from_spec(spec)
-                    sys.modules[mod_name] = module
-                    spec.loader.exec_module(module)
-                    
-                    for name, obj in inspect.getmembers(module):
-                        if inspect.isclass(obj) and issubclass(obj, BaseEffect) and obj != BaseEffect:
-                            effect_id = getattr(obj, 'EFFECT_NAME', name)
-                            # Register with a prefix or override? 
-                            # Let's override to allow "custom version of glitch" etc.
-                            # But better use unique ID if possible.
-                            self.effects[effect_id] = PluginEffectWrapper(file_path, name)
-                            print(f"Registered bundle effect: {effect_id}")
-                except Exception as e:
-                    print(f"Error loading bundle effect {file}: {e}")
+        for mod_name in bundle.module_names("effects"):
+            try:
+                module = bundle.load_module("effects", mod_name)
+                for name, obj in inspect.getmembers(module):
+                    if inspect.isclass(obj) and issubclass(obj, BaseEffect) and obj != BaseEffect \
+                            and obj.__module__ == module.__name__:
+                        effect_id = getattr(obj, 'EFFECT_NAME', name)
+                        if bundle.config_path() is None:
+                            # З архіву: клас уже завантажено, файлу для hot reload немає
+                            self.effects[effect_id] = BundleEffectWrapper(obj)
+                        else:
+                            self.effects[effect_id] = _tag(PluginEffectWrapper(bundle.module_path("effects", mod_name), name), obj)
+                        print(f"Registered bundle effect: {effect_id}")
+            except Exception as e:
+                print(f"Error loading bundle effect {mod_name}: {e}")
+
+    def set_sandbox(self, conf):
+        """ Політика ізоляції ефектів з ключа пресету "effect_sandbox" """
+        from src.effects.sandbox import SandboxPolicy
+        if self.sandbox is None or self.sandbox.conf != conf:
+            self.sandbox = SandboxPolicy(conf)
+
+    def _sandboxed_effect(self, name, wrapper):
+        from src.effects.sandbox import SandboxedEffect
+        if not self.sandbox.wants(name, wrapper):
+            return None
+        return SandboxedEffect(wrapper.file_path, wrapper.class_name, self.sandbox, wrapper.get_schema())
 
     def get_effect(self, name):
         if name == "none":
             return BaseEffect() 
-        return self.effects.get(name)
+        wrapper = self.effects.get(name)
+        if wrapper is None:
+            return None
+        # Спільний екземпляр: як і обгортка, пісочниця одна на назву
+        sandboxed = self._sandboxed.get(name)
+        if sandboxed is None or sandboxed.policy is not self.sandbox:
+            if sandboxed is not None:
+                sandboxed.close()
+            sandboxed = self._sandboxed[name] = self._sandboxed_effect(name, wrapper)
+        effect = sandboxed or wrapper
+        effect.effect_name = name
+        return effect
+
+    def create_effect(self, name):
+        """ Окремий екземпляр ефекту (власний стан і налаштування) """
+        if name == "none":
+            return BaseEffect()
+        wrapper = self.effects.get(name)
+        if wrapper is None:
+            return None
+        if sandboxed := self._sandboxed_effect(name, wrapper):
+            effect = sandboxed
+        elif isinstance(wrapper, BundleEffectWrapper):
+            effect = BundleEffectWrapper(wrapper.cls)
+        else:
+            effect = PluginEffectWrapper(wrapper.file_path, wrapper.class_name)
+        # Назва, щоб за потреби створити ще один такий самий (дзеркала екранів)
+        effect.effect_name = name
+        return effect
+
+
+def _tag(wrapper, cls):
+    """ Обгортка поводиться як ефект: переносимо прапорці класу без створення екземпляра """
+    wrapper.SHAREABLE_FRAME = getattr(cls, 'SHAREABLE_FRAME', True)
+    wrapper.SANDBOX = getattr(cls, 'SANDBOX', False)
+    return wrapper
 
 # Compatibility functions (if needed)
 def draw_glitch(p, w, h, phase): 
@@ -0,0 +1,90 @@
+import math
+
+import numpy as np
+
+
+class FieldGrid:
+    """ Поле (шум, напрямки, висоти), обчислене один раз у вузлах грубої
+    сітки над екраном w x h з кроком cell пікселів.
+
+    sample(x, y) - білінійна вибірка для N точок одразу: замість
+    тригонометрії на кожну частинку кожного кадру - чотири gather по
+    NumPy-масиву. Поля, що плавно змінюються, лишаються гладкими й на
+    кроці 16-32 px. Зберігати варто те, що потрібно малюванню: напрямок
+    як (cos, sin), а не кут, - тоді вибірка не потребує тригонометрії взагалі.
+    """
+    def __init__(self, w, h, cell=16):
+        self.w, self.h = w, h
+        self.cell = cell
+        self.cols = int(math.ceil(w / cell)) + 1
+        self.rows = int(math.ceil(h / cell)) + 1
+        self.values = None
+
+    def nodes(self):
+        """ Координати вузлів X, Y форми (rows, cols) у пікселях """
+        xs = np.arange(self.cols, dtype=np.float32) * self.cell
+        ys = np.arange(self.rows, dtype=np.float32) * self.cell
+        return np.meshgrid(xs, ys)
+
+    def fill(self, fn):
+        """ fn(X, Y) -> (rows, cols) або (rows, cols, C); повертає self """
+        X, Y = self.nodes()
+        self.values = np.asarray(fn(X, Y), np.float32)
+        return self
+
+    def sample(self, x, y):
+        """ (N,) або (N, C) для точок x, y (пікселі); поза екраном - значення краю """
+        return bilinear(self.values, x / self.cell, y / self.cell)
+
+
+class AnimatedField(FieldGrid):
+    """ Поле fn(X, Y, t) на проміжку t у [0, period): slices зрізів рахуються
+    заздалегідь, між ними - лінійна інтерполяція за часом. Кадр коштує одне
+    змішування двох зрізів сітки плюс вибірку частинок.
+
+    periodic=False - fn не повторюється через period (t лише пробігає цей
+    проміжок і стрибає на початок): рахується ще й зріз на t = period, щоб
+    останній проміжок не змішувався з нульовим зрізом """
+    def __init__(self, w, h, fn, period, slices=64, cell=16, periodic=True):
+        super().__init__(w, h, cell)
+        self.period = period
+        self.slices = slices
+        self.periodic = periodic
+        X, Y = self.nodes()
+        count = slices if periodic else slices + 1
+        self.frames = np.stack([
+            np.asarray(fn(X, Y, k * period / slices), np.float32) for k in range(count)
+        ])
+        self._t = None
+
+    def at(self, t):
+        """ Сітка значень на момент t (кешується, поки t той самий) """
+        if t != self._t:
+            s = (t % self.period) / self.period * self.slices
+            k = int(s) % self.slices
+            f = s - int(s)
+            k1 = (k + 1) % self.slices if self.periodic else k + 1
+            self.values = self.frames[k] * (1.0 - f) + self.frames[k1] * f
+            self._t = t
+        return self.values
+
+    def sample(self, x, y, t):
+        self.at(t)
+        return super().sample(x, y)
+
+
+def bilinear(values, gx, gy):
+    """ Білінійна інтерполяція values (rows, cols[, C]) у дробових координатах сітки """
+    rows, cols = values.shape[:2]
+    gx = np.clip(gx, 0.0, cols - 1.0001)
+    gy = np.clip(gy, 0.0, rows - 1.0001)
+    i0 = gx.astype(np.intp)
+    j0 = gy.astype(np.intp)
+    fx = (gx - i0).astype(np.float32)
+    fy = (gy - j0).astype(np.float32)
+    if values.ndim == 3:
+        fx = fx[:, None]
+        fy = fy[:, None]
+    top = values[j0, i0] * (1.0 - fx) + values[j0, i0 + 1] * fx
+    bottom = values[j0 + 1, i0] * (1.0 - fx) + values[j0 + 1, i0 + 1] * fx
+    return top * (1.0 - fy) + bottom * fy
@@ -0,0 +1,281 @@
+import math
+
+import numpy as np
+from PySide6.QtCore import Qt, QPointF
+from PySide6.QtGui import QColor, QPen, QPolygonF
+
+
+class ParticlePool:
+    """ Частинки як структура масивів (SoA) фіксованої ємності.
+
+    Живі частинки завжди лежать щільно в [0:count]: kill() ущільнює масив
+    одним проходом NumPy замість list.remove у циклі, тож смерть тисяч
+    частинок за кадр коштує O(N). Властивості pos/vel/age/... - це view
+    на живу частину. Додаткові поля (фаза, базова позиція тощо) задаються
+    через fields={"name": ширина}.
+    Одиниці часу довільні (секунди чи кадри) - головне, однакові для
+    life, step() і сил.
+    """
+    def __init__(self, capacity=1024, fields=None, grow=True):
+        self.capacity = capacity
+        self.grow = grow
+        self.count = 0
+        self._arrays = {
+            "pos": np.zeros((capacity, 2), np.float32),
+            "vel": np.zeros((capacity, 2), np.float32),
+            "age": np.zeros(capacity, np.float32),
+            "life": np.ones(capacity, np.float32),
+            "size": np.ones(capacity, np.float32),
+            "color": np.full((capacity, 4), 255, np.uint8),
+        }
+        for name, width in (fields or {}).items():
+            shape = (capacity,) if width == 1 else (capacity, width)
+            self._arrays[name] = np.zeros(shape, np.float32)
+
+    # --- Доступ ---
+
+    def field(self, name):
+        return self._arrays[name][:self.count]
+
+    def set_field(self, name, value):
+        arr = self._arrays[name]
+        # pool.vel += ... вже змінив view на місці й присвоює його ж назад
+        if not (isinstance(value, np.ndarray) and value.base is arr):
+            arr[:self.count] = value
+
+    def _field_property(name):
+        return property(lambda self: self.field(name),
+                        lambda self, value: self.set_field(name, value))
+
+    pos = _field_property("pos")
+    vel = _field_property("vel")
+    age = _field_property("age")
+    life = _field_property("life")
+    size = _field_property("size")
+    color = _field_property("color")
+    del _field_property
+
+    @property
+    def t(self):
+        """ Нормований вік 0..1 - аргумент для кривих """
+        return np.clip(self.age / self.life, 0.0, 1.0)
+
+    @property
+    def remaining(self):
+        return self.life - self.age
+
+    def __len__(self):
+        return self.count
+
+    # --- Народження й смерть ---
+
+    def _reserve(self, n):
+        if self.count + n <= self.capacity:
+            return n
+        if not self.grow:
+            return self.capacity - self.count
+        new_cap = max(self.capacity * 2, self.count + n)
+        for name, arr in self._arrays.items():
+            grown = np.zeros((new_cap,) + arr.shape[1:], arr.dtype)
+            grown[:self.count] = arr[:self.count]
+            self._arrays[name] = grown
+        self.capacity = new_cap
+        return n
+
+    def emit(self, n, **values):
+        """ Додає n частинок; значення - скаляр, рядок на всіх або масив на кожну.
+        Повертає slice нових частинок (або None, якщо пул повний) """
+        requested = int(n)
+        n = self._reserve(requested)
+        if n <= 0:
+            return None
+        new = slice(self.count, self.count + n)
+        for name, arr in self._arrays.items():
+            if name in values:
+                value = values[name]
+                if n < requested and isinstance(value, np.ndarray) and value.shape[:1] == (requested,):
+                    value = value[:n]  # пул без росту заповнився
+                arr[new] = value
+            elif name == "life":
+                arr[new] = 1.0
+            elif name == "color":
+                arr[new] = 255
+            elif name == "size":
+                arr[new] = 1.0
+            else:
+                arr[new] = 0
+        self.count += n
+        return new
+
+    def kill(self, mask):
+        """ Прибирає частинки за булевою маскою довжини count (ущільнення) """
+        if not np.any(mask):
+            return
+        keep = np.flatnonzero(~mask)
+        alive = len(keep)
+        for arr in self._arrays.values():
+            arr[:alive] = arr[keep]
+        self.count = alive
+
+    def clear(self):
+        self.count = 0
+
+    # --- Симуляція ---
+
+    def step(self, dt, forces=()):
+        """ Сили -> швидкість -> позиція -> вік; померлі за віком прибираються """
+        if not self.count:
+            return
+        for force in forces:
+            force.apply(self, dt)
+        self.pos += self.vel * dt
+        self.age += dt
+        self.kill(self.age >= self.life)
+
+
+# --- Сили: apply(pool, dt) змінює pool.vel ---
+
+class Gravity:
+    def __init__(self, gx=0.0, gy=0.1):
+        self.g = np.array((gx, gy), np.float32)
+
+    def apply(self, pool, dt):
+        pool.vel += self.g * dt
+
+
+class Drag:
+    """ Експоненційне згасання швидкості: k - частка, що втрачається за одиницю часу """
+    def __init__(self, k=0.05):
+        self.k = k
+
+    def apply(self, pool, dt):
+        pool.vel *= (1.0 - self.k) ** dt
+
+
+class Attractor:
+    """ Притягання (strength > 0) або відштовхування до точки в межах radius """
+    def __init__(self, x, y, strength=1.0, radius=300.0):
+        self.x, self.y = x, y
+        self.strength = strength
+        self.radius = radius
+
+    def apply(self, pool, dt):
+        diff = np.array((self.x, self.y), np.float32) - pool.pos
+        dist = np.sqrt(np.einsum("ij,ij->i", diff, diff)) + 1e-6
+        falloff = np.clip(1.0 - dist / self.radius, 0.0, 1.0)
+        pool.vel += diff * (self.strength * falloff * dt / dist)[:, None]
+
+
+class Noise:
+    """ Випадкові поштовхи (броунівський рух) """
+    def __init__(self, strength=0.5, rng=None):
+        self.strength = strength
+        self.rng = rng or np.random.default_rng()
+
+    def apply(self, pool, dt):
+        pool.vel += self.rng.normal(0.0, self.strength * math.sqrt(dt), pool.vel.shape).astype(np.float32)
+
+
+# --- Криві та емітери ---
+
+class Curve:
+    """ Кусково-лінійна крива по нормованому віку: Curve([(0, 1), (1, 0)])(pool.t) """
+    def __init__(self, points):
+        self.x = np.array([p[0] for p in points], np.float32)
+        self.y = np.array([p[1] for p in points], np.float32)
+
+    def __call__(self, t):
+        return np.interp(t, self.x, self.y)
+
+
+class Emitter:
+    """ Кругове розкидання з точки: burst() разово, update() - з частотою rate за одиницю часу """
+    def __init__(self, x=0.0, y=0.0, rate=0.0, speed=(1.0, 4.0), angle=(0.0, 2 * math.pi),
+                 life=(1.0, 1.0), size=(2.0, 2.0), color=(255, 255, 255, 255)):
+        self.x, self.y = x, y
+        self.rate = rate
+        self.speed = speed
+        self.angle = angle
+        self.life = life
+        self.size = size
+        self.color = color
+        self._carry = 0.0
+
+    def burst(self, pool, n, rng, x=None, y=None, color=None, **extra):
+        angle = rng.uniform(*self.angle, n)
+        speed = rng.uniform(*self.speed, n)
+        vel = np.stack((np.cos(angle) * speed, np.sin(angle) * speed), axis=1)
+        return pool.emit(
+            n,
+            pos=(self.x if x is None else x, self.y if y is None else y),
+            vel=vel,
+            life=rng.uniform(*self.life, n),
+            size=rng.uniform(*self.size, n),
+            color=self.color if color is None else color,
+            **extra,
+        )
+
+    def update(self, pool, dt, rng):
+        self._carry += self.rate * dt
+        n = int(self._carry)
+        self._carry -= n
+        if n:
+            self.burst(pool, n, rng)
+
+
+def rgba(color):
+    """ QColor або кортеж -> (r, g, b, a) """
+    if isinstance(color, QColor):
+        return color.red(), color.green(), color.blue(), color.alpha()
+    return tuple(color) if len(color) == 4 else (*color, 255)
+
+
+# --- Пакетне малювання ---
+
+ALPHA_LEVELS = 16
+
+
+def draw_particles(p, pos, size, color, alpha=None):
+    """ Малює кола діаметра size групами: один drawPoints (круглий пензель)
+    на кожну пару (колір, розмір) замість drawEllipse на частинку.
+
+    color - (N, 4) uint8 або один колір; alpha - (N,) множник 0..1.
+    Прозорість квантується до ALPHA_LEVELS рівнів, розмір - до пікселя.
+    """
+    n = len(pos)
+    if n == 0:
+        return
+    colors = np.broadcast_to(np.asarray(color, np.uint8), (n, 4))
+    a = colors[:, 3].astype(np.float32)
+    if alpha is not None:
+        a = a * np.clip(alpha, 0.0, 1.0)
+    a_q = np.round(a / 255.0 * (ALPHA_LEVELS - 1)).astype(np.uint16)
+    size_q = np.maximum(1, np.round(np.broadcast_to(size, (n,)))).astype(np.uint32)
+
+    visible = a_q > 0
+    if not np.all(visible):
+        pos, colors, a_q, size_q = pos[visible], colors[visible], a_q[visible], size_q[visible]
+        if not len(pos):
+            return
+
+    c64 = colors.astype(np.uint64)
+    key = (c64[:, 0] << 40) | (c64[:, 1] << 32) | (c64[:, 2] << 24) \
+        | (a_q.astype(np.uint64) << 16) | np.minimum(size_q, 0xFFFF).astype(np.uint64)
+    order = np.argsort(key, kind="stable")
+    key_sorted = key[order]
+    bounds = np.flatnonzero(np.diff(key_sorted)) + 1
+    xs = pos[order, 0].tolist()
+    ys = pos[order, 1].tolist()
+
+    pen = QPen()
+    pen.setCapStyle(Qt.RoundCap)
+    p.setBrush(Qt.NoBrush)
+    start = 0
+    for end in list(bounds) + [len(order)]:
+        i = order[start]
+        c = colors[i]
+        pen.setColor(QColor(int(c[0]), int(c[1]), int(c[2]), int(a_q[i] * 255 // (ALPHA_LEVELS - 1))))
+        pen.setWidthF(float(size_q[i]))
+        p.setPen(pen)
+        p.drawPoints(QPolygonF([QPointF(x, y) for x, y in zip(xs[start:end], ys[start:end])]))
+        start = end
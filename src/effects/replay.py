@@ -0,0 +1,158 @@
+import argparse
+import os
+import sys
+import time
+
+from PySide6.QtCore import Qt
+from PySide6.QtGui import QImage, QPainter
+
+from src.core.resources import get_resource_path
+from src.core.input import InputService, ScriptedBackend
+from src.effects.base import EffectSources, PluginEffectWrapper, effect_sources
+
+# Крок фази, як у DynamicWallpaper._tick
+PHASE_STEP = 0.0035
+# Відтворення починається з фіксованого моменту, щоб localtime() теж збігався
+REPLAY_EPOCH = 1700000000.0
+# Ефекти з еталонними кадрами в res/golden: record/check без імен працюють з ними
+GOLDEN_EFFECTS = ("physarum_mold", "fireworks", "snowfall", "boid_swarm", "day_night_cycle")
+
+
+class FrameClock:
+    """ Годинник, що йде лише по кадрах: time() = start + frame / fps """
+    deterministic = True
+
+    def __init__(self, fps=30, start=REPLAY_EPOCH):
+        self.fps = fps
+        self.start = start
+        self.frame = 0
+
+    def time(self):
+        return self.start + self.frame / self.fps
+
+    def localtime(self):
+        # UTC - результат не залежить від часового поясу машини
+        return time.gmtime(self.time())
+
+    def advance(self):
+        self.frame += 1
+
+
+def render_frames(effect_factory, frames, w, h, seed=0, fps=30, config=None, points=None):
+    """ Рендерить frames кадрів детерміновано; effect_factory() створюється
+    вже з підміненими rng/clock/input.
+    points - сценарій курсора (x, y[, buttons]) по кадрах, за замовчуванням центр """
+    clock = FrameClock(fps)
+    pointer = InputService(ScriptedBackend(points or [(w // 2, h // 2)]))
+    pointer.set_surface((0, 0, w, h))
+    sources = EffectSources(seed, clock, pointer)
+    with effect_sources(sources):
+        effect = effect_factory()
+        if config:
+            effect.configure(config)
+
+    images = []
+    phase = 0.0
+    for _ in range(frames):
+        pointer.sample(clock.time())
+        img = QImage(w, h, QImage.Format_ARGB32_Premultiplied)
+        img.fill(Qt.black)
+        p = QPainter(img)
+        try:
+            p.setRenderHint(QPainter.Antialiasing, True)
+            effect.draw(p, w, h, phase)
+        finally:
+            p.end()
+        images.append(img)
+        clock.advance()
+        phase = (phase + PHASE_STEP) % 1.0
+    return images
+
+
+def frame_diff(a, b):
+    """ (середня, максимальна) різниця каналів 0..255 між двома кадрами """
+    import numpy as np
+    if a.size() != b.size():
+        return 255.0, 255
+    arrays = []
+    for img in (a, b):
+        img = img.convertToFormat(QImage.Format_ARGB32)
+        raw = np.frombuffer(img.constBits(), np.uint8, count=img.sizeInBytes())
+        arrays.append(raw.reshape(img.height(), img.bytesPerLine())[:, :img.width() * 4].astype(np.int16))
+    delta = np.abs(arrays[0] - arrays[1])
+    return float(delta.mean()), int(delta.max())
+
+
+def golden_dir(effect_name):
+    return get_resource_path(os.path.join("res", "golden", effect_name))
+
+
+def record(effect_name, images):
+    out = golden_dir(effect_name)
+    os.makedirs(out, exist_ok=True)
+    for i, img in enumerate(images):
+        img.save(os.path.join(out, f"{i:04d}.png"))
+    return out
+
+
+def check(effect_name, images, tolerance=1.0, max_tolerance=64):
+    """ Кадри, що відрізняються від еталонних більше за допуск: [(index, mean, max)].
+    mean - середня різниця каналу, max - найбільша різниця одного пікселя """
+    failures = []
+    for i, img in enumerate(images):
+        path = os.path.join(golden_dir(effect_name), f"{i:04d}.png")
+        golden = QImage(path)
+        if golden.isNull():
+            failures.append((i, None, None))
+            continue
+        mean, peak = frame_diff(img, golden)
+        if mean > tolerance or peak > max_tolerance:
+            failures.append((i, mean, peak))
+    return failures
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Deterministic effect replay and golden-frame check")
+    parser.add_argument("command", choices=("record", "check"))
+    parser.add_argument("effects", nargs="*", default=list(GOLDEN_EFFECTS))
+    parser.add_argument("--frames", type=int, default=30)
+    parser.add_argument("--size", default="480x270")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--fps", type=int, default=30)
+    parser.add_argument("--tolerance", type=float, default=1.0)
+    args = parser.parse_args(argv)
+
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PySide6.QtGui import QGuiApplication
+    app = QGuiApplication.instance() or QGuiApplication(sys.argv[:1])
+
+    from src.effects.base import EffectRegistry
+    registry = EffectRegistry()
+    w, h = (int(v) for v in args.size.lower().split("x"))
+
+    failed = False
+    for name in args.effects:
+        wrapper = registry.effects.get(name)
+        if wrapper is None or not getattr(wrapper, 'SHAREABLE_FRAME', True):
+            print(f"{name}: unknown or GL-only effect, skipped")
+            continue
+        factory = lambda: PluginEffectWrapper(wrapper.file_path, wrapper.class_name)
+        images = render_frames(factory, args.frames, w, h, args.seed, args.fps)
+        if args.command == "record":
+            print(f"{name}: {len(images)} frames -> {record(name, images)}")
+            continue
+        failures = check(name, images, args.tolerance)
+        failed |= bool(failures)
+        for i, mean, peak in failures:
+            if mean is None:
+                print(f"{name}: frame {i} has no golden image")
+            else:
+                print(f"{name}: frame {i} differs (mean {mean:.2f}, max {peak})")
+        if not failures:
+            print(f"{name}: {len(images)} frames OK")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    # python -m src.effects.replay record|check [<effect> ...] [--frames N] [--size WxH] [--seed S]
+    sys.exit(main())
@@ -0,0 +1,316 @@
+import atexit
+import importlib.util
+import multiprocessing
+import os
+import sys
+import time
+from multiprocessing import shared_memory
+
+from PySide6.QtGui import QImage, QPainter
+
+from src.effects.base import BaseEffect
+
+FRAME_FORMAT = QImage.Format_ARGB32_Premultiplied
+
+
+class SandboxPolicy:
+    """ Ключ пресету "effect_sandbox": true | ["name", ...] |
+    {"effects": true|[...], "timeout": 2.0, "startup_timeout": 20.0, "max_restarts": 3,
+    "fallback": "blank"|"inline"}. timeout - на кадр, startup_timeout - на запуск воркера
+    (Python, PySide6, QGuiApplication та імпорт плагіна) до першого ("ready",).
+    Ефект із класовим атрибутом SANDBOX = True ізолюється завжди. """
+    def __init__(self, conf=None):
+        self.conf = conf
+        if isinstance(conf, dict):
+            effects = conf.get("effects", True)
+        else:
+            effects, conf = conf, {}
+        self.effects = effects if isinstance(effects, (bool, list)) else bool(effects)
+        self.timeout = conf.get("timeout", 2.0)
+        self.startup_timeout = conf.get("startup_timeout", 20.0)
+        self.max_restarts = conf.get("max_restarts", 3)
+        self.fallback = conf.get("fallback", "blank")
+
+    def wants(self, name, wrapper):
+        # Прапорці класу копіюються на обгортку при скануванні плагінів
+        if not getattr(wrapper, 'SHAREABLE_FRAME', True):
+            return False  # raw GL can't render into shared memory
+        if not os.path.isfile(getattr(wrapper, 'file_path', "")):
+            return False  # classes from .dwb archives have no file for the worker
+        if getattr(wrapper, 'SANDBOX', False):
+            return True
+        if isinstance(self.effects, list):
+            return name in self.effects
+        return bool(self.effects)
+
+
+class SandboxedEffect(BaseEffect):
+    """ Ефект у окремому процесі: зависання чи падіння плагіна не валить шпалери.
+
+    Воркер малює в один із двох буферів shared memory, основний процес
+    виводить готовий буфер через QImage поверх тієї ж пам'яті (без копії)
+    і одразу замовляє наступний кадр, тож симуляція йде на іншому ядрі
+    паралельно з GUI-потоком. Кадр відстає на один тік. Якщо відповідь
+    не приходить за timeout або процес помер - перезапуск, після
+    max_restarts - fallback (порожній кадр або звичайний in-process ефект).
+    """
+    def __init__(self, file_path, class_name, policy=None, schema=None):
+        super().__init__()
+        self.file_path = file_path
+        self.class_name = class_name
+        self.policy = policy or SandboxPolicy(True)
+        self.schema = schema or {}
+        self.instance = None
+        self.config = {}
+        self.restarts = 0
+        self.fallback = None
+
+        self._ctx = multiprocessing.get_context("spawn")
+        self._proc = None
+        self._conn = None
+        self._shm = None
+        self._size = (0, 0)
+        self._seq = 0
+        self._pending = None      # (seq, sent_at)
+        self._ready = None        # індекс буфера з останнім готовим кадром
+        self._started_at = None   # час запуску воркера, поки не прийшло ("ready",)
+        self._suspended = False
+        atexit.register(self.close)
+
+    # --- Процес ---
+
+    def _start(self):
+        parent, child = self._ctx.Pipe()
+        self._proc = self._ctx.Process(
+            target=_worker_main, args=(child, self.file_path, self.class_name),
+            name=f"Sandbox {self.class_name}", daemon=True,
+        )
+        self._proc.start()
+        child.close()
+        self._conn = parent
+        self._pending = None
+        self._ready = None
+        self._started_at = time.perf_counter()
+        self._send(("configure", self.config, self.show_background))
+        if self._suspended:
+            self._send(("suspend",))
+
+    def _send(self, msg):
+        try:
+            self._conn.send(msg)
+        except (OSError, EOFError, BrokenPipeError):
+            pass
+
+    def _stop_process(self):
+        if self._proc is None:
+            return
+        self._send(("stop",))
+        self._proc.join(0.2)
+        if self._proc.is_alive():
+            self._proc.kill()
+            self._proc.join(1.0)
+        self._conn.close()
+        self._proc = self._conn = None
+        self._pending = self._ready = self._started_at = None
+
+    def _fail(self, reason):
+        print(f"Sandbox {self.class_name}: {reason}")
+        self._stop_process()
+        self.restarts += 1
+        if self.restarts > self.policy.max_restarts:
+            print(f"Sandbox {self.class_name}: giving up after {self.restarts - 1} restarts, fallback={self.policy.fallback}")
+            self.close()
+            if self.policy.fallback == "inline":
+                from src.effects.base import PluginEffectWrapper
+                self.fallback = PluginEffectWrapper(self.file_path, self.class_name)
+                self.fallback.configure(self.config)
+            else:
+                self.fallback = BaseEffect()
+            self.fallback.set_show_background(self.show_background)
+
+    def _ensure_buffers(self, w, h):
+        """ Два кадри w*h*4; перевиділення лише без кадру «в дорозі» """
+        if self._size == (w, h) and self._shm is not None:
+            return True
+        if self._pending is not None:
+            return False
+        old = self._shm
+        self._shm = shared_memory.SharedMemory(create=True, size=max(1, w * h * 4 * 2))
+        self._size = (w, h)
+        self._ready = None
+        if old is not None:
+            old.close()
+            old.unlink()
+        return True
+
+    # --- Кадри ---
+
+    def _collect(self):
+        """ Забирає готові кадри без блокування """
+        try:
+            while self._conn.poll():
+                kind, *args = self._conn.recv()
+                if kind == "ready":
+                    self._started_at = None
+                    continue
+                seq, idx = args
+                if kind == "done" and self._pending and seq == self._pending[0]:
+                    self._ready = idx
+                    self._pending = None
+                elif kind == "error":
+                    print(f"Sandbox {self.class_name} error: {idx}")
+                    self._pending = None
+        except (EOFError, OSError):
+            self._fail("worker pipe closed")
+
+    def _request(self, w, h, phase):
+        if self._pending is not None or self._proc is None or self._started_at is not None \
+                or not self._ensure_buffers(w, h):
+            return
+        self._seq += 1
+        # Пишемо в буфер, який зараз не показується
+        idx = 1 if self._ready == 0 else 0
+        self._send(("frame", self._seq, self._shm.name, idx, w, h, phase, self.audio_data, self.input.snapshot()))
+        self._pending = (self._seq, time.perf_counter())
+
+    def _tick(self, w, h, phase):
+        if self._proc is None:
+            self._start()
+        elif not self._proc.is_alive():
+            self._fail(f"worker exited with code {self._proc.exitcode}")
+            return
+        self._collect()
+        if self._proc is None:
+            return
+        if self._started_at is not None:
+            # Вартовий кадрів стартує лише після ("ready",) від воркера
+            if time.perf_counter() - self._started_at > self.policy.startup_timeout:
+                self._fail(f"worker not ready after {self.policy.startup_timeout:.1f}s")
+            return
+        if self._pending and time.perf_counter() - self._pending[1] > self.policy.timeout:
+            self._fail(f"no frame for {self.policy.timeout:.1f}s")
+            return
+        self._request(w, h, phase)
+
+    def draw(self, p, w, h, phase):
+        if self.fallback is not None:
+            self.fallback.audio_data = self.audio_data
+            self.fallback.draw(p, w, h, phase)
+            return
+        self._tick(w, h, phase)
+        if self._ready is None or self._shm is None:
+            return
+        fw, fh = self._size
+        size = fw * fh * 4
+        view = self._shm.buf[self._ready * size:(self._ready + 1) * size]
+        img = QImage(view, fw, fh, fw * 4, FRAME_FORMAT)
+        if (fw, fh) == (w, h):
+            p.drawImage(0, 0, img)
+        else:
+            p.drawImage(p.viewport(), img)
+        del img
+        view.release()
+
+    def warm_up(self, w, h, phase=0.0):
+        """ Лише запускає воркер заздалегідь, не блокуючи GUI: ефект
+        ініціалізується у своєму процесі, поки триває попередній """
+        if self.fallback is not None:
+            self.fallback.warm_up(w, h, phase)
+            return
+        self._tick(w, h, phase)
+
+    # --- Керування ---
+
+    def get_schema(self):
+        return self.schema
+
+    def configure(self, config: dict):
+        self.config = dict(config)
+        if self.fallback is not None:
+            self.fallback.configure(config)
+        elif self._proc is not None:
+            self._send(("configure", self.config, self.show_background))
+
+    def set_show_background(self, show: bool):
+        super().set_show_background(show)
+        if self.fallback is not None:
+            self.fallback.set_show_background(show)
+        elif self._proc is not None:
+            self._send(("configure", self.config, show))
+
+    def on_suspend(self):
+        self._suspended = True
+        if self._proc is not None:
+            self._send(("suspend",))
+
+    def on_resume(self):
+        self._suspended = False
+        if self._proc is not None:
+            self._send(("resume",))
+
+    def close(self):
+        self._stop_process()
+        if self._shm is not None:
+            self._shm.close()
+            self._shm.unlink()
+            self._shm = None
+
+
+def _worker_main(conn, file_path, class_name):
+    """ Процес-пісочниця: офскрін QGuiApplication і один ефект """
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PySide6.QtGui import QGuiApplication
+    from src.core.input import SnapshotInput
+    app = QGuiApplication(sys.argv[:1])
+
+    spec = importlib.util.spec_from_file_location(f"sandbox_{os.path.basename(file_path)}", file_path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    effect = getattr(module, class_name)()
+    conn.send(("ready",))
+
+    shm = None
+    while True:
+        try:
+            msg = conn.recv()
+        except (EOFError, OSError):
+            break
+        kind = msg[0]
+        try:
+            if kind == "frame":
+                _, seq, name, idx, w, h, phase, audio, snap = msg
+                if shm is None or shm.name != name:
+                    if shm is not None:
+                        shm.close()
+                    shm = shared_memory.SharedMemory(name=name)
+                size = w * h * 4
+                view = shm.buf[idx * size:(idx + 1) * size]
+                img = QImage(view, w, h, w * 4, FRAME_FORMAT)
+                img.fill(0)
+                p = QPainter(img)
+                try:
+                    p.setRenderHint(QPainter.Antialiasing, True)
+                    effect.audio_data = audio
+                    effect.input = SnapshotInput(snap)
+                    effect.draw(p, w, h, phase)
+                finally:
+                    p.end()
+                del img
+                view.release()
+                conn.send(("done", seq, idx))
+            elif kind == "configure":
+                effect.configure(msg[1])
+                effect.reset_cache()
+                effect.show_background = msg[2]
+            elif kind == "suspend":
+                effect.on_suspend()
+            elif kind == "resume":
+                effect.on_resume()
+            elif kind == "stop":
+                break
+        except Exception as e:
+            conn.send(("error", msg[1] if kind == "frame" else 0, repr(e)))
+
+    if shm is not None:
+        shm.close()
+    app.quit()
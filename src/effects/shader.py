@@ -1,4 +1,3 @@
-import time
 import sys
 import ctypes
 from effects import BaseEffect
@@ -11,15 +10,104 @@ except ImportError:
     HAS_OPENGL = False
     print("PyOpenGL not found. Shader effects will be disabled.")
 
+# GL-об'єкти вивантажених ефектів (hot reload): звільняються при наступному
+# draw будь-якого ShaderEffect у тому самому контексті
+_gl_garbage = []
+
+
+def _current_context():
+    from PySide6.QtGui import QOpenGLContext
+    return QOpenGLContext.currentContext()
+
+
+class RenderTarget:
+    """ Ping-pong пара текстур із FBO для одного буфера: прохід читає front
+    (попередній кадр) і пише в back, після чого swap() міняє їх місцями.
+    Якщо float-текстури не підтримуються як ціль рендерингу - RGBA8 """
+    def __init__(self, w, h, float_tex=True, filter="linear", wrap="clamp"):
+        self.size = (w, h)
+        self.textures = []
+        self.fbos = []
+        self.front = 0
+        formats = [(GL_RGBA32F, GL_FLOAT), (GL_RGBA8, GL_UNSIGNED_BYTE)] if float_tex else [(GL_RGBA8, GL_UNSIGNED_BYTE)]
+        previous_fbo = int(glGetIntegerv(GL_FRAMEBUFFER_BINDING))
+        try:
+            for internal, data_type in formats:
+                if self._allocate(w, h, internal, data_type, filter, wrap):
+                    self.float_tex = data_type == GL_FLOAT
+                    return
+                self.release()
+                print(f"RenderTarget: format {internal:#x} is not renderable, trying fallback")
+            raise RuntimeError("incomplete framebuffer")
+        except Exception:
+            self.release()
+            raise
+        finally:
+            glBindTexture(GL_TEXTURE_2D, 0)
+            glBindFramebuffer(GL_FRAMEBUFFER, previous_fbo)
+
+    def _allocate(self, w, h, internal, data_type, filter, wrap):
+        gl_filter = GL_NEAREST if filter == "nearest" else GL_LINEAR
+        gl_wrap = GL_REPEAT if wrap == "repeat" else GL_CLAMP_TO_EDGE
+        for _ in range(2):
+            tex = glGenTextures(1)
+            self.textures.append(tex)
+            glBindTexture(GL_TEXTURE_2D, tex)
+            glTexImage2D(GL_TEXTURE_2D, 0, internal, w, h, 0, GL_RGBA, data_type, None)
+            glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MIN_FILTER, gl_filter)
+            glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MAG_FILTER, gl_filter)
+            glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_WRAP_S, gl_wrap)
+            glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_WRAP_T, gl_wrap)
+
+            fbo = glGenFramebuffers(1)
+            self.fbos.append(fbo)
+            glBindFramebuffer(GL_FRAMEBUFFER, fbo)
+            glFramebufferTexture2D(GL_FRAMEBUFFER, GL_COLOR_ATTACHMENT0, GL_TEXTURE_2D, tex, 0)
+            if glCheckFramebufferStatus(GL_FRAMEBUFFER) != GL_FRAMEBUFFER_COMPLETE:
+                return False
+            # Стан симуляції починається з нулів
+            glClearColor(0.0, 0.0, 0.0, 0.0)
+            glClear(GL_COLOR_BUFFER_BIT)
+        return True
+
+    @property
+    def texture(self):
+        return self.textures[self.front]
+
+    @property
+    def back_fbo(self):
+        return self.fbos[1 - self.front]
+
+    def swap(self):
+        self.front = 1 - self.front
+
+    def release(self):
+        if self.fbos:
+            glDeleteFramebuffers(len(self.fbos), self.fbos)
+        if self.textures:
+            glDeleteTextures(self.textures)
+        self.textures = []
+        self.fbos = []
+
+
 class ShaderEffect(BaseEffect):
+    # Renders with raw GL into the current context, never via QImage
+    SHAREABLE_FRAME = False
+    # Ім'я фінального проходу в get_uniforms()
+    IMAGE_PASS = "image"
+
     def __init__(self):
         super().__init__()
         self.program = None
         self.vao = None
         self.vbo = None
-        self.start_time = time.time()
+        self.start_time = self.clock.time()
         self.resolution = (1920, 1080)
         self.initialized = False
+        self.frame = 0
+        self.passes = []     # нормалізовані get_buffers() з program
+        self.targets = {}    # ім'я буфера -> RenderTarget
+        self.gl_context = None
         
     def get_vertex_shader(self):
         return """
@@ -45,16 +133,48 @@ class ShaderEffect(BaseEffect):
         }
         """
 
+    def get_buffers(self):
+        """ Багатопрохідний режим, як Buffer A/B у Shadertoy. Список проходів,
+        що виконуються по черзі перед основним шейдером:
+
+            {"name": "A", "fragment": GLSL, "inputs": ["A", "B"],
+             "float": True, "scale": 1.0, "filter": "linear" | "nearest",
+             "wrap": "clamp" | "repeat", "steps": 1}
+
+        Кожен буфер - пара текстур (ping-pong): вхід i доступний як sampler2D
+        iChannel{i}; власний буфер або ще не виконаний прохід дає попередній
+        кадр, уже виконаний - результат цього кадру. steps - скільки разів
+        прохід повторюється за кадр (кроки симуляції). На iFrame == 0 буфери
+        порожні - час задати початковий стан.
+        """
+        return []
+
+    def get_image_inputs(self):
+        """ Буфери, що їх бачить основний шейдер як iChannel0.. (за замовчуванням усі) """
+        return [spec["name"] for spec in self.passes]
+
+    def get_uniforms(self, pass_name, w, h):
+        """ Додаткові uniform для проходу (IMAGE_PASS - основний): {ім'я: значення}.
+        float -> float, int/bool -> int, кортеж із 2-4 чисел -> vec2..vec4 """
+        return {}
+
+    def _compile_program(self, fragment_code):
+        vertex = shaders.compileShader(self.get_vertex_shader(), GL_VERTEX_SHADER)
+        fragment = shaders.compileShader(fragment_code, GL_FRAGMENT_SHADER)
+        return shaders.compileProgram(vertex, fragment)
+
     def _compile_shaders(self):
         if not HAS_OPENGL: return False
 
         try:
-            vertex_code = self.get_vertex_shader()
-            fragment_code = self.get_fragment_shader()
+            self.program = self._compile_program(self.get_fragment_shader())
 
-            vertex = shaders.compileShader(vertex_code, GL_VERTEX_SHADER)
-            fragment = shaders.compileShader(fragment_code, GL_FRAGMENT_SHADER)
-            self.program = shaders.compileProgram(vertex, fragment)
+            self.passes = []
+            for spec in self.get_buffers():
+                spec = {"inputs": [spec["name"]], "float": True, "scale": 1.0,
+                        "filter": "linear", "wrap": "clamp", "steps": 1, **spec}
+                spec["program"] = self._compile_program(spec["fragment"])
+                self.passes.append(spec)
             
             return True
         except Exception as e:
@@ -62,10 +182,49 @@ class ShaderEffect(BaseEffect):
             self.program = None
             return False
 
+    def release_gl(self):
+        """ Звільняє програми, VAO/VBO і буфери; лише з поточним контекстом ефекту """
+        for target in self.targets.values():
+            target.release()
+        self.targets = {}
+        for program in [self.program, *(spec["program"] for spec in self.passes)]:
+            if program:
+                glDeleteProgram(program)
+        if self.vao:
+            glDeleteVertexArrays(1, [self.vao])
+        if self.vbo:
+            glDeleteBuffers(1, [self.vbo])
+        self.program = self.vao = self.vbo = None
+        self.passes = []
+        self.initialized = False
+
+    def on_unload(self):
+        if HAS_OPENGL and self.gl_context is not None:
+            _gl_garbage.append((self.gl_context, self))
+            self.gl_context = None
+
+    def _collect_garbage(self):
+        ctx = _current_context()
+        for entry in [e for e in _gl_garbage if e[0] == ctx]:
+            _gl_garbage.remove(entry)
+            try:
+                entry[1].release_gl()
+            except Exception as e:
+                print(f"GL Release Error: {e}")
+
     def _init_gl(self):
         if not HAS_OPENGL: return
         if self.initialized: return
 
+        # Повторна ініціалізація після помилки: старі об'єкти не лишаються висіти
+        if self.program or self.vao or self.targets:
+            try:
+                self.release_gl()
+            except Exception as e:
+                print(f"GL Release Error: {e}")
+                self.targets = {}
+        self.gl_context = _current_context()
+
         if self._compile_shaders():
             # Full screen quad (x, y)
             # Triangle Strip: (-1,-1), (1,-1), (-1,1), (1,1)
@@ -100,6 +259,92 @@ class ShaderEffect(BaseEffect):
             except Exception as e:
                 print(f"GL Init Error: {e}")
 
+    def warm_up(self, w, h, phase=0.0):
+        """ Компіляція шейдерів заздалегідь; викликається з активним GL-контекстом """
+        self.resolution = (w, h)
+        self._init_gl()
+
+    def _ensure_targets(self, w, h):
+        """ Текстури буферів під поточний розмір; при зміні - порожні, iFrame з нуля """
+        for spec in self.passes:
+            size = (max(1, int(w * spec["scale"])), max(1, int(h * spec["scale"])))
+            target = self.targets.get(spec["name"])
+            if target is None or target.size != size:
+                if target is not None:
+                    target.release()
+                self.targets[spec["name"]] = RenderTarget(size[0], size[1], spec["float"], spec["filter"], spec["wrap"])
+                self.frame = 0
+
+    def _set_uniform(self, program, name, value):
+        loc = glGetUniformLocation(program, name)
+        if loc == -1:
+            return
+        if isinstance(value, (tuple, list)):
+            (glUniform2f, glUniform3f, glUniform4f)[len(value) - 2](loc, *map(float, value))
+        elif isinstance(value, (bool, int)):
+            glUniform1i(loc, int(value))
+        else:
+            glUniform1f(loc, float(value))
+
+    def _apply_uniforms(self, program, pass_name, w, h, res):
+        """ Спільні uniform (iTime, iResolution, iAudio, iFrame, iMouse) + get_uniforms() """
+        self._set_uniform(program, "iTime", self.clock.time() - self.start_time)
+        self._set_uniform(program, "iResolution", (float(res[0]), float(res[1])))
+        self._set_uniform(program, "iFrame", self.frame)
+
+        bass = 0.0
+        mid = 0.0
+        treble = 0.0
+        if self.audio_data:
+            # Normalize audio? Already 0-1
+            bass = self.audio_data.get('bass', 0.0)
+            mid = self.audio_data.get('mid', 0.0)
+            treble = self.audio_data.get('treble', 0.0)
+        self._set_uniform(program, "iAudio", (bass, mid, treble))
+
+        # Курсор у пікселях цілі, y знизу (як gl_FragCoord); zw - ліва/права кнопки
+        mouse = self.input.snapshot()
+        sx, sy = res[0] / max(1, w), res[1] / max(1, h)
+        self._set_uniform(program, "iMouse", (mouse.x * sx, (h - mouse.y) * sy, float(mouse.left), float(mouse.right)))
+
+        for name, value in self.get_uniforms(pass_name, w, h).items():
+            self._set_uniform(program, name, value)
+
+    def _bind_inputs(self, program, inputs):
+        for i, name in enumerate(inputs):
+            glActiveTexture(GL_TEXTURE0 + i)
+            glBindTexture(GL_TEXTURE_2D, self.targets[name].texture)
+            self._set_uniform(program, f"iChannel{i}", i)
+        glActiveTexture(GL_TEXTURE0)
+
+    def _run_buffers(self, w, h):
+        """ Проходи get_buffers() у власні FBO; стан цілі вікна відновлюється після """
+        screen_fbo = int(glGetIntegerv(GL_FRAMEBUFFER_BINDING))
+        viewport = [int(v) for v in glGetIntegerv(GL_VIEWPORT)]
+        blend = glIsEnabled(GL_BLEND)
+        scissor = glIsEnabled(GL_SCISSOR_TEST)
+        glDisable(GL_BLEND)
+        glDisable(GL_SCISSOR_TEST)
+
+        glBindVertexArray(self.vao)
+        for spec in self.passes:
+            target = self.targets[spec["name"]]
+            program = spec["program"]
+            glUseProgram(program)
+            glViewport(0, 0, *target.size)
+            self._apply_uniforms(program, spec["name"], w, h, target.size)
+            for _ in range(spec["steps"]):
+                glBindFramebuffer(GL_FRAMEBUFFER, target.back_fbo)
+                self._bind_inputs(program, spec["inputs"])
+                glDrawArrays(GL_TRIANGLE_STRIP, 0, 4)
+                target.swap()
+        glBindVertexArray(0)
+
+        glBindFramebuffer(GL_FRAMEBUFFER, screen_fbo)
+        glViewport(*viewport)
+        if blend: glEnable(GL_BLEND)
+        if scissor: glEnable(GL_SCISSOR_TEST)
+
     def draw(self, painter, w, h, phase):
         if not HAS_OPENGL: return
 
@@ -109,33 +354,22 @@ class ShaderEffect(BaseEffect):
         # Prepare for raw GL
         painter.beginNativePainting()
         
+        self._collect_garbage()
         if not self.initialized:
             self._init_gl()
             
         if self.program and self.initialized:
             try:
+                if self.passes:
+                    self._ensure_targets(w, h)
+                    self._run_buffers(w, h)
+
                 glUseProgram(self.program)
                 
                 # Uniforms
-                elapsed = time.time() - self.start_time
-                
-                loc = glGetUniformLocation(self.program, "iTime")
-                if loc != -1: glUniform1f(loc, elapsed)
-                
-                loc = glGetUniformLocation(self.program, "iResolution")
-                if loc != -1: glUniform2f(loc, float(w), float(h))
-                
-                loc = glGetUniformLocation(self.program, "iAudio")
-                if loc != -1:
-                    bass = 0.0
-                    mid = 0.0
-                    treble = 0.0
-                    if self.audio_data:
-                        # Normalize audio? Already 0-1
-                        bass = self.audio_data.get('bass', 0.0)
-                        mid = self.audio_data.get('mid', 0.0)
-                        treble = self.audio_data.get('treble', 0.0)
-                    glUniform3f(loc, bass, mid, treble)
+                self._apply_uniforms(self.program, self.IMAGE_PASS, w, h, (w, h))
+                if self.passes:
+                    self._bind_inputs(self.program, self.get_image_inputs())
 
                 # Draw
                 glBindVertexArray(self.vao)
@@ -143,6 +377,7 @@ class ShaderEffect(BaseEffect):
                 glBindVertexArray(0)
                 
                 glUseProgram(0)
+                self.frame += 1
             except Exception as e:
                 print(f"GL Draw Error: {e}")
                 # Disable to avoid spam
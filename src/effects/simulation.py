@@ -0,0 +1,155 @@
+import threading
+import time
+
+import numpy as np
+
+from src.effects.base import BaseEffect
+
+
+class SimulatedEffect(BaseEffect):
+    """ Ефект із розділеними симуляцією та малюванням.
+
+    update(state, dt, w, h) крутиться у фоновому потоці з фіксованим кроком
+    і змінює робочий стан; після кожного кроку snapshot() публікує незмінну
+    копію (передній буфер). render(p, w, h, frame, phase) у GUI-потоці лише
+    малює останню опубліковану копію, тож важкі NumPy-кроки йдуть паралельно
+    з QPainter (NumPy відпускає GIL) і не розтягують кадр.
+
+    Параметри з configure() читаються update() напряму; зміни, що потребують
+    нового стану (кількість частинок), - через reset_state().
+    Потік зупиняється сам, якщо кадри не запитуються IDLE_TIMEOUT секунд
+    (ефект більше не на екрані), і стартує знову з наступним draw().
+    """
+    TIMESTEP = 1 / 60
+    MAX_STEPS = 5        # максимум кроків наздоганяння за один тік
+    IDLE_TIMEOUT = 2.0
+
+    def __init__(self):
+        super().__init__()
+        self.sim_time = 0.0
+        self.bounds = (1920, 1080)
+        self._state = None
+        self._frame = None
+        self._lock = threading.Lock()
+        self._thread = None
+        self._stop = threading.Event()
+        self._reset = False
+        self._last_render = 0.0
+
+    # --- Для нащадків ---
+
+    def create_state(self, w, h):
+        """ Робочий стан симуляції (зазвичай dict NumPy-масивів) """
+        return {}
+
+    def update(self, state, dt, w, h):
+        pass
+
+    def snapshot(self, state):
+        """ Незмінна копія стану для render(); за замовчуванням копіюються масиви """
+        frame = {}
+        for key, value in state.items():
+            if isinstance(value, np.ndarray):
+                value = value.copy()
+                value.flags.writeable = False
+            frame[key] = value
+        return frame
+
+    def render(self, p, w, h, frame, phase):
+        pass
+
+    def reset_state(self):
+        """ Перестворити стан на потоці симуляції перед наступним кроком """
+        self._reset = True
+
+    # --- Потік ---
+
+    def _publish(self):
+        frame = self.snapshot(self._state)
+        with self._lock:
+            self._frame = frame
+
+    def _step(self, dt):
+        w, h = self.bounds
+        if self._state is None or self._reset:
+            self._reset = False
+            self._state = self.create_state(w, h)
+        self.update(self._state, dt, w, h)
+        self.sim_time += dt
+
+    def _run(self):
+        dt = self.TIMESTEP
+        last = time.perf_counter()
+        acc = 0.0
+        while not self._stop.is_set():
+            now = time.perf_counter()
+            if now - self._last_render > self.IDLE_TIMEOUT:
+                break
+            acc = min(acc + now - last, dt * self.MAX_STEPS)
+            last = now
+            stepped = False
+            while acc >= dt:
+                try:
+                    self._step(dt)
+                except Exception as e:
+                    print(f"Simulation error in {type(self).__name__}: {e}")
+                    self._stop.set()
+                    break
+                acc -= dt
+                stepped = True
+            if stepped:
+                self._publish()
+            self._stop.wait(max(0.0, dt - acc))
+        self._thread = None
+
+    def _ensure_running(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        if self._frame is None or self._reset:
+            # Перший кадр синхронно, щоб не малювати порожнечу
+            self._step(self.TIMESTEP)
+            self._publish()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name=f"Sim {type(self).__name__}", daemon=True)
+        self._thread.start()
+
+    def stop_simulation(self):
+        self._stop.set()
+        thread = self._thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(1.0)
+
+    # --- BaseEffect ---
+
+    def _step_to_clock(self):
+        """ Відтворення (FrameClock): кроки синхронно за часом годинника, без потоку """
+        now = self.clock.time()
+        if self._frame is None:
+            self._clock_last, self._clock_acc = now, 0.0
+            self._step(self.TIMESTEP)
+        self._clock_acc += now - self._clock_last
+        self._clock_last = now
+        while self._clock_acc >= self.TIMESTEP:
+            self._step(self.TIMESTEP)
+            self._clock_acc -= self.TIMESTEP
+        self._publish()
+
+    def draw(self, p, w, h, phase):
+        if (w, h) != self.bounds:
+            self.bounds = (w, h)
+        self._last_render = time.perf_counter()
+        if getattr(self.clock, 'deterministic', False):
+            self._step_to_clock()
+        else:
+            self._ensure_running()
+        with self._lock:
+            frame = self._frame
+        if frame is not None:
+            self.render(p, w, h, frame, phase)
+
+    def on_suspend(self):
+        self.stop_simulation()
+
+    def on_resume(self):
+        # Потік стартує з наступним draw()
+        pass
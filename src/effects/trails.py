@@ -0,0 +1,85 @@
+from contextlib import contextmanager
+
+import numpy as np
+from PySide6.QtCore import Qt, QRectF
+from PySide6.QtGui import QImage, QPainter
+
+
+class TrailBuffer:
+    """ Власне накопичувальне полотно ефекту для слідів і післясвічення.
+
+    Замість fillRect(QColor(0, 0, 0, 20)) по спільній поверхні вікна (що
+    працює лише, доки вікно не очищується, і ламає фон та переходи) ефект
+    малює нове у буфер, а згасання й розмиття - один повноекранний прохід
+    NumPy по пікселях незалежно від кількості частинок. Буфер прозорий
+    (premultiplied ARGB), тож draw() накладає сліди на будь-який фон.
+
+    fade - частка яскравості, що втрачається за кадр; blur - кількість
+    проходів розмиття [1, 2, 1]; scale < 1 тримає буфер у меншій
+    роздільності (сліди й так м'які).
+    """
+    def __init__(self, fade=0.08, blur=0, scale=1.0):
+        self.fade = fade
+        self.blur = blur
+        self.scale = scale
+        self.image = None
+        self._acc = None
+
+    # --- Розмір і вміст ---
+
+    def _ensure(self, w, h):
+        bw, bh = max(1, int(w * self.scale)), max(1, int(h * self.scale))
+        if self.image is None or self.image.width() != bw or self.image.height() != bh:
+            self.image = QImage(bw, bh, QImage.Format_ARGB32_Premultiplied)
+            self.image.fill(Qt.transparent)
+            self._acc = None
+
+    def clear(self):
+        if self.image is not None:
+            self.image.fill(Qt.transparent)
+
+    def pixels(self):
+        """ (h, w, 4) uint8 view на пам'ять QImage (BGRA, premultiplied) """
+        img = self.image
+        buf = np.frombuffer(img.bits(), np.uint8, count=img.sizeInBytes())
+        return buf.reshape(img.height(), img.bytesPerLine() // 4, 4)[:, :img.width()]
+
+    # --- Кадр ---
+
+    def decay(self):
+        """ Згасання (і розмиття) накопиченого, виконується раз на кадр у paint().
+        Множення на keep/256 і зсув у uint16 - векторизовані проходи без
+        gather по таблиці; keep < 256 гарантує, що сліди згасають до нуля """
+        px = self.pixels()
+        keep = 256 if self.fade <= 0 else min(255, int(round((1.0 - self.fade) * 256)))
+        if self.blur:
+            acc = px.astype(np.uint16)
+            for _ in range(self.blur):
+                acc[1:-1] = (acc[:-2] + 2 * acc[1:-1] + acc[2:]) >> 2
+                acc[:, 1:-1] = (acc[:, :-2] + 2 * acc[:, 1:-1] + acc[:, 2:]) >> 2
+        else:
+            if self._acc is None or self._acc.shape != px.shape:
+                self._acc = np.empty(px.shape, np.uint16)
+            acc = self._acc
+            np.copyto(acc, px)
+        np.multiply(acc, keep, out=acc)
+        np.right_shift(acc, 8, out=acc)
+        np.copyto(px, acc, casting='unsafe')
+
+    @contextmanager
+    def paint(self, w, h):
+        """ with trail.paint(w, h) as tp: ... - згасання, потім малювання
+        нового в екранних координатах """
+        self._ensure(w, h)
+        self.decay()
+        tp = QPainter(self.image)
+        try:
+            tp.setRenderHint(QPainter.Antialiasing, True)
+            tp.scale(self.scale, self.scale)
+            yield tp
+        finally:
+            tp.end()
+
+    def draw(self, p, w, h):
+        if self.image is not None:
+            p.drawImage(QRectF(0, 0, w, h), self.image)
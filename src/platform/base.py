@@ -0,0 +1,80 @@
+import os
+import sys
+import time
+
+
+class NullPlatform:
+    """ Платформа без інтеграції з робочим столом (headless, Wayland, CI).
+
+    Усе, що залежить від ОС, - прив'язка до шпалер, глобальні гарячі
+    клавіші, блокування сесії, перекриття вікнами й час - іде через цей
+    інтерфейс; реалізації у src.platform.windows та src.platform.x11.
+    Методи повертають False, якщо можливість недоступна.
+    """
+    name = "null"
+
+    def attach_to_desktop(self, win_id):
+        """ Вбудувати вікно під іконки робочого столу """
+        return False
+
+    def register_hotkey(self, app, sequence, callback):
+        """ Глобальна гаряча клавіша, sequence у форматі "Ctrl+3" """
+        return False
+
+    def register_session_notifications(self, app, win_id, on_lock, on_unlock):
+        return False
+
+    def create_occlusion_service(self, **kwargs):
+        from src.utils.occlusion import NullOcclusionService
+        return NullOcclusionService(**kwargs)
+
+    def now_ns(self):
+        """ Монотонний час високої роздільності для вимірювань """
+        return time.perf_counter_ns()
+
+
+def parse_hotkey(sequence):
+    """ "Ctrl+Shift+F5" -> ({"ctrl", "shift"}, "F5") """
+    parts = [p.strip() for p in sequence.split("+") if p.strip()]
+    if not parts:
+        raise ValueError(f"Empty hotkey: {sequence!r}")
+    return {p.lower() for p in parts[:-1]}, parts[-1]
+
+
+def _detect():
+    if sys.platform == "win32":
+        return "windows"
+    if sys.platform.startswith("linux"):
+        if os.environ.get("DISPLAY"):
+            return "x11"
+        if os.environ.get("WAYLAND_DISPLAY"):
+            return "wayland"
+    return "null"
+
+
+def create_platform(name=None):
+    """ name: windows | x11 | wayland | null; за замовчуванням DW_PLATFORM або автовизначення """
+    name = name or os.environ.get("DW_PLATFORM") or _detect()
+    try:
+        if name == "windows":
+            from src.platform.windows import WindowsPlatform
+            return WindowsPlatform()
+        if name == "x11":
+            from src.platform.x11 import X11Platform
+            return X11Platform()
+    except Exception as e:
+        print(f"Platform backend {name} unavailable ({e}), running without desktop integration")
+    platform = NullPlatform()
+    if name == "wayland":
+        # Wayland не дає клієнтам ні вбудовування в стіл, ні глобальних клавіш
+        platform.name = "wayland"
+    return platform
+
+
+_platform = None
+
+def get_platform():
+    global _platform
+    if _platform is None:
+        _platform = create_platform()
+    return _platform
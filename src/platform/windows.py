@@ -0,0 +1,57 @@
+import ctypes
+
+from src.platform.base import NullPlatform, parse_hotkey
+from src.utils import win_utils
+
+MODIFIERS = {"alt": 0x0001, "ctrl": 0x0002, "control": 0x0002, "shift": 0x0004, "win": 0x0008}
+
+
+def virtual_key(key):
+    """ "3" -> 0x33, "F5" -> 0x74 """
+    if len(key) == 1 and key.isalnum():
+        return ord(key.upper())
+    if key[0] in "Ff" and key[1:].isdigit() and 1 <= int(key[1:]) <= 24:
+        return 0x70 + int(key[1:]) - 1
+    raise ValueError(f"Unsupported hotkey key: {key!r}")
+
+
+class WindowsPlatform(NullPlatform):
+    """ WorkerW, RegisterHotKey, WTS-сповіщення та WinEventHook-перекриття """
+    name = "windows"
+
+    def __init__(self):
+        self.user32 = ctypes.windll.user32
+        self._filters = []
+        self._next_hotkey_id = 1
+
+    def attach_to_desktop(self, win_id):
+        return win_utils.attach_to_workerw(int(win_id))
+
+    def register_hotkey(self, app, sequence, callback):
+        from src.utils.hotkeys import HotkeyFilter
+        mods, key = parse_hotkey(sequence)
+        mask = 0
+        for mod in mods:
+            mask |= MODIFIERS[mod]
+        hotkey_id = self._next_hotkey_id
+        if not self.user32.RegisterHotKey(None, hotkey_id, mask, virtual_key(key)):
+            return False
+        self._next_hotkey_id += 1
+        hotkey_filter = HotkeyFilter(callback, hotkey_id)
+        app.installNativeEventFilter(hotkey_filter)
+        self._filters.append(hotkey_filter)
+        return True
+
+    def register_session_notifications(self, app, win_id, on_lock, on_unlock):
+        from src.utils.session import SessionLockFilter
+        if not win_utils.register_session_notifications(int(win_id)):
+            return False
+        session_filter = SessionLockFilter(on_lock, on_unlock)
+        app.installNativeEventFilter(session_filter)
+        self._filters.append(session_filter)
+        return True
+
+    def create_occlusion_service(self, **kwargs):
+        # Сама обирає реалізацію й відкочується до NullOcclusionService
+        from src.utils.occlusion import create_occlusion_service
+        return create_occlusion_service(**kwargs)
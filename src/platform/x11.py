@@ -0,0 +1,89 @@
+from Xlib import X, XK, Xatom, display
+
+from src.platform.base import NullPlatform, parse_hotkey
+
+MODIFIERS = {"ctrl": X.ControlMask, "control": X.ControlMask, "shift": X.ShiftMask,
+             "alt": X.Mod1Mask, "win": X.Mod4Mask}
+# CapsLock/NumLock не повинні блокувати гарячу клавішу
+LOCK_MASKS = (0, X.LockMask, X.Mod2Mask, X.LockMask | X.Mod2Mask)
+
+
+class X11Platform(NullPlatform):
+    """ X11/EWMH: вікно типу DESKTOP під усіма, XGrabKey для гарячих клавіш """
+    name = "x11"
+    HOTKEY_POLL_MS = 50
+
+    def __init__(self):
+        self.display = display.Display()
+        self.root = self.display.screen().root
+        self._hotkeys = {}   # (keycode, mask) -> callback
+        self._timer = None
+        self._notifier = None
+
+    def _atom(self, name):
+        return self.display.intern_atom(name)
+
+    def attach_to_desktop(self, win_id):
+        win = self.display.create_resource_object("window", int(win_id))
+        win.change_property(self._atom("_NET_WM_WINDOW_TYPE"), Xatom.ATOM, 32,
+                            [self._atom("_NET_WM_WINDOW_TYPE_DESKTOP")])
+        win.change_property(self._atom("_NET_WM_STATE"), Xatom.ATOM, 32, [
+            self._atom(n) for n in ("_NET_WM_STATE_BELOW", "_NET_WM_STATE_STICKY",
+                                    "_NET_WM_STATE_SKIP_TASKBAR", "_NET_WM_STATE_SKIP_PAGER")
+        ])
+        win.configure(stack_mode=X.Below)
+        self.display.flush()
+        return True
+
+    def register_hotkey(self, app, sequence, callback):
+        mods, key = parse_hotkey(sequence)
+        mask = 0
+        for mod in mods:
+            mask |= MODIFIERS[mod]
+        keycode = self.display.keysym_to_keycode(XK.string_to_keysym(key))
+        if not keycode:
+            return False
+        for lock in LOCK_MASKS:
+            self.root.grab_key(keycode, mask | lock, True, X.GrabModeAsync, X.GrabModeAsync)
+        self.display.flush()
+        self._hotkeys[(keycode, mask)] = callback
+
+        if self._timer is None:
+            from PySide6.QtCore import QTimer
+            self._timer = QTimer(app)
+            self._timer.timeout.connect(self._pump)
+            self._timer.start(self.HOTKEY_POLL_MS)
+        return True
+
+    def on_suspend(self):
+        """ Без опитування кожні 50 мс: гарячі клавіші будить сокет X-з'єднання """
+        if self._timer is None:
+            return
+        self._timer.stop()
+        if self._notifier is None:
+            from PySide6.QtCore import QSocketNotifier
+            self._notifier = QSocketNotifier(self.display.fileno(), QSocketNotifier.Read, self._timer.parent())
+            self._notifier.activated.connect(self._pump)
+        self._notifier.setEnabled(True)
+        self._pump()
+
+    def on_resume(self):
+        if self._timer is None:
+            return
+        if self._notifier is not None:
+            self._notifier.setEnabled(False)
+        self._timer.start(self.HOTKEY_POLL_MS)
+
+    def _pump(self, *args):
+        while self.display.pending_events():
+            event = self.display.next_event()
+            if event.type != X.KeyPress:
+                continue
+            state = event.state & ~(X.LockMask | X.Mod2Mask)
+            if callback := self._hotkeys.get((event.detail, state)):
+                callback()
+
+    def create_occlusion_service(self, **kwargs):
+        # Сама обирає реалізацію й відкочується до NullOcclusionService
+        from src.utils.occlusion import create_occlusion_service
+        return create_occlusion_service(**kwargs)
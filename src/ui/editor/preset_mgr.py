@@ -2,6 +2,7 @@ import os
 import json
 import shutil
 from src.core.resources import get_resource_path, set_preset_root
+from src.core.bundles import BUNDLE_EXT, open_bundle
 
 class PresetManager:
     def __init__(self):
@@ -18,6 +19,8 @@ class PresetManager:
                 items.append({"name": f[:-5], "type": "json", "path": full_path})
             elif os.path.isdir(full_path) and os.path.exists(os.path.join(full_path, "preset.json")):
                 items.append({"name": f, "type": "bundle", "path": full_path})
+            elif f.endswith(BUNDLE_EXT):
+                items.append({"name": f[:-len(BUNDLE_EXT)], "type": "bundle", "path": full_path})
         return sorted(items, key=lambda x: x["name"])
 
     def load_preset(self, name):
@@ -34,14 +37,18 @@ class PresetManager:
         elif os.path.isdir(bundle_path) and os.path.exists(os.path.join(bundle_path, "preset.json")):
             target = bundle_path
             is_bundle = True
+        elif os.path.isfile(bundle_path + BUNDLE_EXT):
+            target = bundle_path + BUNDLE_EXT
+            is_bundle = True
             
         if not target: return None
 
-        config_file = os.path.join(target, "preset.json") if is_bundle else target
-        
         try:
-            with open(config_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            if is_bundle:
+                data = open_bundle(target).read_config()
+            else:
+                with open(target, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
             return data, target, is_bundle
         except Exception as e:
             print(f"Error loading {name}: {e}")
@@ -21,6 +21,8 @@ class SettingsWindow(QDialog):
         self.setWindowTitle("Wallpaper Settings")
         self.resize(400, 600)
         self.setStyleSheet(DARK_THEME)
+        self._fps = None
+        self._audio_latency = None
         
         self.layout = QVBoxLayout(self)
         self.tabs = QTabWidget()
@@ -58,7 +60,18 @@ class SettingsWindow(QDialog):
     def update_fps(self, fps):
         # We can update the label in general tab if we want to show real-time FPS
         # For now, just ignoring or maybe updating title?
-        self.setWindowTitle(f"Settings (FPS: {fps})")
+        self._fps = fps
+        self._update_title()
+
+    def update_audio_latency(self, ms):
+        self._audio_latency = ms
+        self._update_title()
+
+    def _update_title(self):
+        title = f"Settings (FPS: {self._fps}"
+        if self._audio_latency is not None:
+            title += f", audio: {self._audio_latency:.0f} ms"
+        self.setWindowTitle(title + ")")
 
     def set_widgets_list(self, widgets_data):
         self.widgets_tab.set_widgets_list(widgets_data)
@@ -1,16 +1,18 @@
 import ctypes
+import ctypes.wintypes
 from PySide6.QtCore import QAbstractNativeEventFilter
 
 class HotkeyFilter(QAbstractNativeEventFilter):
-    def __init__(self, callback):
+    def __init__(self, callback, hotkey_id=1):
         super().__init__()
         self.callback = callback
+        self.hotkey_id = hotkey_id
         
     def nativeEventFilter(self, eventType, message):
         if eventType == b"windows_generic_MSG":
             msg = ctypes.wintypes.MSG.from_address(int(message))
             if msg.message == 0x0312: # WM_HOTKEY
-                if msg.wParam == 1: # Our Hotkey ID
+                if msg.wParam == self.hotkey_id:
                     self.callback()
                     return False, 0
         return False, 0
@@ -0,0 +1,303 @@
+import sys
+from collections import namedtuple
+
+# Прямокутники - кортежі (left, top, right, bottom)
+WindowInfo = namedtuple(
+    "WindowInfo",
+    ["wid", "cls", "visible", "minimized", "cloaked", "maximized", "bounds", "monitor"],
+)
+
+IGNORED_CLASSES = ("Progman", "WorkerW")
+
+
+def rects_match(r1, r2, tolerance):
+    return all(abs(a - b) <= tolerance for a, b in zip(r1, r2))
+
+
+def window_covers(info, rc_mon, target_rect, tolerance=4):
+    """ Чиста логіка: чи закриває вікно наш монітор (без системних викликів) """
+    if info is None or info.cls in IGNORED_CLASSES:
+        return False
+    if not info.visible or info.minimized or info.cloaked:
+        return False
+    if not rects_match(info.monitor, rc_mon, 100):
+        return False
+    return info.maximized or rects_match(info.bounds, target_rect, tolerance)
+
+
+class OcclusionService:
+    """ Кешує для кожного вікна, чи закриває воно робочий стіл.
+
+    Перераховуються лише вікна, позначені «брудними» подіями (або повне
+    сканування, коли подій немає). Підкласи реалізують _list_windows,
+    _describe та _monitor_rects.
+    """
+    def __init__(self, use_work_area=True, tolerance=4):
+        self.use_work_area = use_work_area
+        self.tolerance = tolerance
+        self.win_id = 0
+        self._covering = {}
+        self._dirty = set()
+        self._needs_rescan = True
+        self._rc_mon = None
+        self._target = None
+
+    def start(self, win_id):
+        self.win_id = int(win_id)
+        self._needs_rescan = True
+
+    def stop(self):
+        pass
+
+    def mark_dirty(self, wid):
+        self._dirty.add(wid)
+
+    def forget(self, wid):
+        self._covering.pop(wid, None)
+        self._dirty.discard(wid)
+
+    def request_rescan(self):
+        self._needs_rescan = True
+
+    def is_occluded(self) -> bool:
+        self._pump()
+        if self._needs_rescan:
+            self._rescan()
+        elif self._dirty:
+            for wid in self._dirty:
+                self._covering[wid] = self._evaluate(wid)
+            self._dirty.clear()
+        return any(self._covering.values())
+
+    def _rescan(self):
+        self._needs_rescan = False
+        self._dirty.clear()
+        self._rc_mon, rc_work = self._monitor_rects()
+        self._target = rc_work if self.use_work_area else self._rc_mon
+        self._covering = {wid: self._evaluate(wid) for wid in self._list_windows()}
+
+    def _evaluate(self, wid):
+        if self._rc_mon is None:
+            return False
+        try:
+            info = self._describe(wid)
+        except Exception:
+            return False
+        return window_covers(info, self._rc_mon, self._target, self.tolerance)
+
+    def _pump(self):
+        """ Обробка подій платформи (для бекендів без власного циклу) """
+        pass
+
+    def _list_windows(self):
+        raise NotImplementedError
+
+    def _describe(self, wid):
+        raise NotImplementedError
+
+    def _monitor_rects(self):
+        raise NotImplementedError
+
+
+class NullOcclusionService(OcclusionService):
+    """ Платформи без підтримки: робочий стіл вважається завжди видимим """
+    def is_occluded(self) -> bool:
+        return False
+
+
+class StaticOcclusionService(OcclusionService):
+    """ Вікна задаються вручну - для тестів логіки поза Windows """
+    def __init__(self, monitor, work_area=None, windows=None, **kwargs):
+        super().__init__(**kwargs)
+        self.monitor = monitor
+        self.work_area = work_area or monitor
+        self.windows = dict(windows or {})
+
+    def set_window(self, info):
+        self.windows[info.wid] = info
+        self.mark_dirty(info.wid)
+
+    def remove_window(self, wid):
+        self.windows.pop(wid, None)
+        self.forget(wid)
+
+    def _list_windows(self):
+        return list(self.windows)
+
+    def _describe(self, wid):
+        return self.windows.get(wid)
+
+    def _monitor_rects(self):
+        return self.monitor, self.work_area
+
+
+class WinOcclusionService(OcclusionService):
+    """ Windows: SetWinEventHook позначає змінені вікна; без хуків - дешеве опитування """
+    EVENT_RANGES = (
+        (0x0003, 0x0003),  # EVENT_SYSTEM_FOREGROUND
+        (0x000B, 0x000B),  # EVENT_SYSTEM_MOVESIZEEND
+        (0x0016, 0x0017),  # EVENT_SYSTEM_MINIMIZESTART/END
+        (0x8000, 0x8003),  # EVENT_OBJECT_CREATE/DESTROY/SHOW/HIDE
+        (0x800B, 0x800B),  # EVENT_OBJECT_LOCATIONCHANGE
+        (0x8017, 0x8018),  # EVENT_OBJECT_CLOAKED/UNCLOAKED
+    )
+    EVENT_OBJECT_DESTROY = 0x8001
+    WINEVENT_OUTOFCONTEXT = 0x0000
+    WINEVENT_SKIPOWNPROCESS = 0x0002
+    # Fallback: foreground window every check, full rescan every N checks
+    POLL_RESCAN_EVERY = 10
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        from src.utils import win_utils
+        self.win = win_utils
+        self._hooks = []
+        self._hook_proc = None
+        self._poll_count = 0
+
+    def start(self, win_id):
+        super().start(win_id)
+        self._install_hooks()
+
+    def stop(self):
+        for hook in self._hooks:
+            self.win.user32.UnhookWinEvent(hook)
+        self._hooks = []
+
+    def _install_hooks(self):
+        import ctypes
+        from ctypes import wintypes
+
+        WinEventProc = ctypes.WINFUNCTYPE(
+            None, wintypes.HANDLE, wintypes.DWORD, wintypes.HWND,
+            wintypes.LONG, wintypes.LONG, wintypes.DWORD, wintypes.DWORD,
+        )
+
+        def on_event(hook, event, hwnd, id_object, id_child, thread, ms):
+            # Лише самі вікна (OBJID_WINDOW, CHILDID_SELF) верхнього рівня
+            if not hwnd or id_object != 0 or id_child != 0:
+                return
+            hwnd = int(hwnd)
+            if event == self.EVENT_OBJECT_DESTROY:
+                self.forget(hwnd)
+            elif self.win.is_top_level(hwnd):
+                self.mark_dirty(hwnd)
+
+        self._hook_proc = WinEventProc(on_event)
+        flags = self.WINEVENT_OUTOFCONTEXT | self.WINEVENT_SKIPOWNPROCESS
+        for ev_min, ev_max in self.EVENT_RANGES:
+            hook = self.win.user32.SetWinEventHook(ev_min, ev_max, 0, self._hook_proc, 0, 0, flags)
+            if hook:
+                self._hooks.append(hook)
+        if not self._hooks:
+            print("WinEventHook unavailable, falling back to occlusion polling")
+
+    def _pump(self):
+        if self._hooks:
+            return
+        self._poll_count += 1
+        if self._poll_count % self.POLL_RESCAN_EVERY == 0:
+            self._needs_rescan = True
+        else:
+            fg = self.win.user32.GetForegroundWindow()
+            if fg:
+                self.mark_dirty(int(fg))
+            # Вікна, що закривали стіл, теж перевіряємо - вони могли зникнути
+            self._dirty.update(wid for wid, cov in self._covering.items() if cov)
+
+    def _list_windows(self):
+        return self.win.list_top_level_windows()
+
+    def _describe(self, wid):
+        return self.win.describe_window(wid)
+
+    def _monitor_rects(self):
+        rc_mon, rc_work = self.win.get_monitor_rects(self.win_id)
+        return self.win.rect_tuple(rc_mon), self.win.rect_tuple(rc_work)
+
+
+class X11OcclusionService(OcclusionService):
+    """ X11 (EWMH): перераховує вікна лише після PropertyNotify/ConfigureNotify """
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        from Xlib import X, display
+        self.X = X
+        self.display = display.Display()
+        self.root = self.display.screen().root
+        self._atoms = {name: self.display.intern_atom(name) for name in (
+            "_NET_CLIENT_LIST", "_NET_ACTIVE_WINDOW", "_NET_WM_STATE", "_NET_WORKAREA",
+            "_NET_WM_STATE_HIDDEN", "_NET_WM_STATE_MAXIMIZED_VERT",
+            "_NET_WM_STATE_MAXIMIZED_HORZ", "_NET_WM_STATE_FULLSCREEN",
+        )}
+        self._watched = set()
+
+    def start(self, win_id):
+        super().start(win_id)
+        self.root.change_attributes(event_mask=self.X.PropertyChangeMask)
+        self.display.flush()
+
+    def _pump(self):
+        X = self.X
+        while self.display.pending_events():
+            ev = self.display.next_event()
+            if ev.type == X.PropertyNotify and ev.window == self.root:
+                if ev.atom in (self._atoms["_NET_CLIENT_LIST"], self._atoms["_NET_WORKAREA"]):
+                    self._needs_rescan = True
+            elif ev.type in (X.PropertyNotify, X.ConfigureNotify, X.MapNotify, X.UnmapNotify):
+                self.mark_dirty(ev.window.id)
+            elif ev.type == X.DestroyNotify:
+                self.forget(ev.window.id)
+
+    def _list_windows(self):
+        prop = self.root.get_full_property(self._atoms["_NET_CLIENT_LIST"], self.X.AnyPropertyType)
+        wids = list(prop.value) if prop else []
+        mask = self.X.StructureNotifyMask | self.X.PropertyChangeMask
+        for wid in wids:
+            if wid not in self._watched and wid != self.win_id:
+                self.display.create_resource_object('window', wid).change_attributes(event_mask=mask)
+                self._watched.add(wid)
+        self._watched.intersection_update(wids)
+        return [wid for wid in wids if wid != self.win_id]
+
+    def _describe(self, wid):
+        win = self.display.create_resource_object('window', wid)
+        attrs = win.get_attributes()
+        prop = win.get_full_property(self._atoms["_NET_WM_STATE"], self.X.AnyPropertyType)
+        state = set(prop.value) if prop else set()
+        geo = win.get_geometry()
+        pos = win.translate_coords(self.root, 0, 0)
+        left, top = -pos.x, -pos.y
+        maximized = (
+            self._atoms["_NET_WM_STATE_FULLSCREEN"] in state
+            or {self._atoms["_NET_WM_STATE_MAXIMIZED_VERT"],
+                self._atoms["_NET_WM_STATE_MAXIMIZED_HORZ"]} <= state
+        )
+        return WindowInfo(
+            wid=wid, cls=None,
+            visible=attrs.map_state == self.X.IsViewable,
+            minimized=self._atoms["_NET_WM_STATE_HIDDEN"] in state,
+            cloaked=False, maximized=maximized,
+            bounds=(left, top, left + geo.width, top + geo.height),
+            monitor=self._rc_mon,
+        )
+
+    def _monitor_rects(self):
+        geo = self.root.get_geometry()
+        rc_mon = (0, 0, geo.width, geo.height)
+        prop = self.root.get_full_property(self._atoms["_NET_WORKAREA"], self.X.AnyPropertyType)
+        if prop and len(prop.value) >= 4:
+            x, y, w, h = prop.value[:4]
+            return rc_mon, (x, y, x + w, y + h)
+        return rc_mon, rc_mon
+
+
+def create_occlusion_service(**kwargs):
+    """ Обирає реалізацію для поточної платформи, інакше NullOcclusionService """
+    try:
+        if sys.platform == "win32":
+            return WinOcclusionService(**kwargs)
+        if sys.platform.startswith("linux"):
+            return X11OcclusionService(**kwargs)
+    except Exception as e:
+        print(f"Occlusion service unavailable ({e}), desktop treated as always visible")
+    return NullOcclusionService(**kwargs)
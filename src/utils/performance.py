@@ -1,6 +1,7 @@
-import ctypes
+import time
 from PySide6.QtCore import QObject, QTimer, Signal
-from src.utils.win_utils import is_occluded
+from PySide6.QtGui import QGuiApplication
+from src.platform.base import get_platform
 
 class VisibilityChecker(QObject):
     def __init__(self, check_interval=800):
@@ -12,16 +13,45 @@ class VisibilityChecker(QObject):
         self.on_visible = None
         self.on_occluded = None
         self.is_paused = False
+        self.service = get_platform().create_occlusion_service(use_work_area=True, tolerance=4)
+        self._watched_screens = set()
+        self._screens_hooked = False
 
     def start(self, win_id, on_visible, on_occluded):
         self.win_id = int(win_id)
+        self.service.start(self.win_id)
         self.on_visible = on_visible
         self.on_occluded = on_occluded
+        self._watch_screens()
         self.timer.start(self.interval)
 
+    def _watch_screens(self):
+        """ Зміна роздільності, DPI, панелі задач чи набору моніторів -
+        кешовані прямокутники монітора й робочої області застаріли """
+        app = QGuiApplication.instance()
+        if app is None:
+            return
+        if not self._screens_hooked:
+            app.screenAdded.connect(self._on_screens_changed)
+            app.screenRemoved.connect(self._on_screens_changed)
+            self._screens_hooked = True
+        for screen in app.screens():
+            if screen not in self._watched_screens:
+                screen.geometryChanged.connect(self._request_rescan)
+                screen.availableGeometryChanged.connect(self._request_rescan)
+                self._watched_screens.add(screen)
+
+    def _on_screens_changed(self, screen):
+        self._watched_screens.discard(screen)
+        self._watch_screens()
+        self._request_rescan()
+
+    def _request_rescan(self, *args):
+        self.service.request_rescan()
+
     def _check(self):
         if not self.win_id: return
-        occluded = is_occluded(self.win_id, use_work_area=True, tolerance=4)
+        occluded = self.service.is_occluded()
         if occluded and not self.is_paused:
             print("Desktop occluded: pause animation")
             if self.on_occluded: self.on_occluded()
@@ -31,21 +61,48 @@ class VisibilityChecker(QObject):
             if self.on_visible: self.on_visible()
             self.is_paused = False
 
+    def stop(self):
+        self.timer.stop()
+        self.service.stop()
+
 class FPSCounter:
     def __init__(self):
         self.frame_count = 0
-        self.last_print_ms = 0
+        self.last_print_ns = 0
     
     def tick(self) -> int:
         """Returns fps if second elapsed, else -1"""
         self.frame_count += 1
-        now_ms = ctypes.windll.kernel32.GetTickCount64()
-        if self.last_print_ms == 0:
-            self.last_print_ms = now_ms
+        now_ns = time.perf_counter_ns()
+        if self.last_print_ns == 0:
+            self.last_print_ns = now_ns
             return -1
-        elif now_ms - self.last_print_ms >= 1000:
-            fps = self.frame_count
+        elif now_ns - self.last_print_ns >= 1_000_000_000:
+            # Кадри за фактичний проміжок, а не за номінальну секунду
+            fps = round(self.frame_count * 1e9 / (now_ns - self.last_print_ns))
             self.frame_count = 0
-            self.last_print_ms = now_ms
+            self.last_print_ns = now_ns
             return fps
         return -1
+
+class LatencyMeter:
+    """ Згладжена затримка (мс) з піком за вікно звіту """
+    def __init__(self, smoothing=0.1):
+        self.smoothing = smoothing
+        self.avg_ms = None
+        self.peak_ms = 0.0
+
+    def add(self, ms: float):
+        if self.avg_ms is None:
+            self.avg_ms = ms
+        else:
+            self.avg_ms += (ms - self.avg_ms) * self.smoothing
+        self.peak_ms = max(self.peak_ms, ms)
+
+    def report(self):
+        """Returns (avg_ms, peak_ms) and resets the peak, or None if no samples"""
+        if self.avg_ms is None:
+            return None
+        result = (self.avg_ms, self.peak_ms)
+        self.peak_ms = 0.0
+        return result
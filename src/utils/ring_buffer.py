@@ -0,0 +1,128 @@
+import time
+import numpy as np
+
+
+class TimedRingBuffer:
+    """ Попередньо виділений кільцевий буфер значень з часовими мітками.
+
+    Розрахований на одного писача (потік захоплення) та читачів з GUI-потоку:
+    запис не виділяє пам'ять і не будить GUI сигналами, читач сам бере
+    найближчий до свого часу кадру зразок.
+    """
+    def __init__(self, width, capacity=64):
+        self.width = width
+        self.capacity = capacity
+        self._times = np.full(capacity, -np.inf)
+        self._data = np.zeros((capacity, width), dtype=np.float32)
+        self._count = 0
+
+    @property
+    def count(self):
+        """ Загальна кількість записів (монотонно зростає) """
+        return self._count
+
+    def write(self, values, timestamp=None):
+        idx = self._count % self.capacity
+        self._data[idx, :] = values
+        # Мітка пишеться після даних, лічильник - останнім
+        self._times[idx] = time.perf_counter() if timestamp is None else timestamp
+        self._count += 1
+
+    def latest(self):
+        """ Повертає (timestamp, values) останнього запису або (None, None) """
+        count = self._count
+        if count == 0:
+            return None, None
+        idx = (count - 1) % self.capacity
+        return float(self._times[idx]), self._data[idx].copy()
+
+    def sample_at(self, t):
+        """ Повертає (timestamp, values) запису, найближчого до часу t """
+        count = self._count
+        if count == 0:
+            return None, None
+        times = self._times
+        if count >= self.capacity:
+            # Слот, у який зараз може писати потік захоплення, пропускаємо
+            times = times.copy()
+            times[count % self.capacity] = -np.inf
+        idx = int(np.argmin(np.abs(times - t)))
+        return float(self._times[idx]), self._data[idx].copy()
+
+    def clear(self):
+        self._times[:] = -np.inf
+        self._count = 0
+
+    def __len__(self):
+        return min(self._count, self.capacity)
+
+
+class RingBuffer:
+    """ Історія фіксованої довжини на NumPy: O(1) push без виділення пам'яті """
+    def __init__(self, capacity, width=None, dtype=np.float64):
+        shape = (capacity,) if width is None else (capacity, width)
+        self.capacity = capacity
+        self.width = width
+        self._data = np.zeros(shape, dtype=dtype)
+        self._count = 0
+
+    @property
+    def count(self):
+        return self._count
+
+    def push(self, value):
+        self._data[self._count % self.capacity] = value
+        self._count += 1
+
+    def values(self, n=None):
+        """ Останні n значень (або всі) у хронологічному порядку, копія """
+        size = len(self)
+        n = size if n is None else min(n, size)
+        if n == 0:
+            return self._data[:0].copy()
+        end = self._count % self.capacity
+        start = (end - n) % self.capacity
+        if start < end:
+            return self._data[start:end].copy()
+        return np.concatenate((self._data[start:], self._data[:end]))
+
+    def last(self, default=0.0):
+        if self._count == 0:
+            return default
+        return self._data[(self._count - 1) % self.capacity]
+
+    def clear(self):
+        self._count = 0
+
+    def __len__(self):
+        return min(self._count, self.capacity)
+
+    def resize(self, capacity):
+        """ Змінює ємність, зберігаючи останні значення """
+        if capacity == self.capacity:
+            return
+        kept = self.values(capacity)
+        shape = (capacity,) if self.width is None else (capacity, self.width)
+        self._data = np.zeros(shape, dtype=self._data.dtype)
+        self._data[:len(kept)] = kept
+        self.capacity = capacity
+        self._count = len(kept)
+
+    def window_stats(self, n=None):
+        """ (min, max, mean) останніх n значень; нулі, якщо порожньо """
+        vals = self.values(n)
+        if len(vals) == 0:
+            return 0.0, 0.0, 0.0
+        return float(vals.min()), float(vals.max()), float(vals.mean())
+
+    def decimate(self, points, n=None):
+        return decimate_max(self.values(n), points)
+
+
+def decimate_max(vals, points):
+    """ Стискає масив до points відліків (максимум у кожному кошику),
+    щоб піки не губились при виводі годин історії у кількасот пікселів """
+    if len(vals) <= points or points <= 0:
+        return vals
+    edges = np.linspace(0, len(vals), points + 1).astype(int)
+    return np.maximum.reduceat(vals, edges[:-1])
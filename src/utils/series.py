@@ -0,0 +1,43 @@
+import numpy as np
+from PySide6.QtCore import QPointF
+from PySide6.QtGui import QPolygonF
+
+from src.utils.ring_buffer import decimate_max
+
+
+class SeriesPlot:
+    """ Кешовані полігони графіка для RingBuffer.
+
+    Полігон перебудовується лише коли в буфері з'явились нові дані або
+    змінилась геометрія/масштаб; між зразками кадри малюють готовий QPolygonF.
+    """
+    def __init__(self, buffer):
+        self.buffer = buffer
+        self._key = None
+        self._line = QPolygonF()
+        self._fill = QPolygonF()
+
+    def polygons(self, x, y, w, h, max_val, window=None, top_pad=20):
+        """ Повертає (line, fill) для останніх window значень у прямокутнику x, y, w, h """
+        key = (self.buffer.count, x, y, w, h, max_val, window, top_pad)
+        if key != self._key:
+            self._key = key
+            self._rebuild(x, y, w, h, max_val, window, top_pad)
+        return self._line, self._fill
+
+    def _rebuild(self, x, y, w, h, max_val, window, top_pad):
+        n = window or self.buffer.capacity
+        vals = self.buffer.values(n)
+        if len(vals) < n:
+            # Ще не накопичено вікно: притискаємо дані до правого краю
+            vals = np.concatenate((np.zeros(n - len(vals)), vals))
+        vals = decimate_max(vals, max(2, int(w)))
+        if len(vals) < 2:
+            self._line, self._fill = QPolygonF(), QPolygonF()
+            return
+        norm = np.clip(vals / max(1.0, max_val), 0.0, 1.0)
+        xs = x + np.arange(len(vals)) * (w / (len(vals) - 1))
+        ys = y + h - norm * (h - top_pad)
+        points = [QPointF(px, py) for px, py in zip(xs.tolist(), ys.tolist())]
+        self._line = QPolygonF(points)
+        self._fill = QPolygonF(points + [QPointF(x + w, y + h), QPointF(x, y + h)])
@@ -0,0 +1,24 @@
+import ctypes
+import ctypes.wintypes
+from PySide6.QtCore import QAbstractNativeEventFilter
+
+WM_WTSSESSION_CHANGE = 0x02B1
+WTS_SESSION_LOCK = 0x7
+WTS_SESSION_UNLOCK = 0x8
+
+class SessionLockFilter(QAbstractNativeEventFilter):
+    """ Ловить блокування/розблокування сесії Windows """
+    def __init__(self, on_lock, on_unlock):
+        super().__init__()
+        self.on_lock = on_lock
+        self.on_unlock = on_unlock
+
+    def nativeEventFilter(self, eventType, message):
+        if eventType == b"windows_generic_MSG":
+            msg = ctypes.wintypes.MSG.from_address(int(message))
+            if msg.message == WM_WTSSESSION_CHANGE:
+                if msg.wParam == WTS_SESSION_LOCK:
+                    self.on_lock()
+                elif msg.wParam == WTS_SESSION_UNLOCK:
+                    self.on_unlock()
+        return False, 0
@@ -1,9 +1,14 @@
 import ctypes
+import sys
 from ctypes import wintypes
 from typing import Optional
 
-user32 = ctypes.windll.user32
-dwmapi = ctypes.windll.dwmapi
+# Імпорт не падає на інших ОС; викликати функції можна лише на Windows
+if sys.platform == "win32":
+    user32 = ctypes.windll.user32
+    dwmapi = ctypes.windll.dwmapi
+else:
+    user32 = dwmapi = None
 
 DWMWA_EXTENDED_FRAME_BOUNDS = 9
 DWMWA_CLOAKED = 14
@@ -84,46 +89,73 @@ def attach_to_workerw(qt_hwnd: int) -> bool:
     return bool(res)
 
 
+GA_ROOT = 2
+
+
+def rect_tuple(rect: wintypes.RECT) -> tuple[int, int, int, int]:
+    return rect.left, rect.top, rect.right, rect.bottom
+
+
+def is_top_level(hwnd: int) -> bool:
+    return user32.GetAncestor(ctypes.c_void_p(hwnd), GA_ROOT) == hwnd
+
+
+def list_top_level_windows() -> list[int]:
+    hwnds = []
+    EnumProc = ctypes.WINFUNCTYPE(ctypes.c_bool, ctypes.c_void_p, ctypes.c_void_p)
+
+    def enum_proc(hwnd, lparam):
+        hwnds.append(int(hwnd))
+        return True
+
+    user32.EnumWindows(EnumProc(enum_proc), 0)
+    return hwnds
+
+
+def describe_window(hwnd: int):
+    """Collect everything the occlusion logic needs about one window."""
+    from src.utils.occlusion import WindowInfo
+
+    cls_buf = ctypes.create_unicode_buffer(256)
+    user32.GetClassNameW(ctypes.c_void_p(hwnd), cls_buf, 256)
+    visible = bool(user32.IsWindowVisible(ctypes.c_void_p(hwnd)))
+    minimized = bool(user32.IsIconic(ctypes.c_void_p(hwnd)))
+    if cls_buf.value in ("Progman", "WorkerW") or not visible or minimized:
+        # Not a candidate, skip the DWM/monitor calls
+        return WindowInfo(hwnd, cls_buf.value, visible, minimized, False, False, (0, 0, 0, 0), (0, 0, 0, 0))
+    rc_wmon, _ = get_monitor_rects(hwnd)
+    return WindowInfo(
+        wid=hwnd,
+        cls=cls_buf.value,
+        visible=visible,
+        minimized=minimized,
+        cloaked=is_window_cloaked(hwnd),
+        maximized=bool(user32.IsZoomed(ctypes.c_void_p(hwnd))),
+        bounds=rect_tuple(get_window_bounds(hwnd)),
+        monitor=rect_tuple(rc_wmon),
+    )
+
+
 def is_occluded(my_hwnd: int, use_work_area: bool = True, tolerance: int = 4) -> bool:
-    occluded = False
+    """One-shot full scan. Prefer OcclusionService, which caches per window."""
+    from src.utils.occlusion import window_covers
+
     rc_mon, rc_work = get_monitor_rects(my_hwnd)
+    rc_mon, rc_work = rect_tuple(rc_mon), rect_tuple(rc_work)
     target_rect = rc_work if use_work_area else rc_mon
+    return any(
+        window_covers(describe_window(hwnd), rc_mon, target_rect, tolerance)
+        for hwnd in list_top_level_windows()
+    )
 
-    def covers(r1: wintypes.RECT, r2: wintypes.RECT, t: int = tolerance) -> bool:
-        return (
-            abs(r1.left - r2.left) <= t
-            and abs(r1.top - r2.top) <= t
-            and abs(r1.right - r2.right) <= t
-            and abs(r1.bottom - r2.bottom) <= t
-        )
 
-    def enum_proc(hwnd, lparam):
-        nonlocal occluded
-
-        cls_buf = ctypes.create_unicode_buffer(256)
-        user32.GetClassNameW(ctypes.c_void_p(hwnd), cls_buf, 256)
-        cls = cls_buf.value
-        if cls in ("Progman", "WorkerW"):
-            return True
-
-        if (
-            not user32.IsWindowVisible(ctypes.c_void_p(hwnd))
-            or user32.IsIconic(ctypes.c_void_p(hwnd))
-            or is_window_cloaked(hwnd)
-        ):
-            return True
-
-        rc_wmon, _ = get_monitor_rects(hwnd)
-        if not covers(rc_wmon, rc_mon, 100):
-            return True
-
-        wb = get_window_bounds(hwnd)
-        if covers(wb, target_rect) or bool(user32.IsZoomed(ctypes.c_void_p(hwnd))):
-            occluded = True
-            return False
+NOTIFY_FOR_THIS_SESSION = 0
 
-        return True
 
-    EnumProc = ctypes.WINFUNCTYPE(ctypes.c_bool, ctypes.c_void_p, ctypes.c_void_p)
-    user32.EnumWindows(EnumProc(enum_proc), 0)
-    return occluded
\ No newline at end of file
+def register_session_notifications(hwnd: int) -> bool:
+    """Subscribe the window to WM_WTSSESSION_CHANGE (lock/unlock) messages."""
+    try:
+        wtsapi32 = ctypes.windll.wtsapi32
+        return bool(wtsapi32.WTSRegisterSessionNotification(ctypes.c_void_p(hwnd), NOTIFY_FOR_THIS_SESSION))
+    except Exception:
+        return False
@@ -3,7 +3,7 @@ import sys
 import time
 import importlib.util
 import inspect
-from PySide6.QtCore import Qt, QDateTime
+from PySide6.QtCore import Qt, QDateTime, QRect
 from PySide6.QtGui import QPainter, QColor, QFont
 
 from src.core.resources import get_resource_path
@@ -16,11 +16,44 @@ for d in [root_dir, widgets_dir]:
         sys.path.append(d)
 
 class BaseWidget:
+    # Як часто перемальовувати шар: "frame" (кожен кадр), "interval"
+    # (config['update_interval'] мс) або "data" (після mark_dirty())
+    REFRESH = "frame"
+    # Запас навколо size_hint для тіней/світіння
+    LAYER_MARGIN = 4
+
     def __init__(self, config=None):
         self.config = config or {}
         self.x = self.config.get('x', 30)
         self.y = self.config.get('y', 30)
         self.anchor = self.config.get('anchor', 'top-left')
+        self._dirty = True
+
+    @classmethod
+    def get_schema(cls):
+        """ Опис полів конфігурації (формат як у BaseEffect.get_schema) """
+        return {}
+
+    def size_hint(self, w, h):
+        """ (tw, th) області віджета або None, якщо розмір невідомий """
+        return None
+
+    def get_bounds(self, w, h):
+        """ Прямокутник шару у вікні (з запасом) або None """
+        size = self.size_hint(w, h)
+        if size is None:
+            return None
+        tw, th = int(size[0]), int(size[1])
+        px, py = self.get_pos(w, h, tw, th)
+        m = self.LAYER_MARGIN
+        return QRect(int(px) - m, int(py) - m, tw + 2 * m, th + 2 * m)
+
+    def mark_dirty(self):
+        self._dirty = True
+
+    def consume_dirty(self):
+        dirty, self._dirty = self._dirty, False
+        return dirty
 
     def get_pos(self, w, h, tw, th):
         px, py = self.x, self.y
@@ -43,6 +76,13 @@ class BaseWidget:
         """ Очищення ресурсів перед видаленням віджета """
         pass
 
+    def on_suspend(self):
+        """ Шпалери приховані: зупинити потоки захоплення/завантаження """
+        pass
+
+    def on_resume(self):
+        pass
+
 class PluginWidgetWrapper:
     """ Обертка для динамічного завантаження віджетів """
     def __init__(self, file_path, class_name, config=None):
@@ -72,7 +112,13 @@ class PluginWidgetWrapper:
                 spec.loader.exec_module(module)
                 
                 cls = getattr(module, self.class_name)
-                self.instance = cls(self.config)
+                previous, self.instance = self.instance, cls(self.config)
+                if previous is not None:
+                    # Звільнити підписки/потоки старого екземпляра (MetricsSubscription тощо)
+                    try:
+                        previous.cleanup()
+                    except Exception as e:
+                        print(f"Error cleaning up widget {self.class_name}: {e}")
                 self.last_mtime = mtime
                 print(f"Widget {self.class_name} reloaded")
         except Exception as e:
@@ -110,67 +156,88 @@ class PluginWidgetWrapper:
         self.config['anchor'] = value
         if self.instance: self.instance.anchor = value
 
+    def refresh_mode(self):
+        if 'refresh' in self.config:
+            return self.config['refresh']
+        if self.config.get('update_interval', 0) > 0:
+            return "interval"
+        return getattr(self.instance, 'REFRESH', "frame")
+
+    def get_bounds(self, w, h):
+        self._reload_if_needed()
+        if not self.instance or not hasattr(self.instance, 'get_bounds'):
+            return None
+        try:
+            return self.instance.get_bounds(w, h)
+        except Exception as e:
+            print(f"Error measuring widget {self.class_name}: {e}")
+            return None
+
+    def needs_refresh(self, since_last):
+        """ since_last - секунди від останнього рендеру шару """
+        mode = self.refresh_mode()
+        if mode == "data":
+            return self.instance.consume_dirty() if self.instance else False
+        if mode == "interval":
+            return since_last * 1000 >= self.config.get('update_interval', 1000)
+        return True
+
+    def render_layer(self, p, w, h, phase):
+        if not self.instance: return
+        try:
+            self.instance.draw(p, w, h, phase)
+        except Exception as e:
+            print(f"Error caching widget {self.class_name}: {e}")
+
     def draw(self, p, w, h, phase):
         self._reload_if_needed()
         if not self.instance: return
+        try:
+            self.instance.draw(p, w, h, phase)
+        except Exception as e:
+            print(f"Error drawing widget {self.class_name}: {e}")
 
-        # Check update interval (ms)
-        interval = self.config.get('update_interval', 0)
-        
-        if interval <= 0:
-            # Draw directly if caching disabled (dynamic widgets)
+    def on_suspend(self):
+        if self.instance and hasattr(self.instance, 'on_suspend'):
             try:
-                self.instance.draw(p, w, h, phase)
+                self.instance.on_suspend()
             except Exception as e:
-                print(f"Error drawing widget {self.class_name}: {e}")
-            return
+                print(f"Error suspending widget {self.class_name}: {e}")
 
-        # Caching Logic
-        import time
-        now = time.time()
-        
-        # Invalidate cache if size changed
-        if not hasattr(self, '_cache_pixmap') or self._cache_pixmap.width() != w or self._cache_pixmap.height() != h:
-            self._cache_pixmap = None
-
-        # Check if update is needed
-        if (not getattr(self, '_cache_pixmap', None) or 
-            (now - getattr(self, '_last_cache_update', 0)) * 1000 > interval):
-            
-            # Create/Update Cache
-            from PySide6.QtGui import QPixmap, QPainter
-            self._cache_pixmap = QPixmap(w, h)
-            self._cache_pixmap.fill(Qt.transparent)
-            
-            cache_painter = QPainter(self._cache_pixmap)
-            # Transfer render hints
-            cache_painter.setRenderHints(p.renderHints())
-            
+    def on_resume(self):
+        if self.instance and hasattr(self.instance, 'on_resume'):
             try:
-                self.instance.draw(cache_painter, w, h, phase)
+                self.instance.on_resume()
             except Exception as e:
-                print(f"Error caching widget {self.class_name}: {e}")
-            finally:
-                cache_painter.end()
-                
-            self._last_cache_update = now
-
-        # Draw Cached Pixmap
-        if self._cache_pixmap:
-            p.drawPixmap(0, 0, self._cache_pixmap)
+                print(f"Error resuming widget {self.class_name}: {e}")
 
     def cleanup(self):
-        if hasattr(self, '_cache_pixmap'):
-            del self._cache_pixmap
         if self.instance and hasattr(self.instance, 'cleanup'):
             try:
                 self.instance.cleanup()
             except Exception as e:
                 print(f"Error cleaning up widget {self.class_name}: {e}")
 
+class BundleWidgetWrapper(PluginWidgetWrapper):
+    """ Віджет з архіву бандла: клас імпортовано один раз, без hot reload """
+    def __init__(self, cls, config=None):
+        self.cls = cls
+        super().__init__(f"<bundle>/{cls.__name__}", cls.__name__, config)
+
+    def _reload_if_needed(self):
+        if self.instance is not None or self.last_check_time:
+            return
+        self.last_check_time = time.time()
+        try:
+            self.instance = self.cls(self.config)
+        except Exception as e:
+            print(f"Error creating bundle widget {self.class_name}: {e}")
+
 class WidgetRegistry:
     def __init__(self):
         self.available_classes = {} # name -> (file_path, class_name)
+        self.schemas = {} # name -> get_schema() класу
+        self.bundle_classes = {} # name -> клас з архіву бандла (.dwb)
         self._load_plugins()
 
     def _load_plugins(self):
@@ -193,34 +260,40 @@ class WidgetRegistry:
                         if inspect.isclass(obj) and issubclass(obj, BaseWidget) and obj != BaseWidget:
                             widget_id = getattr(obj, 'WIDGET_NAME', name.lower().replace('widget', ''))
                             self.available_classes[widget_id] = (file_path, name)
+                            self.schemas[widget_id] = obj.get_schema()
                             print(f"Registered widget: {widget_id}")
                 except Exception as e:
                     print(f"Error scanning widget {file}: {e}")
 
-    def load_bundle_widgets(self, bundle_path):
-        widgets_dir = os.path.join(bundle_path, "widgets")
-        if not os.path.exists(widgets_dir): return
+    def load_bundle_widgets(self, bundle):
+        """ bundle - шлях до теки/.dwb або вже відкритий бандл (src.core.bundles) """
+        if isinstance(bundle, str):
+            from src.core.bundles import open_bundle
+            bundle = open_bundle(bundle)
 
-        print(f"Scanning bundle widgets in {widgets_dir}...")
-        for file in os.listdir(widgets_dir):
-            if file.endswith(".py"):
-                file_path = os.path.join(widgets_dir, file)
-                try:
-                    mod_name = f"bundle_widget_{os.path.basename(bundle_path)}_{file[:-3]}"
-                    spec = importlib.util.spec_from_file_location(mod_name, file_path)
-                    module = importlib.util.module_from_spec(spec)
-                    sys.modules[mod_name] = module
-                    spec.loader.exec_module(module)
-                    
-                    for name, obj in inspect.getmembers(module):
-                        if inspect.isclass(obj) and issubclass(obj, BaseWidget) and obj != BaseWidget:
-                            widget_id = getattr(obj, 'WIDGET_NAME', name)
-                            self.available_classes[widget_id] = (file_path, name)
-                            print(f"Registered bundle widget: {widget_id}")
-                except Exception as e:
-                    print(f"Error loading bundle widget {file}: {e}")
+        for mod_name in bundle.module_names("widgets"):
+            try:
+                module = bundle.load_module("widgets", mod_name)
+                for name, obj in inspect.getmembers(module):
+                    if inspect.isclass(obj) and issubclass(obj, BaseWidget) and obj != BaseWidget \
+                            and obj.__module__ == module.__name__:
+                        widget_id = getattr(obj, 'WIDGET_NAME', name)
+                        if bundle.config_path() is None:
+                            self.bundle_classes[widget_id] = obj
+                        else:
+                            self.bundle_classes.pop(widget_id, None)
+                        self.available_classes[widget_id] = (bundle.module_path("widgets", mod_name), name)
+                        self.schemas[widget_id] = obj.get_schema()
+                        print(f"Registered bundle widget: {widget_id}")
+            except Exception as e:
+                print(f"Error loading bundle widget {mod_name}: {e}")
+
+    def get_schema(self, name):
+        return self.schemas.get(name, {})
 
     def create_widget(self, name, config=None):
+        if name in self.bundle_classes:
+            return BundleWidgetWrapper(self.bundle_classes[name], config)
         if name in self.available_classes:
             file_path, class_name = self.available_classes[name]
             return PluginWidgetWrapper(file_path, class_name, config)
@@ -0,0 +1,133 @@
+import time
+from PySide6.QtCore import Qt, QRect, QRectF
+from PySide6.QtGui import QPainter, QPixmap
+
+
+class LayerAtlas:
+    """ Один спільний pixmap для всіх статичних шарів віджетів (shelf packing).
+
+    Кожен шар займає прямокутник свого розміру, а не все вікно; атлас
+    перепаковується лише коли змінюється набір розмірів.
+    """
+    MIN_WIDTH = 512
+
+    def __init__(self):
+        self.pixmap = None
+        self.slots = {}
+        self._sizes = {}
+
+    def ensure(self, sizes):
+        """ sizes: {key: (w, h)}. Повертає True, якщо атлас перепаковано """
+        if sizes == self._sizes and self.pixmap is not None:
+            return False
+        self._sizes = dict(sizes)
+        self.slots = {}
+        if not sizes:
+            self.pixmap = None
+            return True
+
+        atlas_w = max(self.MIN_WIDTH, max(w for w, _ in sizes.values()))
+        x = y = shelf_h = 0
+        for key, (w, h) in sorted(sizes.items(), key=lambda kv: -kv[1][1]):
+            if x + w > atlas_w:
+                x, y, shelf_h = 0, y + shelf_h, 0
+            self.slots[key] = QRect(x, y, w, h)
+            x += w
+            shelf_h = max(shelf_h, h)
+
+        self.pixmap = QPixmap(atlas_w, y + shelf_h)
+        self.pixmap.fill(Qt.transparent)
+        return True
+
+    def memory_bytes(self):
+        if self.pixmap is None:
+            return 0
+        return self.pixmap.width() * self.pixmap.height() * 4
+
+
+class WidgetCompositor:
+    """ Малює віджети: динамічні - напряму, статичні - з шарів атласу.
+
+    Підряд розташовані статичні шари виводяться одним проходом, тож
+    порядок накладання віджетів зберігається.
+    """
+    def __init__(self):
+        self.atlas = LayerAtlas()
+        self._bounds = {}
+        self._last_render = {}
+        self._fragments_supported = True
+
+    def draw(self, p, widgets, w, h, phase):
+        now = time.time()
+        layered = {}
+        for wid in widgets:
+            if wid.refresh_mode() != "frame":
+                # Без size_hint розмір невідомий - шар на всю поверхню
+                bounds = wid.get_bounds(w, h)
+                layered[id(wid)] = bounds if bounds is not None else QRect(0, 0, w, h)
+
+        repacked = self.atlas.ensure({k: (b.width(), b.height()) for k, b in layered.items()})
+        if repacked:
+            self._last_render.clear()
+
+        pending = []
+        for wid in widgets:
+            key = id(wid)
+            bounds = layered.get(key)
+            if bounds is None:
+                self._flush(p, pending)
+                wid.draw(p, w, h, phase)
+                continue
+
+            moved = self._bounds.get(key) != bounds
+            if moved or key not in self._last_render or wid.needs_refresh(now - self._last_render[key]):
+                self._render(wid, bounds, w, h, phase)
+                self._last_render[key] = now
+                self._bounds[key] = bounds
+            pending.append((bounds, self.atlas.slots[key]))
+        self._flush(p, pending)
+
+        live = {id(wid) for wid in widgets}
+        for key in [k for k in self._bounds if k not in live]:
+            self._bounds.pop(key, None)
+            self._last_render.pop(key, None)
+
+    def _render(self, wid, bounds, w, h, phase):
+        slot = self.atlas.slots[id(wid)]
+        lp = QPainter(self.atlas.pixmap)
+        try:
+            lp.setCompositionMode(QPainter.CompositionMode_Source)
+            lp.fillRect(slot, Qt.transparent)
+            lp.setCompositionMode(QPainter.CompositionMode_SourceOver)
+            lp.setRenderHint(QPainter.Antialiasing, True)
+            lp.setClipRect(slot)
+            # Віджет малює в координатах вікна - зсуваємо в його слот
+            lp.translate(slot.x() - bounds.x(), slot.y() - bounds.y())
+            wid.render_layer(lp, w, h, phase)
+        finally:
+            lp.end()
+
+    def _flush(self, p, pending):
+        if not pending:
+            return
+        atlas = self.atlas.pixmap
+        if self._fragments_supported:
+            try:
+                fragments = [
+                    QPainter.PixmapFragment.create(QRectF(b).center(), QRectF(s))
+                    for b, s in pending
+                ]
+                p.drawPixmapFragments(fragments, len(fragments), atlas)
+                pending.clear()
+                return
+            except TypeError:
+                self._fragments_supported = False
+        for bounds, slot in pending:
+            p.drawPixmap(bounds.topLeft(), atlas, slot)
+        pending.clear()
+
+    def invalidate(self, widget=None):
+        if widget is None:
+            self._last_render.clear()
+        else:
+            self._last_render.pop(id(widget), None)
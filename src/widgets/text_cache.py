@@ -0,0 +1,79 @@
+from collections import OrderedDict
+
+from PySide6.QtCore import Qt, QPointF, QRect
+from PySide6.QtGui import QFont, QFontMetrics, QStaticText, QTransform
+
+
+class TextLayout:
+    """ Готовий до виводу рядок: QStaticText + розміри як у boundingRect """
+    __slots__ = ("text", "font", "static", "width", "height", "ascent")
+
+    def __init__(self, text, font, wrap_width=None):
+        self.text = text
+        self.font = font
+        metrics = QFontMetrics(font)
+        self.ascent = metrics.ascent()
+
+        self.static = QStaticText(text)
+        self.static.setTextFormat(Qt.PlainText)
+        self.static.setPerformanceHint(QStaticText.AggressiveCaching)
+        if wrap_width is not None:
+            self.static.setTextWidth(wrap_width)
+            rect = metrics.boundingRect(QRect(0, 0, wrap_width, 100000), Qt.TextWordWrap, text)
+        else:
+            rect = metrics.boundingRect(text)
+        self.static.prepare(QTransform(), font)
+        self.width = rect.width()
+        self.height = rect.height()
+
+    def draw(self, p, x, y):
+        """ Малює з лівим верхнім кутом у (x, y) """
+        p.setFont(self.font)
+        p.drawStaticText(QPointF(x, y), self.static)
+
+    def draw_baseline(self, p, x, baseline):
+        """ Аналог p.drawText(x, baseline, text) """
+        self.draw(p, x, baseline - self.ascent)
+
+    def draw_centered(self, p, rect):
+        """ Аналог p.drawText(rect, Qt.AlignCenter, text) для одного рядка """
+        size = self.static.size()
+        self.draw(p, rect.x() + (rect.width() - size.width()) / 2,
+                  rect.y() + (rect.height() - size.height()) / 2)
+
+
+class TextLayoutCache:
+    """ Кеш розкладки тексту за (рядок, шрифт, ширина переносу).
+
+    Повторна розкладка відбувається лише коли змінюється сам рядок
+    (наприклад, раз на хвилину для "HH:mm"); решту кадрів текст
+    виводиться з уже підготовленого QStaticText.
+    """
+    def __init__(self, capacity=16):
+        self.capacity = capacity
+        self._layouts = OrderedDict()
+        self._fonts = {}
+
+    def font(self, family, size, weight=QFont.Normal, italic=False):
+        key = (family, size, weight, italic)
+        font = self._fonts.get(key)
+        if font is None:
+            font = QFont(family, size, weight, italic)
+            self._fonts[key] = font
+        return font
+
+    def layout(self, text, font, wrap_width=None):
+        key = (text, font.key(), wrap_width)
+        layout = self._layouts.get(key)
+        if layout is None:
+            layout = TextLayout(text, font, wrap_width)
+            self._layouts[key] = layout
+            if len(self._layouts) > self.capacity:
+                self._layouts.popitem(last=False)
+        else:
+            self._layouts.move_to_end(key)
+        return layout
+
+    def clear(self):
+        self._layouts.clear()
+        self._fonts.clear()
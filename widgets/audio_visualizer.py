@@ -1,6 +1,8 @@
-from PySide6.QtCore import Qt, QRectF, QThread, Signal
+from PySide6.QtCore import Qt, QRectF, QThread
 from PySide6.QtGui import QPainter, QColor, QLinearGradient
 import math
+import time
+import threading
 import numpy as np
 try:
     import soundcard as sc
@@ -16,10 +18,10 @@ import warnings
 # і дозволяє уникнути засмічення консолі та мікро-затримок
 warnings.filterwarnings("ignore", category=UserWarning, module="soundcard")
 
-import queue
+from src.utils.ring_buffer import TimedRingBuffer
 
 class AudioCaptureThread(QThread):
-    data_ready = Signal(np.ndarray)
+    """ Захоплення loopback-аудіо; FFT рахується тут же, бари пишуться в кільцевий буфер """
 
     def __init__(self, num_bars=20, gain=1.0):
         super().__init__()
@@ -29,7 +31,10 @@ class AudioCaptureThread(QThread):
         self.sample_rate = 44100 / 2 
         self.chunk_size = 2048 # Збільшуємо для стабільності
         self.freq_weights = np.linspace(0.8, 2.5, num_bars) # Зменшили ваги
-        self.audio_queue = queue.Queue(maxsize=20)
+        self.window = np.hanning(self.chunk_size)
+        self.ring = TimedRingBuffer(num_bars, capacity=32)
+        self._active = threading.Event()
+        self._active.set()
         
         # Для автоматичного регулювання підсилення
         self.max_history = []
@@ -37,103 +42,99 @@ class AudioCaptureThread(QThread):
         self._auto_gain = 0.1 
         self._startup_frames = 0
 
+    def _process_fft(self, data):
+        # FFT
+        window = self.window if len(data) == len(self.window) else np.hanning(len(data))
+        fft_data = np.abs(np.fft.rfft(data * window))
+        
+        # Більш вузький діапазон (до 15кГц) для чистоти
+        max_idx = int(len(fft_data) * 0.7)
+        fft_data = fft_data[:max_idx]
+        
+        if len(fft_data) <= self.num_bars:
+            return None
+
+        if not hasattr(self, '_cached_indices'):
+            self._cached_indices = np.logspace(0, np.log10(len(fft_data)-1), self.num_bars + 1).astype(int)
+        
+        idx = self._cached_indices
+        bars = np.array([np.max(fft_data[idx[i]:idx[i+1]+1]) for i in range(self.num_bars)])
+        bars = bars * self.freq_weights
+        
+        # АВТОМАТИЧНЕ ПІДСИЛЕННЯ (AGC)
+        current_max = np.max(bars)
+        if current_max > 0.0001:
+            self.max_history.append(current_max)
+            if len(self.max_history) > 60: self.max_history.pop(0)
+        
+        # Розраховуємо цільовий gain
+        avg_max = np.mean(self.max_history) if len(self.max_history) > 5 else 0.5
+        if avg_max < 0.001: avg_max = 0.001
+        
+        target_gain = 0.65 / avg_max
+        
+        # На старті адаптуємося швидше, потім плавно
+        if self._startup_frames < 100:
+            adaptation_speed = 0.2
+            self._startup_frames += 1
+        else:
+            adaptation_speed = 0.03
+            
+        self._auto_gain += (target_gain - self._auto_gain) * adaptation_speed
+        
+        # Застосовуємо gain та логарифмічну компресію
+        # Ваше ділення на 2.5 я інтегрував у базовий множник (80 / 2.5 = 32)
+        bars = bars * 32 * self.gain * self._auto_gain
+        
+        # Більш агресивна компресія
+        bars = np.log10(1 + bars) / 1.2
+        
+        # Експоненціальна крива
+        bars = np.power(bars, 1.4)
+        return np.clip(bars, 0, 1)
+
     def run(self):
         if not HAS_SOUNDCARD:
             return
 
-        def process_fft():
-            while self.running:
-                try:
-                    data = self.audio_queue.get(timeout=0.1)
-                    
-                    # FFT
-                    window = np.hanning(len(data))
-                    fft_data = np.abs(np.fft.rfft(data * window))
-                    
-                    # Більш вузький діапазон (до 15кГц) для чистоти
-                    max_idx = int(len(fft_data) * 0.7)
-                    fft_data = fft_data[:max_idx]
-                    
-                    if len(fft_data) > self.num_bars:
-                        if not hasattr(self, '_cached_indices'):
-                            self._cached_indices = np.logspace(0, np.log10(len(fft_data)-1), self.num_bars + 1).astype(int)
-                        
-                        idx = self._cached_indices
-                        bars = []
-                        for i in range(self.num_bars):
-                            val = np.max(fft_data[idx[i]:idx[i+1]+1])
-                            bars.append(val * self.freq_weights[i])
-                        
-                        bars = np.array(bars)
-                        
-                        # АВТОМАТИЧНЕ ПІДСИЛЕННЯ (AGC)
-                        current_max = np.max(bars)
-                        if current_max > 0.0001:
-                            self.max_history.append(current_max)
-                            if len(self.max_history) > 60: self.max_history.pop(0)
-                        
-                        # Розраховуємо цільовий gain
-                        avg_max = np.mean(self.max_history) if len(self.max_history) > 5 else 0.5
-                        #print(f"avg_max: {avg_max}")
-                        if avg_max < 0.001: avg_max = 0.001
-                        
-                        target_gain = 0.65 / avg_max
-                        #print(f"target_gain: {target_gain}")
-                        
-                        # На старті адаптуємося швидше, потім плавно
-                        if self._startup_frames < 100:
-                            adaptation_speed = 0.2
-                            self._startup_frames += 1
-                        else:
-                            adaptation_speed = 0.03
-                            
-                        self._auto_gain += (target_gain - self._auto_gain) * adaptation_speed
-                        
-                        # Застосовуємо gain та логарифмічну компресію
-                        # Ваше ділення на 2.5 я інтегрував у базовий множник (80 / 2.5 = 32)
-                        bars = bars * 32 * self.gain * self._auto_gain
-                        
-                        # Більш агресивна компресія
-                        bars = np.log10(1 + bars) / 1.2
-                        
-                        # Експоненціальна крива
-                        bars = np.power(bars, 1.4)
-                        
-                        self.data_ready.emit(np.clip(bars, 0, 1))
-                except queue.Empty:
-                    continue
-                except Exception as e:
-                    print(f"FFT processing error: {e}")
-
-        import threading
-        self.processing_thread = threading.Thread(target=process_fft, daemon=True)
-        self.processing_thread.start()
-
         try:
             speaker = sc.default_speaker()
             mic = sc.get_microphone(id=str(speaker.name), include_loopback=True)
+            chunk_duration = self.chunk_size / self.sample_rate
             
-            # Використовуємо blocksize для MediaFoundation
-            with mic.recorder(samplerate=self.sample_rate, blocksize=self.chunk_size) as recorder:
-                while self.running:
-                    # ТІЛЬКИ ЗЧИТУВАННЯ
-                    data = recorder.record(numframes=self.chunk_size)
-                    if data is not None and len(data) > 0:
+            while self.running:
+                # На паузі рекордер закритий, потік спить до відновлення
+                self._active.wait()
+                if not self.running:
+                    break
+                # Використовуємо blocksize для MediaFoundation
+                with mic.recorder(samplerate=self.sample_rate, blocksize=self.chunk_size) as recorder:
+                    while self.running and self._active.is_set():
+                        data = recorder.record(numframes=self.chunk_size)
+                        if data is None or len(data) == 0:
+                            continue
+                        captured_at = time.perf_counter() - chunk_duration / 2
                         # Беремо один канал без зайвих функцій numpy
                         mono = data[:, 0] if data.ndim > 1 else data
                         try:
-                            self.audio_queue.put_nowait(mono)
-                        except queue.Full:
-                            # Очищуємо чергу, якщо вона переповнена (скидаємо старі кадри)
-                            try:
-                                self.audio_queue.get_nowait()
-                                self.audio_queue.put_nowait(mono)
-                            except: pass
+                            bars = self._process_fft(mono)
+                        except Exception as e:
+                            print(f"FFT processing error: {e}")
+                            continue
+                        if bars is not None:
+                            self.ring.write(bars, captured_at)
         except Exception as e:
             print(f"Audio capture error: {e}")
 
+    def pause(self):
+        self._active.clear()
+
+    def resume(self):
+        self._active.set()
+
     def stop(self):
         self.running = False
+        self._active.set()
         self.wait() # Чекаємо завершення потоку
 
 class AudioVisualizerWidget(BaseWidget):
@@ -155,12 +156,22 @@ class AudioVisualizerWidget(BaseWidget):
         self.use_real_audio = self.config.get("real_audio", True)
         
         self.capture_thread = None
+        self._last_sample_count = 0
         if self.use_real_audio and HAS_SOUNDCARD:
             self.capture_thread = AudioCaptureThread(self.num_bars, self.gain)
-            self.capture_thread.data_ready.connect(self._on_data_ready)
             self.capture_thread.start()
 
-    def _on_data_ready(self, data):
+    def _pull_audio(self):
+        """ Бере найсвіжіший зразок з буфера; згладжування - раз на новий зразок """
+        ring = self.capture_thread.ring
+        if ring.count == self._last_sample_count:
+            return
+        self._last_sample_count = ring.count
+        _, data = ring.sample_at(time.perf_counter())
+        if data is not None:
+            self._apply_bars(data)
+
+    def _apply_bars(self, data):
         for i in range(min(len(data), self.num_bars)):
             target = data[i]
             if target > self.heights[i]:
@@ -170,6 +181,9 @@ class AudioVisualizerWidget(BaseWidget):
                 # Плавне падіння
                 self.heights[i] += (target - self.heights[i]) * self.smoothness_down
 
+    def size_hint(self, w, h):
+        return self.config.get("width", 300), self.config.get("height", 100)
+
     def draw(self, p: QPainter, w: int, h: int, phase: float = 0.0):
         p.setRenderHint(QPainter.Antialiasing)
         
@@ -186,7 +200,9 @@ class AudioVisualizerWidget(BaseWidget):
         bar_w = (total_w - (self.num_bars + 1) * bar_gap) / self.num_bars
         
         # Симуляція, якщо немає реального аудіо
-        if not self.capture_thread or not self.capture_thread.isRunning():
+        if self.capture_thread and self.capture_thread.isRunning():
+            self._pull_audio()
+        else:
             for i in range(self.num_bars):
                 target_h = (math.sin(phase * 8 + i * 0.4) * 0.2 + 
                            math.sin(phase * 4 - i * 0.7) * 0.1 + 0.3)
@@ -226,6 +242,14 @@ class AudioVisualizerWidget(BaseWidget):
             p.setBrush(self.color_top)
             p.drawRect(rect.x(), peak_y, bar_w, 1.5)
 
+    def on_suspend(self):
+        if self.capture_thread:
+            self.capture_thread.pause()
+
+    def on_resume(self):
+        if self.capture_thread:
+            self.capture_thread.resume()
+
     def cleanup(self):
         """ Зупиняємо потік захоплення звуку """
         if self.capture_thread:
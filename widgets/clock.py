@@ -2,10 +2,24 @@ from PySide6.QtCore import Qt, QDateTime
 from PySide6.QtGui import QPainter, QColor, QFont
 import math
 from widgets import BaseWidget
+from src.widgets.text_cache import TextLayoutCache
 
 
 class TimeDateWidget(BaseWidget):
     WIDGET_NAME = "clock"
+
+    @classmethod
+    def get_schema(cls):
+        return {
+            "time_format": {"type": "str", "default": "HH:mm", "label": "Time Format"},
+            "date_format": {"type": "str", "default": "ddd, d MMM", "label": "Date Format"},
+            "time_size": {"type": "int", "min": 6, "max": 400, "label": "Time Size"},
+            "date_size": {"type": "int", "min": 6, "max": 200, "label": "Date Size"},
+        }
+
+    def __init__(self, config=None):
+        super().__init__(config)
+        self.text_cache = TextLayoutCache()
     
     def draw(self, p: QPainter, w: int, h: int, phase: float = 0.0):
         now = QDateTime.currentDateTime()
@@ -16,32 +30,26 @@ class TimeDateWidget(BaseWidget):
         time_size = self.config.get('time_size', base_size // 18)
         date_size = self.config.get('date_size', base_size // 45)
         
-        time_font = QFont("Segoe UI", time_size, QFont.DemiBold)
-        date_font = QFont("Segoe UI", date_size, QFont.Normal)
+        time_font = self.text_cache.font("Segoe UI", time_size, QFont.DemiBold)
+        date_font = self.text_cache.font("Segoe UI", date_size, QFont.Normal)
 
-        p.setFont(time_font)
-        time_metrics = p.fontMetrics()
-        time_rect = time_metrics.boundingRect(time_str)
-        
-        p.setFont(date_font)
-        date_metrics = p.fontMetrics()
-        date_rect = date_metrics.boundingRect(date_str)
+        # Розкладка перераховується лише при зміні рядка (раз на хвилину для HH:mm)
+        time_layout = self.text_cache.layout(time_str, time_font)
+        date_layout = self.text_cache.layout(date_str, date_font)
 
-        total_w = max(time_rect.width(), date_rect.width())
-        total_h = time_rect.height() + date_rect.height() // 2 + 10
+        total_w = max(time_layout.width, date_layout.width)
+        total_h = time_layout.height + date_layout.height // 2 + 10
 
         start_x, start_y = self.get_pos(w, h, total_w, total_h)
         glow = 0.5 + 0.5 * math.sin(phase * 2 * math.pi)
         
-        p.setFont(time_font)
         p.setPen(QColor(0, 0, 0, int(80 + 40 * glow)))
-        p.drawText(start_x + 2, start_y + time_rect.height() + 2, time_str)
+        time_layout.draw_baseline(p, start_x + 2, start_y + time_layout.height + 2)
         p.setPen(QColor(255, 255, 255, int(200 + 55 * glow)))
-        p.drawText(start_x, start_y + time_rect.height(), time_str)
+        time_layout.draw_baseline(p, start_x, start_y + time_layout.height)
 
-        p.setFont(date_font)
-        date_y = start_y + time_rect.height() + date_rect.height() // 2 + 5
+        date_y = start_y + time_layout.height + date_layout.height // 2 + 5
         p.setPen(QColor(0, 0, 0, 120))
-        p.drawText(start_x + 1, date_y + 1, date_str)
+        date_layout.draw_baseline(p, start_x + 1, date_y + 1)
         p.setPen(QColor(200, 220, 255, 180))
-        p.drawText(start_x, date_y, date_str)
+        date_layout.draw_baseline(p, start_x, date_y)
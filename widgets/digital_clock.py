@@ -1,6 +1,7 @@
 from PySide6.QtCore import Qt, QDateTime, QRectF
 from PySide6.QtGui import QPainter, QColor, QFont, QPen, QBrush
 from widgets import BaseWidget
+from src.widgets.text_cache import TextLayoutCache
 
 class DigitalClockWidget(BaseWidget):
     WIDGET_NAME = "digital_clock"
@@ -10,6 +11,12 @@ class DigitalClockWidget(BaseWidget):
         self.use_24h = self.config.get('use_24h', True)
         self.show_seconds = self.config.get('show_seconds', True)
         self.show_date = self.config.get('show_date', True)
+        self.text_cache = TextLayoutCache(capacity=4)
+        self.time_font = self.text_cache.font("Segoe UI", 60, QFont.Bold)
+        self.date_font = self.text_cache.font("Segoe UI", 14)
+
+    def size_hint(self, w, h):
+        return 300, 150
 
     def draw(self, p: QPainter, w: int, h: int, phase: float = 0.0):
         now = QDateTime.currentDateTime()
@@ -29,8 +36,6 @@ class DigitalClockWidget(BaseWidget):
         fmt = "HH:mm" if self.use_24h else "h:mm AP"
         time_str = now.toString(fmt)
         
-        # Font Setup
-        p.setFont(QFont("Segoe UI", 60, QFont.Bold))
         p.setPen(QColor(255, 255, 255, 240))
         
         # Draw Time
@@ -39,7 +44,7 @@ class DigitalClockWidget(BaseWidget):
         
         # Let's center text in the box we defined
         rect_time = QRectF(x, y, total_w, 80)
-        p.drawText(rect_time, Qt.AlignCenter, time_str)
+        self.text_cache.layout(time_str, self.time_font).draw_centered(p, rect_time)
         
         # Seconds Bar (Animated line below time)
         if self.show_seconds:
@@ -65,7 +70,6 @@ class DigitalClockWidget(BaseWidget):
         # Date
         if self.show_date:
             date_str = now.toString("dddd, MMMM d")
-            p.setFont(QFont("Segoe UI", 14))
             p.setPen(QColor(220, 220, 220, 200))
             rect_date = QRectF(x, y + 100, total_w, 30)
-            p.drawText(rect_date, Qt.AlignCenter, date_str)
+            self.text_cache.layout(date_str, self.date_font).draw_centered(p, rect_date)
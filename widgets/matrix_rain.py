@@ -29,6 +29,9 @@ class MatrixRainWidget(BaseWidget):
                 "chars": [random.choice(self.chars) for _ in range(20)]
             })
 
+    def size_hint(self, w, h):
+        return 200, 200
+
     def draw(self, p: QPainter, w: int, h: int, phase: float = 0.0):
         p.setRenderHint(QPainter.Antialiasing)
         
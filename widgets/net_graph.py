@@ -1,49 +1,59 @@
-from PySide6.QtCore import Qt, QPointF
-from PySide6.QtGui import QPainter, QColor, QFont, QPen, QBrush, QPolygonF
-import psutil
-import time
+from PySide6.QtCore import Qt
+from PySide6.QtGui import QPainter, QColor, QFont, QPen, QBrush
 from widgets import BaseWidget
+from src.core.metrics import MetricsSubscription
+from src.utils.series import SeriesPlot
 
 class NetGraphWidget(BaseWidget):
     WIDGET_NAME = "net_graph"
+    REFRESH = "data"
     
     def __init__(self, config=None):
         super().__init__(config)
-        self.history_len = 60
-        self.upload_history = [0] * self.history_len
-        self.download_history = [0] * self.history_len
-        
-        self.last_io = psutil.net_io_counters()
-        self.last_time = time.time()
+        self.metrics = MetricsSubscription(self)
+        service = self.metrics.service
+        self._interval = None
+        self._update_history_len()
+        self.upload = service.series('net_up')
+        self.download = service.series('net_down')
+        self.upload_plot = SeriesPlot(self.upload)
+        self.download_plot = SeriesPlot(self.download)
+        self._seen_seq = 0
         
         self.max_val = 1024 * 10 # Initial scaling (10 KB/s)
 
+    def _update_history_len(self):
+        """ Samples in the shown window; follows metrics_interval changes made after creation """
+        service = self.metrics.service
+        if service.interval == self._interval:
+            return
+        self._interval = service.interval
+        # "history" - seconds shown on the graph (hours are fine: decimated to pixels)
+        self.history_len = max(2, int(self.config.get('history', 60) / service.interval))
+        service.ensure_history(self.history_len)
+
+    def on_suspend(self):
+        self.metrics.stop()
+
+    def on_resume(self):
+        self.metrics.start()
+
+    def cleanup(self):
+        self.metrics.stop()
+
+    def size_hint(self, w, h):
+        return 250, 100
+
     def draw(self, p: QPainter, w: int, h: int, phase: float = 0.0):
-        # Update Data
-        now = time.time()
-        dt = now - self.last_time
-        if dt > 1.0:
-            current_io = psutil.net_io_counters()
-            
-            sent = current_io.bytes_sent - self.last_io.bytes_sent
-            recv = current_io.bytes_recv - self.last_io.bytes_recv
-            
-            # Convert to B/s
-            speed_up = sent / dt
-            speed_down = recv / dt
-            
-            self.upload_history.append(speed_up)
-            self.download_history.append(speed_down)
-            
-            if len(self.upload_history) > self.history_len:
-                self.upload_history.pop(0)
-                self.download_history.pop(0)
-                
-            self.last_io = current_io
-            self.last_time = now
+        # Update Data (history lives in the shared metrics service)
+        self._update_history_len()
+        snap = self.metrics.snapshot()
+        if snap.seq != self._seen_seq:
+            self._seen_seq = snap.seq
             
             # Dynamic Scaling
-            curr_max = max(max(self.upload_history), max(self.download_history))
+            curr_max = max(self.upload.window_stats(self.history_len)[1],
+                           self.download.window_stats(self.history_len)[1])
             if curr_max > self.max_val:
                 self.max_val = curr_max
             elif curr_max < self.max_val * 0.8 and self.max_val > 10240:
@@ -68,14 +78,14 @@ class NetGraphWidget(BaseWidget):
              
         # Plot Charts
         # Download (Cyan)
-        self._draw_chart(p, x, y, total_w, total_h, self.download_history, QColor(0, 255, 255), True)
+        self._draw_chart(p, x, y, total_w, total_h, self.download_plot, QColor(0, 255, 255), True)
         
         # Upload (Magenta)
-        self._draw_chart(p, x, y, total_w, total_h, self.upload_history, QColor(255, 0, 255), False)
+        self._draw_chart(p, x, y, total_w, total_h, self.upload_plot, QColor(255, 0, 255), False)
         
         # Text Stats
-        curr_down = self.download_history[-1]
-        curr_up = self.upload_history[-1]
+        curr_down = snap.net_down_bps
+        curr_up = snap.net_up_bps
         
         p.setFont(QFont("Consolas", 9, QFont.Bold))
         
@@ -87,34 +97,21 @@ class NetGraphWidget(BaseWidget):
         p.setPen(QColor(255, 0, 255))
         p.drawText(x + 5, y + 30, f"UL: {self._fmt_speed(curr_up)}")
 
-    def _draw_chart(self, p, x, y, w, h, data, color, fill=False):
-        if not data: return
-        
-        points = []
-        step_x = w / (len(data) - 1)
-        
-        for i, val in enumerate(data):
-            px = x + i * step_x
-            # Normalize height
-            norm = val / max(1, self.max_val)
-            norm = min(1.0, norm)
-            py = y + h - (norm * (h - 20)) # Keep padding top
-            points.append(QPointF(px, py))
+    def _draw_chart(self, p, x, y, w, h, plot, color, fill=False):
+        # Polygons are cached in SeriesPlot and only rebuilt on new samples
+        line, area = plot.polygons(x, y, w, h, self.max_val, self.history_len)
+        if line.isEmpty(): return
             
         if fill:
-            poly_points = points.copy()
-            poly_points.append(QPointF(x + w, y + h))
-            poly_points.append(QPointF(x, y + h))
-            
             c_fill = QColor(color)
             c_fill.setAlpha(50)
             p.setBrush(c_fill)
             p.setPen(Qt.NoPen)
-            p.drawPolygon(QPolygonF(poly_points))
+            p.drawPolygon(area)
             
         p.setPen(QPen(color, 2))
         p.setBrush(Qt.NoBrush)
-        p.drawPolyline(points)
+        p.drawPolyline(line)
 
     def _fmt_speed(self, b_s):
         if b_s < 1024: return f"{int(b_s)} B/s"
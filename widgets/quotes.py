@@ -1,12 +1,21 @@
 from PySide6.QtGui import QPainter, QColor, QFont, QPen
-from PySide6.QtCore import Qt, QRect
+from PySide6.QtCore import Qt
 import math
 import random
 import time
 from widgets import BaseWidget
+from src.widgets.text_cache import TextLayoutCache
 
 class QuotesWidget(BaseWidget):
     WIDGET_NAME = "quotes"
+
+    @classmethod
+    def get_schema(cls):
+        return {
+            "quotes": {"type": "list", "items": {"type": "str"}, "label": "Quotes"},
+            "interval": {"type": "number", "min": 1, "default": 15, "label": "Interval (s)"},
+            "font_size": {"type": "int", "min": 4, "max": 200, "default": 14, "label": "Font Size"},
+        }
     
     def __init__(self, config=None):
         super().__init__(config)
@@ -22,6 +31,7 @@ class QuotesWidget(BaseWidget):
         self.last_switch = time.time()
         self.opacity = 1.0
         self.target_opacity = 1.0
+        self.text_cache = TextLayoutCache(capacity=len(self.quotes) + 1)
         
     def draw(self, p: QPainter, w: int, h: int, phase: float = 0.0):
         now = time.time()
@@ -41,25 +51,23 @@ class QuotesWidget(BaseWidget):
             self.opacity -= 0.02
             
         # Draw setup
-        font = QFont("Segoe UI Light", self.config.get('font_size', 14), QFont.Normal, True)
-        p.setFont(font)
+        font = self.text_cache.font("Segoe UI Light", self.config.get('font_size', 14), QFont.Normal, True)
         
-        # Wrapping text
+        # Wrapping text (перенос рахується один раз на цитату)
         max_w = 300
-        metrics = p.fontMetrics()
-        rect = metrics.boundingRect(QRect(0, 0, max_w, 1000), Qt.TextWordWrap, self.current_quote)
+        layout = self.text_cache.layout(self.current_quote, font, max_w)
         
-        start_x, start_y = self.get_pos(w, h, rect.width(), rect.height())
+        start_x, start_y = self.get_pos(w, h, layout.width, layout.height)
         
         # Draw text with shadow
         color = QColor(255, 255, 255, int(200 * self.opacity))
         shadow = QColor(0, 0, 0, int(100 * self.opacity))
         
         p.setPen(shadow)
-        p.drawText(QRect(start_x + 1, start_y + 1, max_w, rect.height()), Qt.TextWordWrap, self.current_quote)
+        layout.draw(p, start_x + 1, start_y + 1)
         
         p.setPen(color)
-        p.drawText(QRect(start_x, start_y, max_w, rect.height()), Qt.TextWordWrap, self.current_quote)
+        layout.draw(p, start_x, start_y)
         
         # Draw a small decorative line
         line_glow = 0.5 + 0.5 * math.sin(phase * 2 * math.pi)
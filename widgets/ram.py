@@ -1,17 +1,31 @@
-from PySide6.QtGui import QPainter, QColor, QFont
+from PySide6.QtGui import QPainter, QColor, QFont, QFontMetrics
 from PySide6.QtCore import Qt
-import psutil
 from widgets import BaseWidget
+from src.core.metrics import MetricsSubscription
 
 class RAMUsageWidget(BaseWidget):
     WIDGET_NAME = "ram"
+    REFRESH = "data"
     
     def __init__(self, config=None):
         super().__init__(config)
-        self.config.setdefault('update_interval', 1000)
+        self.metrics = MetricsSubscription(self)
+
+    def on_suspend(self):
+        self.metrics.stop()
+
+    def on_resume(self):
+        self.metrics.start()
+
+    def cleanup(self):
+        self.metrics.stop()
+
+    def size_hint(self, w, h):
+        th = QFontMetrics(QFont("Consolas", self.config.get('font_size', 12))).height()
+        return 120, th + 10
 
     def draw(self, p: QPainter, w: int, h: int, phase: float = 0.0):
-        ram = psutil.virtual_memory().percent
+        ram = self.metrics.snapshot().mem_percent
         text = f"RAM: {ram}%"
         
         p.setFont(QFont("Consolas", self.config.get('font_size', 12)))
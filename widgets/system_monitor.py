@@ -1,40 +1,38 @@
 from PySide6.QtCore import Qt, QRectF
 from PySide6.QtGui import QPainter, QColor, QFont, QPen, QBrush, QLinearGradient
-import psutil
 from widgets import BaseWidget
+from src.core.metrics import MetricsSubscription
 
 class SystemMonitorWidget(BaseWidget):
     WIDGET_NAME = "system_monitor"
+    REFRESH = "data"
     
     def __init__(self, config=None):
         super().__init__(config)
-        self.config.setdefault('update_interval', 1000)
-        self.cpu_history = []
-        self.ram_history = []
-        
-        # Throttling
-        self.last_update = 0
-        self.cached_cpu = 0
-        self.cached_ram = 0
-        self.cached_disk = 0
+        self.metrics = MetricsSubscription(self)
         
         # Colors
         self.cpu_color = QColor(0, 255, 127) # Spring Green
         self.ram_color = QColor(0, 120, 255) # Blue
         self.bg_color = QColor(20, 20, 30, 180) # Dark transparent
         
+    def size_hint(self, w, h):
+        return 220, 110
+
+    def on_suspend(self):
+        self.metrics.stop()
+
+    def on_resume(self):
+        self.metrics.start()
+
+    def cleanup(self):
+        self.metrics.stop()
+
     def draw(self, p: QPainter, w: int, h: int, phase: float = 0.0):
-        import time
-        # Data Update (1s throttle)
-        if time.time() - self.last_update > 1.0:
-            self.cached_cpu = psutil.cpu_percent()
-            self.cached_ram = psutil.virtual_memory().percent
-            self.cached_disk = psutil.disk_usage('/').percent
-            self.last_update = time.time()
-            
-        cpu = self.cached_cpu
-        ram = self.cached_ram
-        disk = self.cached_disk
+        snap = self.metrics.snapshot()
+        cpu = snap.cpu_percent
+        ram = snap.mem_percent
+        disk = snap.disk_percent
         
         # Dimensions
         total_w = 220
@@ -104,7 +102,6 @@ class SystemMonitorWidget(BaseWidget):
         
         # 4. Storage/Disk (Optional simple line below RAM)
         # Let's add Disk Usage
-        disk = psutil.disk_usage('/').percent
         dy = bar_y + 25
         
         p.setPen(Qt.white)
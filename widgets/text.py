@@ -2,9 +2,22 @@ from PySide6.QtGui import QPainter, QColor, QFont
 from PySide6.QtCore import Qt
 import math
 from widgets import BaseWidget
+from src.widgets.text_cache import TextLayoutCache
 
 class SystemInfoWidget(BaseWidget):
     WIDGET_NAME = "text"
+
+    @classmethod
+    def get_schema(cls):
+        return {
+            "text": {"type": "str", "default": "System Active", "label": "Text"},
+            "font_size": {"type": "int", "min": 4, "max": 200, "default": 14, "label": "Font Size"},
+            "color": {"type": "color", "default": (0, 255, 255, 150), "label": "Color"},
+        }
+
+    def __init__(self, config=None):
+        super().__init__(config)
+        self.text_cache = TextLayoutCache(capacity=4)
     
     def draw(self, p: QPainter, w: int, h: int, phase: float = 0.0):
         text = self.config.get('text', "System Active")
@@ -16,15 +29,12 @@ class SystemInfoWidget(BaseWidget):
         else:
             color = QColor(color_data)
         
-        font = QFont("Consolas", font_size)
-        p.setFont(font)
-        metrics = p.fontMetrics()
-        rect = metrics.boundingRect(text)
+        layout = self.text_cache.layout(text, self.text_cache.font("Consolas", font_size))
         
-        start_x, start_y = self.get_pos(w, h, rect.width(), rect.height())
+        start_x, start_y = self.get_pos(w, h, layout.width, layout.height)
         
         shift = 0.5 + 0.5 * math.sin(phase * 2 * math.pi * 2)
         color.setAlpha(int(100 + 100 * shift))
         
         p.setPen(color)
-        p.drawText(start_x, start_y + rect.height(), text)
+        layout.draw_baseline(p, start_x, start_y + layout.height)
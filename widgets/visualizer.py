@@ -6,6 +6,9 @@ from widgets import BaseWidget
 class VisualizerWidget(BaseWidget):
     WIDGET_NAME = "visualizer"
     
+    def size_hint(self, w, h):
+        return 12 * (4 + 3), 30
+
     def draw(self, p: QPainter, w: int, h: int, phase: float = 0.0):
         num_bars = 12
         bar_w = 4
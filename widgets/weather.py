@@ -1,88 +1,30 @@
-from PySide6.QtCore import Qt, QPointF, QThread, Signal
+from PySide6.QtCore import Qt, QPointF
 from PySide6.QtGui import QPainter, QColor, QFont, QRadialGradient
 import math
-import requests
 import time
 from widgets import BaseWidget
+from src.core.weather import get_weather_service
 
-class WeatherFetchThread(QThread):
-    finished = Signal(dict)
-
-    def __init__(self, city_name, country=None, region=None, lat=None, lon=None):
-        super().__init__()
-        self.city_name = city_name
-        self.country = country
-        self.region = region
-        self.lat = lat
-        self.lon = lon
-
-    def run(self):
-        try:
-            import urllib.parse
-            # 1. Формуємо пошуковий запит
-            if self.lat is None or self.lon is None:
-                # Спробуємо кілька варіантів запиту для кращої точності
-                queries_to_try = []
-                
-                # Варіант 1: Повний запит (Місто + Регіон + Країна)
-                full_q = self.city_name
-                if self.region: full_q += f" {self.region}"
-                if self.country: full_q += f" {self.country}"
-                queries_to_try.append(full_q)
-                
-                # Варіант 2: Тільки місто та країна
-                if self.country:
-                    queries_to_try.append(f"{self.city_name} {self.country}")
-                
-                # Варіант 3: Тільки місто
-                queries_to_try.append(self.city_name)
-                
-                res = None
-                for q in queries_to_try:
-                    safe_q = urllib.parse.quote(q)
-                    geo_url = f"https://geocoding-api.open-meteo.com/v1/search?name={safe_q}&count=1&language=en&format=json"
-                    geo_res = requests.get(geo_url, timeout=10)
-                    geo_data = geo_res.json()
-                    
-                    if "results" in geo_data and len(geo_data["results"]) > 0:
-                        res = geo_data["results"][0]
-                        break
-                
-                if res:
-                    self.lat = res["latitude"]
-                    self.lon = res["longitude"]
-                    found_name = res.get("name", self.city_name)
-                else:
-                    print(f"Location not found after trying: {queries_to_try}")
-                    return
-            else:
-                found_name = self.city_name
-
-            # 2. Отримуємо погоду
-            url = f"https://api.open-meteo.com/v1/forecast?latitude={self.lat}&longitude={self.lon}&current_weather=true"
-            response = requests.get(url, timeout=10)
-            data = response.json()
-            
-            if "current_weather" in data:
-                cw = data["current_weather"]
-                code = cw["weathercode"]
-                condition = "Sunny"
-                if code in [1, 2, 3]: condition = "Cloudy"
-                elif code in [45, 48]: condition = "Cloudy" # Fog
-                elif code >= 51: condition = "Rainy"
-                
-                self.finished.emit({
-                    "temp": round(cw["temperature"]),
-                    "condition": condition,
-                    "city": found_name,
-                    "lat": self.lat,
-                    "lon": self.lon
-                })
-        except Exception as e:
-            print(f"Weather update error: {e}")
+def condition_for(code):
+    condition = "Sunny"
+    if code in [1, 2, 3]: condition = "Cloudy"
+    elif code in [45, 48]: condition = "Cloudy" # Fog
+    elif code >= 51: condition = "Rainy"
+    return condition
 
 class WeatherWidget(BaseWidget):
     WIDGET_NAME = "weather"
+
+    @classmethod
+    def get_schema(cls):
+        return {
+            "city": {"type": "str", "default": "Kyiv", "label": "City"},
+            "country": {"type": "str", "label": "Country"},
+            "region": {"type": "str", "label": "Region"},
+            "display_name": {"type": "str", "label": "Display Name"},
+            "lat": {"type": "number", "min": -90, "max": 90, "label": "Latitude"},
+            "lon": {"type": "number", "min": -180, "max": 180, "label": "Longitude"},
+        }
     
     def __init__(self, config=None):
         super().__init__(config)
@@ -101,16 +43,28 @@ class WeatherWidget(BaseWidget):
         self.lon = self.config.get('lon')
         
         self.last_update = 0
-        self.update_interval = 1800
-        self.fetch_thread = None
+        self.suspended = False
+        # Як часто питати сервіс; TTL прогнозу і самі запити - на його боці
+        self.update_interval = 60
+        self._weather_key = None
+        self._fetched_at = None
         self._last_search_key = ""
         
+    def on_suspend(self):
+        self.suspended = True
+
+    def on_resume(self):
+        self.suspended = False
+
     def _update_weather(self):
+        if self.suspended:
+            return
         # Ключ для перевірки змін (місто + регіон + країна)
         search_key = f"{self.config.get('city')}|{self.config.get('region')}|{self.config.get('country')}"
         
         if search_key != self._last_search_key:
             self.last_update = 0 
+            self._fetched_at = None
             self._last_search_key = search_key
             self.city = self.config.get('city', 'Kyiv')
             self.region = self.config.get('region')
@@ -119,20 +73,19 @@ class WeatherWidget(BaseWidget):
             self.lat = self.config.get('lat')
             self.lon = self.config.get('lon')
 
-        if time.time() - self.last_update < self.update_interval:
-            return
-            
-        if self.fetch_thread and self.fetch_thread.isRunning():
-            return
-            
-        self.fetch_thread = WeatherFetchThread(self.city, self.country, self.region, self.lat, self.lon)
-        self.fetch_thread.finished.connect(self._on_weather_fetched)
-        self.fetch_thread.start()
-        self.last_update = time.time()
+        service = get_weather_service()
+        if time.time() - self.last_update >= self.update_interval:
+            self._weather_key = service.request(self.city, self.country, self.region, self.lat, self.lon)
+            self.last_update = time.time()
+
+        entry = service.get(self._weather_key)
+        if entry and entry["fetched_at"] != self._fetched_at:
+            self._fetched_at = entry["fetched_at"]
+            self._on_weather_fetched(entry["data"])
 
     def _on_weather_fetched(self, data):
         self.temp = data["temp"]
-        self.condition = data["condition"]
+        self.condition = condition_for(data["weathercode"])
         # Якщо display_name не задано, використовуємо офіційну назву міста
         if not self.display_name:
             self.city = data["city"]
@@ -145,14 +98,8 @@ class WeatherWidget(BaseWidget):
         if not self.display_name:
             self.config['city'] = self.city
 
-    def cleanup(self):
-        """ Зупиняємо потік отримання погоди """
-        if self.fetch_thread and self.fetch_thread.isRunning():
-            self.fetch_thread.terminate()
-            self.fetch_thread.wait()
-
-    def __del__(self):
-        self.cleanup()
+    def size_hint(self, w, h):
+        return 150, 70
 
     def draw(self, p: QPainter, w: int, h: int, phase: float = 0.0):
         self._update_weather()
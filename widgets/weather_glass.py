@@ -1,65 +1,18 @@
-from PySide6.QtCore import Qt, QPointF, QThread, Signal, QRectF
+from PySide6.QtCore import Qt, QPointF, QRectF
 from PySide6.QtGui import QPainter, QColor, QFont, QRadialGradient, QLinearGradient, QBrush, QPen
 import math
-import requests
 import time
 from widgets import BaseWidget
+from src.core.weather import get_weather_service
 
-# Re-using the logic from the original weather widget but keeping code self-contained
-class WeatherFetchThread(QThread):
-    finished = Signal(dict)
-
-    def __init__(self, city_name, country=None, region=None, lat=None, lon=None):
-        super().__init__()
-        self.city_name = city_name
-        self.country = country
-        self.region = region
-        self.lat = lat
-        self.lon = lon
-
-    def run(self):
-        try:
-            import urllib.parse
-            if self.lat is None or self.lon is None:
-                q = self.city_name
-                if self.country: q += f" {self.country}"
-                safe_q = urllib.parse.quote(q)
-                geo_url = f"https://geocoding-api.open-meteo.com/v1/search?name={safe_q}&count=1&language=en&format=json"
-                
-                resp = requests.get(geo_url, timeout=5)
-                data = resp.json()
-                if "results" in data and len(data["results"]) > 0:
-                    res = data["results"][0]
-                    self.lat = res["latitude"]
-                    self.lon = res["longitude"]
-                    self.city_name = res.get("name", self.city_name)
-                else:
-                    return
-
-            url = f"https://api.open-meteo.com/v1/forecast?latitude={self.lat}&longitude={self.lon}&current_weather=true"
-            data = requests.get(url, timeout=5).json()
-            
-            if "current_weather" in data:
-                cw = data["current_weather"]
-                code = cw["weathercode"]
-                
-                # Simple mapping
-                cond = "Sunny"
-                if code in [1, 2, 3, 45, 48]: cond = "Cloudy"
-                elif code in [51, 53, 55, 61, 63, 65, 80, 81, 82]: cond = "Rainy"
-                elif code in [71, 73, 75, 77, 85, 86]: cond = "Snowy"
-                elif code in [95, 96, 99]: cond = "Storm"
-                
-                self.finished.emit({
-                    "temp": round(cw["temperature"]),
-                    "condition": cond,
-                    "wind": cw.get("windspeed", 0),
-                    "city": self.city_name,
-                    "lat": self.lat,
-                    "lon": self.lon
-                })
-        except Exception as e:
-            print(f"Weather fetch error: {e}")
+def condition_for(code):
+    # Simple mapping
+    cond = "Sunny"
+    if code in [1, 2, 3, 45, 48]: cond = "Cloudy"
+    elif code in [51, 53, 55, 61, 63, 65, 80, 81, 82]: cond = "Rainy"
+    elif code in [71, 73, 75, 77, 85, 86]: cond = "Snowy"
+    elif code in [95, 96, 99]: cond = "Storm"
+    return cond
 
 class WeatherGlassWidget(BaseWidget):
     WIDGET_NAME = "weather_glass"
@@ -75,22 +28,32 @@ class WeatherGlassWidget(BaseWidget):
         self.lon = self.config.get('lon')
         
         self.last_update = 0
-        self.fetch_thread = None
+        self.suspended = False
+        self._weather_key = None
+        self._fetched_at = None
         
+    def on_suspend(self):
+        self.suspended = True
+
+    def on_resume(self):
+        self.suspended = False
+
     def _update_weather(self):
-        if time.time() - self.last_update < 1800: # 30 mins
-            return
-        if self.fetch_thread and self.fetch_thread.isRunning():
+        if self.suspended:
             return
-            
-        self.fetch_thread = WeatherFetchThread(self.city, lat=self.lat, lon=self.lon)
-        self.fetch_thread.finished.connect(self._on_data)
-        self.fetch_thread.start()
-        self.last_update = time.time()
-        
+        service = get_weather_service()
+        if time.time() - self.last_update >= 60: # TTL (30 mins) is handled by the service
+            self._weather_key = service.request(self.city, self.config.get('country'), lat=self.lat, lon=self.lon)
+            self.last_update = time.time()
+
+        entry = service.get(self._weather_key)
+        if entry and entry["fetched_at"] != self._fetched_at:
+            self._fetched_at = entry["fetched_at"]
+            self._on_data(entry["data"])
+
     def _on_data(self, data):
         self.temp = data["temp"]
-        self.condition = data["condition"]
+        self.condition = condition_for(data["weathercode"])
         self.wind = data["wind"]
         self.city = data["city"]
         self.lat = data["lat"]
@@ -100,6 +63,9 @@ class WeatherGlassWidget(BaseWidget):
         self.config['lat'] = self.lat
         self.config['lon'] = self.lon
 
+    def size_hint(self, w, h):
+        return 260, 100
+
     def draw(self, p: QPainter, w: int, h: int, phase: float = 0.0):
         self._update_weather()
         
@@ -171,7 +137,3 @@ class WeatherGlassWidget(BaseWidget):
         p.setFont(QFont("Segoe UI", 10, QFont.Bold))
         p.setPen(QColor(255, 255, 255, 150))
         p.drawText(x + 15, y + 25, self.city.upper())
-
-    def cleanup(self):
-        if self.fetch_thread:
-            self.fetch_thread.terminate()